@@ -1,4 +1,3 @@
-
 from ..shared.types import PredictArgs, ScrapeArgs, SyncArgs
 from ..scrape import scrape
 from ..predict import predict
@@ -6,6 +5,8 @@ from ..games import games
 from ..export import export_parquet
 from ..sync import sync
 from ..shared import shared
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+import collections
 import logging
 
 ALL_SOURCES = ['mcla', 'ncaa']
@@ -14,35 +15,126 @@ LOGGER = logging.getLogger(__name__)
 
 def run(args):
     sources = ALL_SOURCES if args.all_sources else args.source
+    years = list(shared.years(args.year))
+
+    if args.limit:
+        LOGGER.info(f"Limiting scrape to {args.limit} teams per source")
+
+    if args.jobs > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs,
+                                 initializer=init_worker) as executor:
+            run_parallel(args, sources, years, executor)
+        return
 
-    for year in shared.years(args.year):
+    for year in years:
         for source in sources:
-            scrape_args = ScrapeArgs(source=source, year=year, out_dir=args.out_dir)
-            if args.limit:
-                scrape_args.limit = args.limit
-                LOGGER.info(f"Limiting scrape to {args.limit} teams per source")
-            
-            scrape.scrape_schedules(scrape_args)
-
-        predict.predict(
-            PredictArgs(input_dir=args.out_dir,
-                        year=year,
-                        out_dir=args.out_dir))
-
-        # Generate consolidated games file
-        games.generate_games_file(
-            type('GamesArgs', (), {'year': year, 'input_dir': args.out_dir})())
-
-        # Export optimized parquet views for frontend
-        export_parquet.export_parquet_views(
-            type('ExportArgs', (), {'year': year, 'input_dir': args.out_dir, 'out_dir': args.out_dir})())
-
-        if args.bucket_url:
-            sync.sync(
-                SyncArgs(input_dir=args.out_dir,
-                         year=year,
-                         bucket_url=args.bucket_url,
-                         dry_run=False))
-        else:
-            LOGGER.info(
-                "Skipping sync with S3 since no bucket url was specified")
+            scrape.scrape_schedules(make_scrape_args(args, source, year))
+
+        post_process(year, args.out_dir, args.bucket_url)
+
+
+def run_parallel(args, sources: list[str], years: list[str],
+                 executor: Executor):
+    """
+    Run the scrapes and per-year stages as soon as their inputs are ready.
+
+    The parallelism is across sources and stages, not years: each source
+    scrapes its years one after another, since the rate limit is per host and
+    every worker process has its own limiter, so at most one process uses a
+    source's host and its caches. Different sources run side by side, and a
+    year's predict/games/export/sync stages are submitted as soon as all of
+    its scrapes have finished, overlapping the next years' scrapes.
+    """
+    queued_years = {source: collections.deque(years) for source in sources}
+    unscraped_sources = {year: set(sources) for year in years}
+    running: dict[Future, tuple[str, str, str | None]] = {}
+
+    def submit_scrape(source: str):
+        year = queued_years[source].popleft()
+        LOGGER.info(f'Starting {source} scrape for {year}')
+        future = executor.submit(scrape.scrape_schedules,
+                                 make_scrape_args(args, source, year))
+        running[future] = ('scrape', year, source)
+
+    def submit_post_process(year: str):
+        LOGGER.info(f'All scrapes for {year} finished, starting predictions')
+        future = executor.submit(post_process, year, args.out_dir,
+                                 args.bucket_url)
+        running[future] = ('post_process', year, None)
+
+    for source in sources:
+        if queued_years[source]:
+            submit_scrape(source)
+    for year in years:
+        if not unscraped_sources[year]:
+            submit_post_process(year)
+
+    try:
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, year, source = running.pop(future)
+                # Raises if the stage failed, stopping the run as the
+                # sequential pipeline would
+                future.result()
+                if stage != 'scrape':
+                    LOGGER.info(f'Finished {year}')
+                    continue
+                if queued_years[source]:
+                    submit_scrape(source)
+                unscraped_sources[year].discard(source)
+                if not unscraped_sources[year]:
+                    submit_post_process(year)
+    except BaseException:
+        for future in running:
+            future.cancel()
+        raise
+
+
+def init_worker():
+    logging.basicConfig(level=logging.INFO)
+
+
+def make_scrape_args(args, source: str, year: str) -> ScrapeArgs:
+    scrape_args = ScrapeArgs(source=source,
+                             year=year,
+                             out_dir=args.out_dir,
+                             concurrency=args.concurrency,
+                             incremental=args.incremental,
+                             stream=args.stream,
+                             resume=args.resume,
+                             adaptive_rate=args.adaptive_rate,
+                             record_archive=args.record_archive,
+                             replay_archive=args.replay_archive,
+                             replay_latency=args.replay_latency,
+                             ncaa_fetcher=args.ncaa_fetcher,
+                             cache_max_mb=args.cache_max_mb,
+                             parse_cache=args.parse_cache)
+    if args.limit:
+        scrape_args.limit = args.limit
+    return scrape_args
+
+
+def post_process(year: str, out_dir: str, bucket_url: str | None):
+    predict.predict(
+        PredictArgs(input_dir=out_dir,
+                    year=year,
+                    out_dir=out_dir))
+
+    # Generate consolidated games file
+    games.generate_games_file(
+        type('GamesArgs', (), {'year': year, 'input_dir': out_dir})())
+
+    # Export optimized parquet views for frontend
+    export_parquet.export_parquet_views(
+        type('ExportArgs', (), {'year': year, 'input_dir': out_dir, 'out_dir': out_dir})())
+
+    if bucket_url:
+        sync.sync(
+            SyncArgs(input_dir=out_dir,
+                     year=year,
+                     bucket_url=bucket_url,
+                     dry_run=False))
+    else:
+        LOGGER.info(
+            "Skipping sync with S3 since no bucket url was specified")
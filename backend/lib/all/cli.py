@@ -25,4 +25,61 @@ def add_parsers(parsers):
         default=os.environ.get('SCRAPE_LIMIT'),
         help='Limit number of teams scraped per source (defaults to SCRAPE_LIMIT env var)'
     )
+    all_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=int(os.environ.get('SCRAPE_CONCURRENCY', '1')),
+        help='Number of teams/games fetched and parsed concurrently per source (defaults to SCRAPE_CONCURRENCY env var)'
+    )
+    all_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse final games from the existing games output instead of re-scraping them')
+    all_parser.add_argument(
+        '--stream',
+        action='store_true',
+        default=os.environ.get('SCRAPE_STREAM') == 'true',
+        help='Write schedules and games incrementally to keep memory bounded (defaults to SCRAPE_STREAM env var)')
+    all_parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue interrupted scrapes from their journals instead of starting over')
+    all_parser.add_argument(
+        '--adaptive-rate',
+        action='store_true',
+        default=os.environ.get('SCRAPE_ADAPTIVE_RATE') == 'true',
+        help='Adapt the request rate to server back-pressure instead of using a fixed limit (defaults to SCRAPE_ADAPTIVE_RATE env var)')
+    all_parser.add_argument(
+        '--record-archive',
+        help='Directory to record every fetched page into, for offline replay')
+    all_parser.add_argument(
+        '--replay-archive',
+        help='Directory of a recorded archive to serve pages from instead of the network')
+    all_parser.add_argument(
+        '--replay-latency',
+        type=float,
+        default=0,
+        help='Seconds to sleep per replayed page, to simulate network latency')
+    all_parser.add_argument(
+        '--ncaa-fetcher',
+        choices=['browser', 'http'],
+        default=os.environ.get('NCAA_FETCHER', 'browser'),
+        help='Fetch NCAA pages with headless Firefox, or with a Firefox-impersonating HTTP client that falls back to the browser when blocked (defaults to NCAA_FETCHER env var)')
+    all_parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        default=float(os.environ['SCRAPE_CACHE_MAX_MB'])
+        if os.environ.get('SCRAPE_CACHE_MAX_MB') else None,
+        help='After each scrape, prune expired entries and evict least recently used ones until each cache fits this size (defaults to SCRAPE_CACHE_MAX_MB env var)')
+    all_parser.add_argument(
+        '--no-parse-cache',
+        dest='parse_cache',
+        action='store_false',
+        default=os.environ.get('SCRAPE_PARSE_CACHE') != 'false',
+        help='Convert every page again instead of reusing conversions of unchanged pages from out/cache/parse (defaults to SCRAPE_PARSE_CACHE env var)')
+    all_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=int(os.environ.get('SCRAPE_JOBS', '1')),
+        help='Number of worker processes running scrapes and per-year stages in parallel (defaults to SCRAPE_JOBS env var)')
     all_parser.set_defaults(func=all.run)
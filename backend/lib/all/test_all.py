@@ -0,0 +1,87 @@
+import argparse
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from . import all
+from ..scrape import scrape
+
+
+class TestParallelPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.lock = threading.Lock()
+        self.args = argparse.Namespace(out_dir='out',
+                                       bucket_url=None,
+                                       limit=None,
+                                       concurrency=1,
+                                       incremental=False,
+                                       stream=False,
+                                       resume=False,
+                                       adaptive_rate=False,
+                                       record_archive=None,
+                                       replay_archive=None,
+                                       replay_latency=0,
+                                       ncaa_fetcher='browser',
+                                       cache_max_mb=None,
+                                       parse_cache=True)
+
+    def record(self, *event):
+        with self.lock:
+            self.events.append(event)
+
+    def fake_scrape(self, scrape_args):
+        self.record('start', scrape_args.source, scrape_args.year)
+        time.sleep(0.05 if scrape_args.source == 'ncaa' else 0.01)
+        self.record('end', scrape_args.source, scrape_args.year)
+
+    def fake_post_process(self, year, out_dir, bucket_url):
+        self.record('post_process', year)
+
+    def run_pipeline(self, sources, years):
+        with patch.object(scrape, 'scrape_schedules', self.fake_scrape), \
+                patch.object(all, 'post_process', self.fake_post_process), \
+                ThreadPoolExecutor(max_workers=4) as executor:
+            all.run_parallel(self.args, sources, years, executor)
+
+    def test_runs_every_stage_once_in_dependency_order(self):
+        sources = ['mcla', 'ncaa']
+        years = ['2023', '2024', '2025']
+        self.run_pipeline(sources, years)
+
+        self.assertEqual(
+            sorted(e for e in self.events if e[0] == 'start'),
+            sorted(('start', s, y) for s in sources for y in years))
+        for year in years:
+            post_process = self.events.index(('post_process', year))
+            for source in sources:
+                self.assertLess(self.events.index(('end', source, year)),
+                                post_process)
+
+    def test_one_scrape_per_source_at_a_time(self):
+        self.run_pipeline(['mcla', 'ncaa'], ['2023', '2024', '2025'])
+
+        in_flight = set()
+        for event in self.events:
+            if event[0] == 'start':
+                self.assertNotIn(event[1], in_flight)
+                in_flight.add(event[1])
+            elif event[0] == 'end':
+                in_flight.remove(event[1])
+
+    def test_sources_and_post_processing_overlap(self):
+        self.run_pipeline(['mcla', 'ncaa'], ['2023', '2024'])
+
+        # mcla finishes its years while ncaa is still scraping 2023, and
+        # 2023 is post-processed while ncaa scrapes 2024
+        self.assertLess(self.events.index(('end', 'mcla', '2024')),
+                        self.events.index(('end', 'ncaa', '2023')))
+        self.assertLess(self.events.index(('post_process', '2023')),
+                        self.events.index(('end', 'ncaa', '2024')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import glob
+import logging
+import os
+from collections.abc import Iterator
+
+from ..scrape.archive import ArchiveRecorder, archive_path
+from ..scrape.http_cache import LruSQLiteCache
+from ..scrape.metrics import FetchResult
+from ..scrape.page_cache import PageCache
+from ..scrape.scrape import get_scraper
+from ..shared import shared
+from ..shared.types import Team, TeamDetail
+
+LOGGER = logging.getLogger(__name__)
+
+PAGE_CACHE_FILE = 'pages.sqlite'
+# Source whose browser-rendered pages are kept in the page cache
+PAGE_CACHE_SOURCE = 'ncaa'
+
+
+def http_cache_paths(out_dir: str) -> dict[str, str]:
+    """Path of each source's requests cache, keyed by source"""
+    return {
+        os.path.splitext(os.path.basename(path))[0]: path
+        for path in sorted(glob.glob(os.path.join(out_dir, 'cache', '*.sqlite')))
+        if os.path.basename(path) != PAGE_CACHE_FILE
+    }
+
+
+def page_cache_path(out_dir: str) -> str | None:
+    path = os.path.join(out_dir, 'cache', PAGE_CACHE_FILE)
+    return path if os.path.exists(path) else None
+
+
+def stats(args):
+    rows = []
+    for path in http_cache_paths(args.out_dir).values():
+        http_cache = LruSQLiteCache(path)
+        rows.append((os.path.basename(path), http_cache.stats()))
+        http_cache.close()
+    if path := page_cache_path(args.out_dir):
+        page_cache = PageCache(path)
+        rows.append((PAGE_CACHE_FILE, page_cache.storage_stats()))
+        page_cache.close()
+
+    print(f'{"cache":<16}{"entries":>9}{"expired":>9}{"stored MiB":>12}'
+          f'{"file MiB":>10}{"hits":>8}')
+    for name, s in rows:
+        print(f'{name:<16}{s["entries"]:>9}{s["expired"]:>9}'
+              f'{s["stored_bytes"] / 2**20:>12.1f}{s["file_bytes"] / 2**20:>10.1f}'
+              f'{s.get("hits", "-"):>8}')
+
+
+def prune(args):
+    """
+    Delete expired entries from every cache, then the least recently used
+    entries across all of them until together they fit in args.max_mb.
+    """
+    caches = [LruSQLiteCache(path)
+              for path in http_cache_paths(args.out_dir).values()]
+    if path := page_cache_path(args.out_dir):
+        caches.append(PageCache(path))
+    try:
+        for cache in caches:
+            cache.prune()
+        if args.max_mb is not None:
+            evict_least_recently_used(caches, int(args.max_mb * 2**20))
+    finally:
+        for cache in caches:
+            cache.close()
+
+
+def evict_least_recently_used(caches: list, max_bytes: int):
+    entries = sorted((accessed_at, k, key, size)
+                     for k, cache in enumerate(caches)
+                     for accessed_at, key, size in cache.usage())
+    total = sum(size for *_, size in entries)
+    evict = [[] for _ in caches]
+    for _, k, key, size in entries:
+        if total <= max_bytes:
+            break
+        evict[k].append(key)
+        total -= size
+    for cache, keys in zip(caches, evict):
+        if keys:
+            cache.evict(keys)
+            # Vacuum the file down to what is left
+            cache.prune()
+    LOGGER.info(f'evicted {sum(map(len, evict))} entries to fit '
+                f'{max_bytes / 2**20:.1f} MiB across {len(caches)} caches')
+
+
+def cached_pages(out_dir: str, source: str,
+                 path: str | None) -> Iterator[tuple[str, FetchResult]]:
+    if path:
+        http_cache = LruSQLiteCache(path)
+        try:
+            for url, status, html in http_cache.pages():
+                yield url, FetchResult(html=html, status=status)
+        finally:
+            http_cache.close()
+    if source == PAGE_CACHE_SOURCE and (path := page_cache_path(out_dir)):
+        page_cache = PageCache(path)
+        try:
+            for url, html in page_cache.pages():
+                yield url, FetchResult(html=html, status=200)
+        finally:
+            page_cache.close()
+
+
+def scraped_urls(out_dir: str, source: str, year: str) -> set[str] | None:
+    """
+    URLs a source's scrape of year fetched, from its team list and schedule
+    outputs, or None if it has not been scraped
+    """
+    teams_path = shared.parquet_path(out_dir, year, 'teams', f'{source}.parquet')
+    schedules_path = shared.parquet_path(out_dir, year, 'schedules',
+                                         f'{source}.parquet')
+    if not os.path.exists(teams_path) and not os.path.exists(schedules_path):
+        return None
+    urls = {
+        location.url
+        for location in get_scraper(source).get_team_list_urls(year)
+    }
+    teams = list(shared.load_parquet(Team, teams_path)) if os.path.exists(
+        teams_path) else []
+    for schedule in (shared.load_parquet(TeamDetail, schedules_path)
+                     if os.path.exists(schedules_path) else []):
+        teams.append(schedule.team)
+        urls.update(game.details.url for game in schedule.games
+                    if game.details)
+    for team in teams:
+        urls.update(location.url for location in [team.schedule, team.roster]
+                    if location)
+    return urls
+
+
+def export(args):
+    """
+    Write the cached pages of each year's scrape into that year's replay
+    archive
+    """
+    paths = http_cache_paths(args.out_dir)
+    sources = set(paths)
+    if page_cache_path(args.out_dir):
+        sources.add(PAGE_CACHE_SOURCE)
+    for year in shared.years(args.year):
+        for source in sorted(sources):
+            urls = scraped_urls(args.out_dir, source, year)
+            if urls is None:
+                LOGGER.info(f'{source} ({year}) has not been scraped, '
+                            'nothing to export')
+                continue
+            recorder = ArchiveRecorder(
+                archive_path(args.archive_dir, year, source))
+            try:
+                for url, result in cached_pages(args.out_dir, source,
+                                                paths.get(source)):
+                    if url in urls:
+                        recorder.record(url, None, result)
+            finally:
+                recorder.close()
+            LOGGER.info(f'exported {recorder.recorded} {source} ({year}) pages '
+                        f'to {recorder.path}')
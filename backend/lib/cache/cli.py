@@ -0,0 +1,33 @@
+from . import cache
+
+
+def add_parsers(parsers):
+    cache_parser = parsers.add_parser('cache',
+                                      help='inspect and maintain scrape caches')
+    cache_parser.add_argument('--out-dir',
+                              default='out',
+                              help='Output directory holding the cache')
+    cache_parser.set_defaults(func=lambda args: cache_parser.print_help())
+
+    cache_subparsers = cache_parser.add_subparsers()
+
+    stats_parser = cache_subparsers.add_parser(
+        'stats', help='show size and usage of each cache')
+    stats_parser.set_defaults(func=cache.stats)
+
+    prune_parser = cache_subparsers.add_parser(
+        'prune',
+        help='delete expired responses and evict least recently used ones')
+    prune_parser.add_argument(
+        '--max-mb',
+        type=float,
+        help='Evict least recently used entries across all caches until together they fit this size')
+    prune_parser.set_defaults(func=cache.prune)
+
+    export_parser = cache_subparsers.add_parser(
+        'export',
+        help='export the cached pages of each --year\'s scrape as a replay archive')
+    export_parser.add_argument('--archive-dir',
+                               required=True,
+                               help='Archive directory to write to')
+    export_parser.set_defaults(func=cache.export)
@@ -0,0 +1,77 @@
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from . import cache
+from ..scrape.page_cache import PageCache
+from ..shared import shared
+from ..shared.types import Location, Team
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_dir = tmp.name
+
+    def test_prune_fits_all_caches_together(self):
+        caches = [
+            PageCache(os.path.join(self.out_dir, f'{name}.sqlite'))
+            for name in ['a', 'b']
+        ]
+        for cache_ in caches:
+            self.addCleanup(cache_.close)
+        # Alternate between the caches, oldest first
+        for i in range(4):
+            with patch('lib.scrape.page_cache.time.time',
+                       return_value=time.time() - 10 + i):
+                caches[i % 2].put(f'https://stats.ncaa.org/teams/{i}',
+                                  'x' * 1000)
+        size = sum(c.storage_stats()['stored_bytes'] for c in caches)
+
+        cache.evict_least_recently_used(caches, size // 2)
+
+        self.assertEqual([sorted(url for url, _ in c.pages()) for c in caches],
+                         [['https://stats.ncaa.org/teams/2'],
+                          ['https://stats.ncaa.org/teams/3']])
+
+    def test_export_writes_only_the_years_pages(self):
+        page_cache = PageCache(os.path.join(self.out_dir, 'cache',
+                                            'pages.sqlite'))
+        for url in [
+                'https://stats.ncaa.org/teams/2024',
+                'https://stats.ncaa.org/teams/2023'
+        ]:
+            page_cache.put(url, f'<html>{url}</html>')
+        page_cache.close()
+        shared.dump_parquet([
+            Team(name='Air Force',
+                 id='ml-ncaa-air-force',
+                 year='2024',
+                 div='ncaa1',
+                 sport='ml',
+                 source='ncaa',
+                 schedule=Location(url='https://stats.ncaa.org/teams/2024'))
+        ], shared.parquet_path(self.out_dir, '2024', 'teams', 'ncaa.parquet'))
+
+        archive_dir = os.path.join(self.out_dir, 'archive')
+        cache.export(
+            argparse.Namespace(out_dir=self.out_dir,
+                               archive_dir=archive_dir,
+                               year='2023-2024'))
+
+        self.assertFalse(os.path.exists(os.path.join(archive_dir, '2023')))
+        with gzip.open(os.path.join(archive_dir, '2024', 'ncaa.jsonl.gz'),
+                       'rt') as f:
+            self.assertEqual([json.loads(line)['url'] for line in f],
+                             ['https://stats.ncaa.org/teams/2024'])
+
+
+if __name__ == '__main__':
+    unittest.main()
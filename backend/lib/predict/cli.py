@@ -32,6 +32,19 @@ def add_parsers(parsers):
     predict_parser.add_argument('--out-dir',
                                 default='out',
                                 help='Output directory')
+    predict_parser.add_argument(
+        '--split-components',
+        action='store_true',
+        help='Solve each connected group of teams (and players) as its own system, with its own home field advantage')
+    predict_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes solving large components in parallel with --split-components')
+    predict_parser.add_argument(
+        '--warm-start',
+        action='store_true',
+        help='Start the player rating solver from the previous run\'s solution, saved in <out-dir>/cache/predict')
     predict_parser.set_defaults(func=predict.predict)
 
     backtest_parser = parsers.add_parser(
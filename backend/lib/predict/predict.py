@@ -2,17 +2,22 @@ import os
 import json
 import pathlib
 import logging
-from typing import Callable, Iterable, Mapping, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Collection, Iterable, Mapping, Sequence, Tuple
 import numpy as np
 
 from ..shared.types import Game, GameStatLine, Player, PlayerRating, PlayerStatLine, Team, TeamDetail, PredictArgs, TeamPlayersRating, TeamRating, TeamSummary
 from ..shared import shared
-from scipy.sparse import coo_matrix
-from scipy.sparse import linalg
-from dataclasses import dataclass
+from scipy.sparse import csr_matrix
+from scipy.sparse import csgraph, linalg
+from dataclasses import dataclass, field
 
 LOGGER = logging.getLogger(__name__)
 
+# Components with fewer rows than this are solved in the calling process,
+# since sending them to a worker costs more than solving them
+POOL_MIN_ROWS = 5000
+
 
 def predict(args: PredictArgs):
     out_dir = args.out_dir
@@ -24,7 +29,9 @@ def predict(args: PredictArgs):
 
         LOGGER.info(
             f'Calculating team ratings for {len(schedules)} teams in {year}')
-        ratings, _ = calculate_ratings(schedules)
+        ratings, _ = calculate_ratings(schedules,
+                                       split_components=args.split_components,
+                                       jobs=args.jobs)
 
         sorted_ratings = sorted(ratings.values(), key=lambda r: r.team)
 
@@ -38,10 +45,21 @@ def predict(args: PredictArgs):
         with open(os.path.join(out_dir, year, 'team-ratings.json'), 'w') as f:
             shared.dump(sorted_ratings, f, many=True)
 
-        rank_players(args, schedules)
+        warm_starts = None
+        if args.warm_start:
+            warm_starts = load_warm_starts(warm_start_path(out_dir, year))
+
+        rank_players(args,
+                     schedules,
+                     warm_start=warm_starts['players'] if warm_starts else None)
+
+        if warm_starts:
+            save_warm_starts(warm_start_path(out_dir, year), warm_starts)
 
 
-def rank_players(args: PredictArgs, schedules: list[TeamDetail]):
+def rank_players(args: PredictArgs,
+                 schedules: list[TeamDetail],
+                 warm_start: 'WarmStart | None' = None):
     out_dir = args.out_dir
     year = args.year
 
@@ -140,32 +158,33 @@ def rank_players(args: PredictArgs, schedules: list[TeamDetail]):
     n_players = len(player_id_to_idx)
     n_teams = len(team_id_to_idx)
 
-    def build_player_observations(stat: Callable[[GameStatLine], int]):
-        rows: list[PlayerRatingObservation] = []
-        for game in games:
-            rows.extend([
-                PlayerRatingObservation(player=entry.player.id,
-                                        team=game.home_team.id,
-                                        opponent=game.away_team.id,
-                                        value=float(stat(entry)))
-                for entry in game.home_stats or []
-            ])
-            rows.extend([
-                PlayerRatingObservation(player=entry.player.id,
-                                        team=game.away_team.id,
-                                        opponent=game.home_team.id,
-                                        value=float(stat(entry)))
-                for entry in game.away_stats or []
-            ])
-        return rows
-
-    goal_ratings = solve_player_ratings(build_player_observations(lambda e: e.g),
+    # One row per player per game, as (entry, team, opponent)
+    lines: list[tuple[GameStatLine, str, str]] = []
+    for game in games:
+        lines.extend((entry, game.home_team.id, game.away_team.id)
+                     for entry in game.home_stats or [])
+        lines.extend((entry, game.away_team.id, game.home_team.id)
+                     for entry in game.away_stats or [])
+
+    coefficients = build_player_design(
+        [(entry.player.id, team, opponent) for entry, team, opponent in lines],
+        player_id_to_idx, team_id_to_idx)
+    stats: list[Callable[[GameStatLine], int]] = [lambda e: e.g, lambda e: e.a]
+    constants = np.array([[stat(entry) for stat in stats]
+                          for entry, _, _ in lines],
+                         dtype=float).reshape(len(lines), len(stats))
+
+    # Every stat shares the design, so they are solved together
+    ratings = solve_player_stat_ratings(coefficients,
+                                        constants,
                                         player_id_to_idx,
                                         team_id_to_idx,
-                                        damp=1.0)
-    assist_ratings = solve_player_ratings(
-        build_player_observations(lambda e: e.a), player_id_to_idx,
-        team_id_to_idx, damp=1.0)
+                                        damp=1.0,
+                                        split_components=args.split_components,
+                                        jobs=args.jobs,
+                                        warm_start=warm_start)
+    goal_ratings = ratings[:, 0]
+    assist_ratings = ratings[:, 1]
 
     player_ratings: list[PlayerRating] = []
     for i in range(0, n_players):
@@ -251,33 +270,108 @@ def solve_player_ratings(observations: Iterable[PlayerRatingObservation],
                          player_id_to_idx: Mapping[str, int],
                          team_id_to_idx: Mapping[str, int],
                          damp: float = 1.0,
-                         normalize: bool = True):
+                         normalize: bool = True,
+                         split_components: bool = False,
+                         jobs: int = 1):
+    """
+    Solve a single stat's player ratings, see solve_player_stat_ratings.
+    """
+    observations = list(observations)
+    coefficients = build_player_design(
+        [(obs.player, obs.team, obs.opponent) for obs in observations],
+        player_id_to_idx, team_id_to_idx)
+    constants = np.array([[obs.value] for obs in observations],
+                         dtype=float).reshape(len(observations), 1)
+
+    return solve_player_stat_ratings(coefficients,
+                                     constants,
+                                     player_id_to_idx,
+                                     team_id_to_idx,
+                                     damp=damp,
+                                     normalize=normalize,
+                                     split_components=split_components,
+                                     jobs=jobs)[:, 0]
+
+
+def build_player_design(rows: Sequence[tuple[str, str, str]],
+                        player_id_to_idx: Mapping[str, int],
+                        team_id_to_idx: Mapping[str, int]) -> csr_matrix:
+    """
+    One row per (player, team, opponent):
+
+        player + offense[team] - defense[opponent]
+
+    with columns [players..., offense..., defense...].
+    """
     n_players = len(player_id_to_idx)
     n_teams = len(team_id_to_idx)
 
-    data = []
-    i = []
-    j = []
-    constants = []
-    for row_idx, obs in enumerate(observations):
-        data.extend([1.0, 1.0, -1.0])
-        i.extend([row_idx, row_idx, row_idx])
-        j.extend([
-            player_id_to_idx[obs.player],
-            n_players + team_id_to_idx[obs.team],
-            n_players + n_teams + team_id_to_idx[obs.opponent],
-        ])
-        constants.append(obs.value)
-
-    coefficients = coo_matrix((data, (i, j)),
-                              shape=(len(constants), n_players + 2 * n_teams))
+    indices = np.empty((len(rows), 3), dtype=np.int64)
+    indices[:, 0] = np.fromiter((player_id_to_idx[p] for p, _, _ in rows),
+                                dtype=np.int64,
+                                count=len(rows))
+    indices[:, 1] = n_players + np.fromiter(
+        (team_id_to_idx[t] for _, t, _ in rows), dtype=np.int64,
+        count=len(rows))
+    indices[:, 2] = n_players + n_teams + np.fromiter(
+        (team_id_to_idx[o] for _, _, o in rows), dtype=np.int64,
+        count=len(rows))
+
+    data = np.tile([1.0, 1.0, -1.0], len(rows))
+
+    return csr_matrix(
+        (data, indices.reshape(-1), np.arange(0, 3 * len(rows) + 1, 3)),
+        shape=(len(rows), n_players + 2 * n_teams))
+
+
+def solve_player_stat_ratings(coefficients: csr_matrix,
+                              constants: np.ndarray,
+                              player_id_to_idx: Mapping[str, int],
+                              team_id_to_idx: Mapping[str, int],
+                              damp: float = 1.0,
+                              normalize: bool = True,
+                              split_components: bool = False,
+                              jobs: int = 1,
+                              warm_start: 'WarmStart | None' = None
+                              ) -> np.ndarray:
+    """
+    Solve the player ratings of several stats sharing one design.
+
+    constants has a column per stat, and so does the result, laid out as
+    [players..., offense..., defense...]. The damped normal equations and
+    their preconditioner are formed once and every stat is solved in the
+    same conjugate gradient iterations.
+
+    No column is shared between connected components, so with
+    split_components each component is solved on its own (large ones in
+    `jobs` worker processes) and the result is the same up to solver
+    tolerance.
+
+    With a warm_start the solve starts from its solution and leaves its own
+    in it, before normalizing.
+    """
+    n_players = len(player_id_to_idx)
+    n_teams = len(team_id_to_idx)
 
-    ratings, _, _, _, _, _, _, _, _, _ = linalg.lsqr(coefficients,
-                                                     constants,
-                                                     damp=damp)
+    x0 = None
+    if warm_start:
+        x0 = warm_start.x0(player_id_to_idx, team_id_to_idx,
+                           (coefficients.shape[1], ) + constants.shape[1:])
+    if split_components:
+        ratings, iterations = solve_components(coefficients,
+                                               constants,
+                                               damp=damp,
+                                               jobs=jobs,
+                                               solve=_normal_cg,
+                                               x0=x0)
+    else:
+        ratings, iterations = _normal_cg(coefficients, constants, damp, x0)
+    if warm_start:
+        warm_start.update(player_id_to_idx, team_id_to_idx, ratings,
+                          iterations, warm=x0 is not None)
 
-    if normalize:
-        min_rating = min(ratings)
+    if normalize and len(ratings):
+        min_rating = ratings.min(axis=0)
         # normalize by subtracting min rating from player ratings
         ratings[0:n_players] -= min_rating
         # and adding min rating to defensive ratings
@@ -286,6 +380,70 @@ def solve_player_ratings(observations: Iterable[PlayerRatingObservation],
     return ratings
 
 
+def _normal_cg(coefficients: csr_matrix,
+               constants: np.ndarray,
+               damp: float,
+               x0: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Damped least squares solutions for each column of constants, from the
+    normal equations (A^T A + damp^2 I) x = A^T b.
+    """
+    normal = (coefficients.T @ coefficients).tocsr()
+    normal.setdiag(normal.diagonal() + damp**2)
+    return conjugate_gradient(normal, coefficients.T @ constants, x0=x0)
+
+
+def conjugate_gradient(
+        normal: csr_matrix,
+        rhs: np.ndarray,
+        x0: np.ndarray | None = None,
+        tol: float = 1e-10,
+        max_iterations: int | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the symmetric positive definite system normal @ x = rhs for every
+    column of rhs at once, with a Jacobi (diagonal) preconditioner, starting
+    from x0 or zero.
+
+    Each column keeps its own step sizes and stops once its residual is
+    within tol of its right hand side; the matrix products are shared.
+    Returns the solutions and each column's iteration count.
+    """
+    n, k = rhs.shape
+    max_iterations = max_iterations or 10 * n
+    inverse_diagonal = 1 / normal.diagonal()[:, np.newaxis]
+
+    if x0 is None:
+        x = np.zeros((n, k))
+        residual = rhs.astype(float)
+    else:
+        x = x0.astype(float)
+        residual = rhs - normal @ x
+    z = inverse_diagonal * residual
+    direction = z.copy()
+    rz = np.einsum('ij,ij->j', residual, z)
+    threshold = tol * np.linalg.norm(rhs, axis=0)
+    active = np.linalg.norm(residual, axis=0) > threshold
+    iterations = np.zeros(k, dtype=np.int64)
+
+    while active.any() and iterations.max() < max_iterations:
+        product = normal @ direction
+        curvature = np.einsum('ij,ij->j', direction, product)
+        step = np.divide(rz, curvature, out=np.zeros(k), where=active)
+        x += step * direction
+        residual -= step * product
+        iterations[active] += 1
+        active &= np.linalg.norm(residual, axis=0) > threshold
+
+        z = inverse_diagonal * residual
+        rz_next = np.einsum('ij,ij->j', residual, z)
+        beta = np.divide(rz_next, rz, out=np.zeros(k), where=active)
+        direction = z + beta * direction
+        rz = rz_next
+
+    return x, iterations
+
+
 @dataclass
 class GameMapValue:
     team: str
@@ -296,8 +454,20 @@ class GameMapValue:
 
 
 def calculate_ratings(
-        schedules: Iterable[TeamDetail]
-) -> tuple[Mapping[str, TeamRating], float]:
+        schedules: Iterable[TeamDetail],
+        split_components: bool = False,
+        jobs: int = 1) -> tuple[Mapping[str, TeamRating], float]:
+    """
+    Rate teams by offense and defense, returning the ratings and the home
+    field advantage.
+
+    With split_components each group of teams connected by games is solved
+    as its own system with its own home field advantage, and the advantage
+    returned is their average weighted by games.
+
+    lsqr always starts from zero: the team system converges in a dozen or so
+    iterations and the previous solution saves none of them.
+    """
     game_map: Mapping[str, GameMapValue] = {}
     for schedule in schedules:
         for game in schedule.games:
@@ -324,17 +494,23 @@ def calculate_ratings(
     n_teams = len(idx_to_id)
     offset = len(id_to_idx)
 
-    coefficients = build_offensive_defensive_coefficient_matrix(
-        games, id_to_idx)
+    game_arrays = to_game_arrays(games, id_to_idx)
 
-    constants = build_offensive_defensive_constants(games)
+    if split_components:
+        raw_ratings, hfa, _ = solve_team_components(
+            game_arrays, [team_groups[idx_to_id[i]] for i in range(n_teams)],
+            damp=0.2,
+            jobs=jobs)
+    else:
+        coefficients = build_offensive_defensive_coefficient_matrix(
+            game_arrays, n_teams)
 
-    raw_ratings, _, _, _, _, _, _, _, _, _ = linalg.lsqr(coefficients,
-                                                         constants,
-                                                         damp=0.2)
+        constants = build_offensive_defensive_constants(game_arrays)
+
+        raw_ratings, _ = _lsqr(coefficients, constants, 0.2)
+        hfa = raw_ratings[2 * n_teams]
 
     overall = raw_ratings[0:n_teams] + raw_ratings[offset:n_teams + offset]
-    hfa = raw_ratings[2 * n_teams]
 
     results: Mapping[str, TeamRating] = {}
     for i in range(0, n_teams):
@@ -343,41 +519,253 @@ def calculate_ratings(
                                    offense=raw_ratings[i],
                                    defense=raw_ratings[i + offset],
                                    overall=overall[i],
-                                   group=group_for_team(team_groups, team).id)
+                                   group=team_groups[team])
 
     return results, hfa
 
 
-def build_offensive_defensive_coefficient_matrix(games: Iterable[GameMapValue],
-                                                 id_to_idx: Mapping[str, int]):
-    hfa_factors = [
-        hfa for g in games for hfa in ((1, -1) if g.home else (-1, 1))
-    ]
-    hfa_i = [i for i in range(0, 2 * len(games))]
-    hfa_j = [2 * len(id_to_idx)] * (2 * len(games))
-
-    data = [1, -1, 1, -1] * len(games)
-    i = [i for g in range(0, 2 * len(games)) for i in (g, g)]
-
-    def offensive_offset(id):
-        return id_to_idx[id]
-
-    def defensive_offset(id):
-        return len(id_to_idx) + id_to_idx[id]
-
-    j = [
-        k for game in games
-        for k in (offensive_offset(game.team), defensive_offset(game.opponent),
-                  offensive_offset(game.opponent), defensive_offset(game.team))
+@dataclass
+class GameArrays:
+    """Games as parallel arrays, with teams as indices into the ratings"""
+    team: np.ndarray
+    opponent: np.ndarray
+    home: np.ndarray
+    points_for: np.ndarray
+    points_against: np.ndarray
+
+    def __len__(self):
+        return len(self.team)
+
+
+def to_game_arrays(games: Collection[GameMapValue],
+                   id_to_idx: Mapping[str, int]) -> GameArrays:
+
+    def column(value: Callable[[GameMapValue], int], dtype) -> np.ndarray:
+        return np.fromiter(map(value, games), dtype=dtype, count=len(games))
+
+    return GameArrays(team=column(lambda g: id_to_idx[g.team], np.int64),
+                      opponent=column(lambda g: id_to_idx[g.opponent],
+                                      np.int64),
+                      home=column(lambda g: g.home, bool),
+                      points_for=column(lambda g: g.points_for, np.int64),
+                      points_against=column(lambda g: g.points_against,
+                                            np.int64))
+
+
+def build_offensive_defensive_coefficient_matrix(games: GameArrays,
+                                                 n_teams: int) -> csr_matrix:
+    """
+    Two rows per game, one per team's score:
+
+        offense[team] - defense[opponent] +/- hfa = points_for
+        offense[opponent] - defense[team] -/+ hfa = points_against
+
+    with columns [offense..., defense..., hfa] and hfa added for the home
+    team. Every row has exactly three entries, in column order.
+    """
+    n_rows = 2 * len(games)
+    hfa_column = 2 * n_teams
+    hfa = np.where(games.home, 1.0, -1.0)
+
+    indices = np.empty((len(games), 2, 3), dtype=np.int64)
+    indices[:, 0, 0] = games.team
+    indices[:, 0, 1] = n_teams + games.opponent
+    indices[:, 1, 0] = games.opponent
+    indices[:, 1, 1] = n_teams + games.team
+    indices[:, :, 2] = hfa_column
+
+    data = np.empty((len(games), 2, 3))
+    data[:, :, 0] = 1.0
+    data[:, :, 1] = -1.0
+    data[:, 0, 2] = hfa
+    data[:, 1, 2] = -hfa
+
+    return csr_matrix(
+        (data.reshape(-1), indices.reshape(-1), np.arange(0, 3 * n_rows + 1,
+                                                          3)),
+        shape=(n_rows, 2 * n_teams + 1))
+
+
+def build_offensive_defensive_constants(games: GameArrays) -> np.ndarray:
+    constants = np.empty(2 * len(games), dtype=np.int64)
+    constants[0::2] = games.points_for
+    constants[1::2] = games.points_against
+    return constants
+
+
+def split_by_component(component: np.ndarray) -> list[np.ndarray]:
+    """Indices of the members of each component, given each one's label"""
+    if not len(component):
+        return []
+    order = np.argsort(component, kind='stable')
+    return np.split(order, np.flatnonzero(np.diff(component[order])) + 1)
+
+
+def _lsqr(coefficients: csr_matrix,
+          constants: np.ndarray,
+          damp: float,
+          x0: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    if x0 is not None:
+        # A previous solution saves lsqr no iterations on these systems;
+        # warm start with _normal_cg instead
+        raise Exception('lsqr solves start from zero')
+    solution, _, iterations, *_ = linalg.lsqr(coefficients,
+                                              constants,
+                                              damp=damp)
+    return solution, np.array([iterations])
+
+
+# A least squares solver: (coefficients, constants, damp, x0) -> (solution,
+# iterations per column of constants)
+Solver = Callable[[csr_matrix, np.ndarray, float, np.ndarray | None],
+                  tuple[np.ndarray, np.ndarray]]
+
+
+def solve_blocks(blocks: Sequence[tuple[csr_matrix, np.ndarray,
+                                        np.ndarray | None]],
+                 damp: float,
+                 jobs: int,
+                 solve: Solver = _lsqr) -> list[tuple[np.ndarray, np.ndarray]]:
+    """
+    Solve independent least squares systems, given as (coefficients,
+    constants, x0), sending those with at least POOL_MIN_ROWS rows to a pool
+    of `jobs` worker processes. solve must be a module level function so it
+    can be sent to the workers.
+    """
+    pooled = [
+        k for k, (coefficients, _, _) in enumerate(blocks)
+        if jobs > 1 and coefficients.shape[0] >= POOL_MIN_ROWS
     ]
-
-    return coo_matrix((data + hfa_factors, (i + hfa_i, j + hfa_j)),
-                      shape=(2 * len(games), 2 * len(id_to_idx) + 1))
-
-
-def build_offensive_defensive_constants(games: Iterable[GameMapValue]):
-    return np.array(
-        [p for g in games for p in (g.points_for, g.points_against)])
+    if not pooled:
+        return [
+            solve(coefficients, constants, damp, x0)
+            for coefficients, constants, x0 in blocks
+        ]
+
+    solutions: list[tuple[np.ndarray, np.ndarray]] = [None] * len(blocks)
+    with ProcessPoolExecutor(max_workers=min(jobs, len(pooled))) as executor:
+        futures = {
+            k: executor.submit(solve, coefficients, constants, damp, x0)
+            for k, (coefficients, constants, x0) in enumerate(blocks)
+            if k in pooled
+        }
+        # Solve the small ones here while the workers run
+        for k, (coefficients, constants, x0) in enumerate(blocks):
+            if k not in futures:
+                solutions[k] = solve(coefficients, constants, damp, x0)
+        for k, future in futures.items():
+            solutions[k] = future.result()
+    return solutions
+
+
+def solve_components(
+        coefficients: csr_matrix,
+        constants: np.ndarray,
+        damp: float,
+        jobs: int,
+        solve: Solver = _lsqr,
+        x0: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Solve a damped least squares system one connected component at a time.
+
+    Columns are connected when a row uses both of them, so the system is
+    block diagonal over the components and the damped solution of each block
+    is the matching part of the whole solution. Columns without any rows
+    are left at zero, as lsqr would leave them. Returns the solution and the
+    iterations summed over components.
+    """
+    n_columns = coefficients.shape[1]
+    pattern = coefficients.copy()
+    pattern.data[:] = 1
+    _, column_component = csgraph.connected_components(pattern.T @ pattern,
+                                                       directed=False)
+    # Each row belongs to the component of its first column
+    row_component = column_component[coefficients.indices[
+        coefficients.indptr[:-1]]]
+
+    columns_by_component = split_by_component(column_component)
+    rows_by_component = {
+        row_component[rows[0]]: rows
+        for rows in split_by_component(row_component)
+    }
+
+    blocks = []
+    block_columns = []
+    for columns in columns_by_component:
+        rows = rows_by_component.get(column_component[columns[0]])
+        if rows is None:
+            continue
+        blocks.append((coefficients[rows][:, columns], constants[rows],
+                       None if x0 is None else x0[columns]))
+        block_columns.append(columns)
+
+    LOGGER.info(f'Solving {len(blocks)} components of a '
+                f'{coefficients.shape[0]}x{n_columns} system')
+    ratings = np.zeros((n_columns, ) + constants.shape[1:])
+    iterations = np.zeros(constants.shape[1] if constants.ndim > 1 else 1,
+                          dtype=np.int64)
+    for columns, (solution, block_iterations) in zip(
+            block_columns, solve_blocks(blocks, damp, jobs, solve)):
+        ratings[columns] = solution
+        iterations += block_iterations
+    return ratings, iterations
+
+
+def solve_team_components(
+        games: GameArrays,
+        team_groups: Sequence[str],
+        damp: float,
+        jobs: int) -> tuple[np.ndarray, float, np.ndarray]:
+    """
+    Solve the team ratings of each group of teams as its own system, each
+    with its own home field advantage.
+
+    Returns the ratings laid out as [offense..., defense..., hfa] like the
+    single system's, with the advantage averaged over groups by games, and
+    the iterations summed over groups.
+    """
+    n_teams = len(team_groups)
+    _, team_component = np.unique(np.asarray(team_groups),
+                                  return_inverse=True)
+    game_component = team_component[games.team]
+    games_by_component = {
+        game_component[rows[0]]: rows
+        for rows in split_by_component(game_component)
+    }
+
+    # Position of each team within its component
+    local_idx = np.empty(n_teams, dtype=np.int64)
+    teams_by_component = split_by_component(team_component)
+    blocks = []
+    for teams in teams_by_component:
+        local_idx[teams] = np.arange(len(teams))
+        rows = games_by_component[team_component[teams[0]]]
+        component_games = GameArrays(
+            team=local_idx[games.team[rows]],
+            opponent=local_idx[games.opponent[rows]],
+            home=games.home[rows],
+            points_for=games.points_for[rows],
+            points_against=games.points_against[rows])
+        blocks.append(
+            (build_offensive_defensive_coefficient_matrix(
+                component_games, len(teams)),
+             build_offensive_defensive_constants(component_games), None))
+
+    LOGGER.info(f'Solving {len(blocks)} groups of teams')
+    ratings = np.zeros(2 * n_teams + 1)
+    weighted_hfa = 0.0
+    iterations = np.zeros(1, dtype=np.int64)
+    for teams, (coefficients, _, _), (solution, block_iterations) in zip(
+            teams_by_component, blocks, solve_blocks(blocks, damp, jobs)):
+        iterations += block_iterations
+        n = len(teams)
+        ratings[teams] = solution[0:n]
+        ratings[n_teams + teams] = solution[n:2 * n]
+        # Two rows per game
+        weighted_hfa += solution[2 * n] * coefficients.shape[0] / 2
+    hfa = weighted_hfa / len(games) if len(games) else 0.0
+    ratings[2 * n_teams] = hfa
+    return ratings, hfa, iterations
 
 
 def game_id(team_id, opponent_id, date):
@@ -387,47 +775,169 @@ def game_id(team_id, opponent_id, date):
         return f'{opponent_id}_{team_id}_{date}'
 
 
-@dataclass
-class Group:
-    id: str
-    games: list
-    team_ids: set[str]
-
-
-def group_teams_by_games(games: Iterable[GameMapValue]) -> Iterable[Group]:
-    groups = []
-
-    idx = 0
+def group_teams_by_games(games: Iterable[GameMapValue]) -> dict[str, str]:
+    """
+    Label the groups of teams connected by games, returning team -> group.
+
+    Groups are numbered in the order their first game appears. When a game
+    joins two groups, the merged group keeps the label of the game's team,
+    so labels do not depend on how the union-find trees are shaped.
+    """
+    parent: dict[str, str] = {}
+    size: dict[str, int] = {}
+    # Group label of each root
+    labels: dict[str, str] = {}
+
+    def find(team_id: str) -> str:
+        root = team_id
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression
+        while parent[team_id] != root:
+            parent[team_id], team_id = root, parent[team_id]
+        return root
+
+    def join(team_id: str, root: str):
+        parent[team_id] = root
+        size[root] += 1
+
+    n_groups = 0
     for game in games:
         team_id = game.team
         opponent_id = game.opponent
-        team_group = group_for_team(groups, team_id)
-        opponent_group = group_for_team(groups, opponent_id)
-        if (team_group is None and opponent_group is None):
-            groups.append(
-                Group(id=str(idx),
-                      games=[game],
-                      team_ids=set([team_id, opponent_id])))
-            idx += 1
-        elif (team_group is None):
-            opponent_group.games.append(game)
-            opponent_group.team_ids.add(team_id)
-        elif (opponent_group is None):
-            team_group.games.append(game)
-            team_group.team_ids.add(opponent_id)
-        elif (team_group == opponent_group):
-            team_group.games.append(game)
-        else:
-            groups.remove(opponent_group)
-            team_group.games.append(game)
-            team_group.games.extend(opponent_group.games)
-            team_group.team_ids.update(opponent_group.team_ids)
+        if team_id not in parent and opponent_id not in parent:
+            parent[team_id] = team_id
+            size[team_id] = 1
+            labels[team_id] = str(n_groups)
+            n_groups += 1
+            join(opponent_id, team_id)
+            continue
+        if team_id not in parent:
+            join(team_id, find(opponent_id))
+            continue
+        if opponent_id not in parent:
+            join(opponent_id, find(team_id))
+            continue
+        team_root = find(team_id)
+        opponent_root = find(opponent_id)
+        if team_root == opponent_root:
+            continue
+        label = labels[team_root]
+        # Union by size; the surviving root takes the merged group's label
+        if size[team_root] < size[opponent_root]:
+            team_root, opponent_root = opponent_root, team_root
+        parent[opponent_root] = team_root
+        size[team_root] += size[opponent_root]
+        labels[team_root] = label
+        del labels[opponent_root]
+
+    return {team_id: labels[find(team_id)] for team_id in parent}
+
 
-    return groups
+def warm_start_path(out_dir: str, year: str) -> str:
+    return os.path.join(out_dir, 'cache', 'predict', f'{year}.npz')
 
 
-def group_for_team(groups: list[Group], team_id: str):
-    for group in groups:
-        if team_id in group.team_ids:
-            return group
-    return None
+@dataclass
+class WarmStart:
+    """
+    A solution carried between runs to start the next solve from.
+
+    Rows are laid out as [players..., offense..., defense...] and named by
+    player_ids and team_ids. A solve given a WarmStart starts from its
+    solution, moved to the current ids' positions with new ids starting at
+    zero, and then replaces it with its own.
+    """
+    name: str
+    player_ids: np.ndarray = field(
+        default_factory=lambda: np.array([], dtype=str))
+    team_ids: np.ndarray = field(
+        default_factory=lambda: np.array([], dtype=str))
+    solution: np.ndarray | None = None
+    # Iterations per right hand side of the last solve, and of the last one
+    # started from zero
+    iterations: np.ndarray | None = None
+    cold_iterations: np.ndarray | None = None
+
+    def x0(self, player_id_to_idx: Mapping[str, int],
+           team_id_to_idx: Mapping[str, int],
+           shape: tuple[int, ...]) -> np.ndarray | None:
+        """The solution remapped to the current ids, if it has this shape"""
+        if self.solution is None:
+            return None
+        n_players = len(self.player_ids)
+        n_teams = len(self.team_ids)
+        x0 = np.concatenate([
+            _move_rows(self.solution[:n_players], self.player_ids,
+                       player_id_to_idx),
+            _move_rows(self.solution[n_players:n_players + n_teams],
+                       self.team_ids, team_id_to_idx),
+            _move_rows(self.solution[n_players + n_teams:], self.team_ids,
+                       team_id_to_idx)
+        ])
+        return x0 if x0.shape == shape else None
+
+    def update(self, player_id_to_idx: Mapping[str, int],
+               team_id_to_idx: Mapping[str, int], solution: np.ndarray,
+               iterations: np.ndarray, warm: bool):
+        if warm and self.cold_iterations is not None:
+            LOGGER.info(
+                f'Solved {self.name} in {iterations.tolist()} iterations '
+                f'from the previous solution, '
+                f'{(self.cold_iterations - iterations).tolist()} fewer than '
+                'from zero')
+        else:
+            self.cold_iterations = iterations
+            LOGGER.info(f'Solved {self.name} in {iterations.tolist()} '
+                        'iterations from zero')
+        self.player_ids = _ids_by_index(player_id_to_idx)
+        self.team_ids = _ids_by_index(team_id_to_idx)
+        self.solution = solution.copy()
+        self.iterations = iterations
+
+
+def _move_rows(rows: np.ndarray, ids: Sequence[str],
+               id_to_idx: Mapping[str, int]) -> np.ndarray:
+    moved = np.zeros((len(id_to_idx), ) + rows.shape[1:])
+    idx = np.fromiter((id_to_idx.get(id, -1) for id in ids),
+                      dtype=np.int64,
+                      count=len(ids))
+    kept = idx >= 0
+    moved[idx[kept]] = rows[kept]
+    return moved
+
+
+def _ids_by_index(id_to_idx: Mapping[str, int]) -> np.ndarray:
+    return np.array(sorted(id_to_idx, key=id_to_idx.__getitem__), dtype=str)
+
+
+WARM_START_FIELDS = ['player_ids', 'team_ids', 'solution', 'cold_iterations']
+
+
+def load_warm_starts(path: str) -> dict[str, WarmStart]:
+    """The player warm start saved at path, empty if there is none"""
+    warm_starts = {name: WarmStart(name) for name in ['players']}
+    if not os.path.exists(path):
+        LOGGER.info(f'No previous solutions at {path}, solving from zero')
+        return warm_starts
+    with np.load(path) as data:
+        for name, warm_start in warm_starts.items():
+            if f'{name}.solution' not in data:
+                continue
+            for field_name in WARM_START_FIELDS:
+                setattr(warm_start, field_name, data[f'{name}.{field_name}'])
+    return warm_starts
+
+
+def save_warm_starts(path: str, warm_starts: Mapping[str, WarmStart]):
+    arrays = {
+        f'{name}.{field_name}': getattr(warm_start, field_name)
+        for name, warm_start in warm_starts.items()
+        if warm_start.solution is not None for field_name in WARM_START_FIELDS
+    }
+    pathlib.Path(os.path.dirname(path)).mkdir(parents=True, exist_ok=True)
+    # Write then rename, so an interrupted run leaves the previous file
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp_path, path)
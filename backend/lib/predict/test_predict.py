@@ -1,8 +1,71 @@
+import os
+import random
+import tempfile
 import unittest
+from unittest import mock
+
+import numpy as np
+
 from . import predict
 from .. import testing
 
 
+def quadratic_group_labels(games):
+    """The list-scanning grouping group_teams_by_games replaced"""
+    groups = []
+    idx = 0
+    for game in games:
+        team_group = next(
+            (g for g in groups if game.team in g['team_ids']), None)
+        opponent_group = next(
+            (g for g in groups if game.opponent in g['team_ids']), None)
+        if team_group is None and opponent_group is None:
+            groups.append({
+                'id': str(idx),
+                'team_ids': {game.team, game.opponent}
+            })
+            idx += 1
+        elif team_group is None:
+            opponent_group['team_ids'].add(game.team)
+        elif opponent_group is None:
+            team_group['team_ids'].add(game.opponent)
+        elif team_group is not opponent_group:
+            groups.remove(opponent_group)
+            team_group['team_ids'].update(opponent_group['team_ids'])
+    return {
+        team_id: group['id']
+        for group in groups for team_id in group['team_ids']
+    }
+
+
+def random_schedules(rng, prefix, n_teams, n_games):
+    teams = [f'{prefix}{i}' for i in range(n_teams)]
+    games = {team: [] for team in teams}
+    for k in range(n_games):
+        team, opponent = rng.sample(teams, 2)
+        game = testing.create_game(opponent,
+                                   result=(rng.randint(0, 20),
+                                           rng.randint(0, 20)),
+                                   home=rng.random() < 0.5)
+        game.date = f'2024-01-{k:04d}'
+        games[team].append(game)
+    return [
+        testing.create_schedule(testing.create_team(team), team_games)
+        for team, team_games in games.items()
+    ]
+
+
+def random_player_observations(rng, leagues, n_players, n_teams, n):
+    return [
+        predict.PlayerRatingObservation(
+            player=f'{league}p{rng.randrange(n_players)}',
+            team=f'{league}t{team}',
+            opponent=f'{league}t{opponent}',
+            value=float(rng.randint(0, 4))) for league in leagues
+        for _ in range(n) for team, opponent in [rng.sample(range(n_teams), 2)]
+    ]
+
+
 class TestPredict(unittest.TestCase):
 
     def test_calculate_ratings(self):
@@ -25,3 +88,207 @@ class TestPredict(unittest.TestCase):
 
         self.assertGreater(ratings['1'].overall, ratings['2'].overall)
         self.assertGreater(ratings['2'].overall, ratings['3'].overall)
+
+    def test_coefficient_matrix_rows(self):
+        games = [
+            predict.GameMapValue(team='a',
+                                 opponent='b',
+                                 home=True,
+                                 points_for=10,
+                                 points_against=5),
+            predict.GameMapValue(team='c',
+                                 opponent='a',
+                                 home=False,
+                                 points_for=3,
+                                 points_against=7),
+        ]
+        game_arrays = predict.to_game_arrays(games, {'a': 0, 'b': 1, 'c': 2})
+
+        coefficients = predict.build_offensive_defensive_coefficient_matrix(
+            game_arrays, 3)
+        constants = predict.build_offensive_defensive_constants(game_arrays)
+
+        # Columns are offense a, b, c, defense a, b, c, hfa
+        np.testing.assert_array_equal(
+            coefficients.toarray(),
+            [
+                [1, 0, 0, 0, -1, 0, 1],
+                [0, 1, 0, -1, 0, 0, -1],
+                [0, 0, 1, -1, 0, 0, -1],
+                [1, 0, 0, 0, 0, -1, 1],
+            ])
+        np.testing.assert_array_equal(constants, [10, 5, 3, 7])
+
+    def test_group_labels_match_quadratic_grouping(self):
+        rng = random.Random(3)
+        teams = [str(i) for i in range(200)]
+        games = [
+            predict.GameMapValue(team=rng.choice(teams),
+                                 opponent=rng.choice(teams),
+                                 home=True,
+                                 points_for=1,
+                                 points_against=0) for _ in range(150)
+        ]
+
+        groups = predict.group_teams_by_games(games)
+
+        self.assertEqual(groups, quadratic_group_labels(games))
+        self.assertGreater(len(set(groups.values())), 10)
+
+    def test_split_components_solves_each_group_alone(self):
+        rng = random.Random(5)
+        league_a = random_schedules(rng, 'a', 12, 60)
+        league_b = random_schedules(rng, 'b', 8, 40)
+
+        ratings, hfa = predict.calculate_ratings(league_a + league_b,
+                                                 split_components=True)
+        ratings_a, hfa_a = predict.calculate_ratings(league_a)
+        ratings_b, hfa_b = predict.calculate_ratings(league_b)
+
+        for alone in [ratings_a, ratings_b]:
+            for team, rating in alone.items():
+                self.assertAlmostEqual(ratings[team].offense, rating.offense, 4)
+                self.assertAlmostEqual(ratings[team].defense, rating.defense, 4)
+        self.assertEqual(ratings['a0'].group, '0')
+        self.assertEqual(ratings['b0'].group, '1')
+        self.assertAlmostEqual(hfa, (60 * hfa_a + 40 * hfa_b) / 100, 4)
+
+    def test_split_components_matches_whole_player_system(self):
+        rng = random.Random(7)
+        observations = random_player_observations(rng, ['a', 'b', 'c'], 30, 6,
+                                                  200)
+        player_id_to_idx, _ = predict.index_ids(
+            [o.player for o in observations] + ['unused'])
+        team_id_to_idx, _ = predict.index_ids(
+            [id for o in observations for id in [o.team, o.opponent]])
+
+        whole = predict.solve_player_ratings(observations, player_id_to_idx,
+                                             team_id_to_idx)
+        split = predict.solve_player_ratings(observations,
+                                             player_id_to_idx,
+                                             team_id_to_idx,
+                                             split_components=True)
+        with mock.patch.object(predict, 'POOL_MIN_ROWS', 100):
+            pooled = predict.solve_player_ratings(observations,
+                                                  player_id_to_idx,
+                                                  team_id_to_idx,
+                                                  split_components=True,
+                                                  jobs=2)
+
+        np.testing.assert_allclose(split, whole, atol=1e-4)
+        np.testing.assert_array_equal(pooled, split)
+
+    def test_player_stat_ratings_solve_damped_least_squares(self):
+        rng = random.Random(11)
+        observations = random_player_observations(rng, ['a'], 40, 8, 300)
+        player_id_to_idx, _ = predict.index_ids(
+            [o.player for o in observations])
+        team_id_to_idx, _ = predict.index_ids(
+            [id for o in observations for id in [o.team, o.opponent]])
+        coefficients = predict.build_player_design(
+            [(o.player, o.team, o.opponent) for o in observations],
+            player_id_to_idx, team_id_to_idx)
+        constants = np.array([[o.value, o.value * 2, rng.random()]
+                              for o in observations])
+        damp = 0.5
+
+        ratings = predict.solve_player_stat_ratings(coefficients,
+                                                    constants,
+                                                    player_id_to_idx,
+                                                    team_id_to_idx,
+                                                    damp=damp,
+                                                    normalize=False)
+
+        # Damping is least squares on the system augmented with damp * I
+        n_columns = coefficients.shape[1]
+        augmented = np.vstack(
+            [coefficients.toarray(),
+             damp * np.eye(n_columns)])
+        expected = np.linalg.lstsq(
+            augmented,
+            np.vstack([constants, np.zeros((n_columns, 3))]),
+            rcond=None)[0]
+        np.testing.assert_allclose(ratings, expected, atol=1e-8)
+        single = predict.solve_player_ratings(observations,
+                                              player_id_to_idx,
+                                              team_id_to_idx,
+                                              damp=damp,
+                                              normalize=False)
+        np.testing.assert_allclose(single, ratings[:, 0], atol=1e-8)
+
+    def test_warm_start_moves_rows_to_new_ids(self):
+        warm_start = predict.WarmStart('players',
+                                       player_ids=np.array(['p1', 'p2']),
+                                       team_ids=np.array(['t1', 't2']),
+                                       solution=np.array([[1.0], [2.0],
+                                                          [3.0], [4.0],
+                                                          [5.0], [6.0]]))
+
+        x0 = warm_start.x0({
+            'p2': 0,
+            'p3': 1
+        }, {
+            't3': 0,
+            't1': 1
+        }, (6, 1))
+
+        # p2, p3 (new), offense t3 (new), t1, defense t3 (new), t1
+        np.testing.assert_array_equal(x0[:, 0], [2, 0, 0, 3, 0, 5])
+        self.assertIsNone(
+            warm_start.x0({'p2': 0}, {'t1': 0, 't3': 1}, (5, 2)))
+
+    def test_warm_started_player_solve_matches_cold_solve(self):
+        rng = random.Random(13)
+        observations = random_player_observations(rng, ['a'], 300, 20, 3000)
+        yesterday, today = observations[:-30], observations
+
+        def solve(observations, warm_start):
+            player_id_to_idx, _ = predict.index_ids(
+                [o.player for o in observations])
+            team_id_to_idx, _ = predict.index_ids(
+                [id for o in observations for id in [o.team, o.opponent]])
+            coefficients = predict.build_player_design(
+                [(o.player, o.team, o.opponent) for o in observations],
+                player_id_to_idx, team_id_to_idx)
+            constants = np.array([[o.value, 1.0] for o in observations])
+            ratings = predict.solve_player_stat_ratings(
+                coefficients,
+                constants,
+                player_id_to_idx,
+                team_id_to_idx,
+                warm_start=warm_start)
+            return player_id_to_idx, ratings
+
+        warm_start = predict.WarmStart('players')
+        solve(yesterday, warm_start)
+        cold_iterations = warm_start.iterations
+
+        player_id_to_idx, warm = solve(today, warm_start)
+        _, cold = solve(today, None)
+
+        np.testing.assert_allclose(warm, cold, atol=1e-7)
+        self.assertTrue((warm_start.iterations < cold_iterations).all())
+        np.testing.assert_array_equal(warm_start.cold_iterations,
+                                      cold_iterations)
+        self.assertEqual(len(warm_start.player_ids), len(player_id_to_idx))
+
+    def test_warm_starts_round_trip(self):
+        warm_starts = {'players': predict.WarmStart('players')}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = predict.warm_start_path(tmp, '2024')
+            predict.save_warm_starts(path, warm_starts)
+            self.assertIsNone(predict.load_warm_starts(path)['players'].solution)
+
+            ratings = np.arange(8.0).reshape(4, 2)
+            warm_starts['players'].update({
+                'p1': 0,
+                'p2': 1
+            }, {'t1': 0}, ratings, np.array([4, 5]), warm=False)
+            predict.save_warm_starts(path, warm_starts)
+            loaded = predict.load_warm_starts(path)
+            self.assertFalse(os.path.exists(f'{path}.tmp'))
+
+        x0 = loaded['players'].x0({'p2': 0, 'p1': 1}, {'t1': 0}, (4, 2))
+        np.testing.assert_array_equal(x0, ratings[[1, 0, 2, 3]])
+        np.testing.assert_array_equal(loaded['players'].cold_iterations,
+                                      [4, 5])
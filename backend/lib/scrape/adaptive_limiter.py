@@ -0,0 +1,180 @@
+"""
+Adaptive request pacing driven by server back-pressure.
+
+The limiter spaces requests to a host at a rate that grows additively while
+responses are healthy and is cut multiplicatively when the host pushes back
+(403/429/5xx or a block page), like TCP congestion control. One limiter is
+shared by the HTTP session and the browser fetcher of a scrape, and its rate
+is saved between runs so the next run starts where the last one settled.
+"""
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_STATUSES = frozenset((403, 429))
+
+# Page text served instead of content when the host is shedding load
+BLOCK_INDICATORS = (
+    'Access Denied',
+    'access denied',
+    'queue full',
+    'under heavy load',
+    'too many people are accessing this website',
+)
+
+
+def is_blocked_html(html: str) -> bool:
+    lowered = html.lower()
+    return any(indicator.lower() in lowered for indicator in BLOCK_INDICATORS)
+
+
+def is_backpressure(status: Optional[int], html: Optional[str] = None) -> bool:
+    """Whether a response means the host wants us to slow down"""
+    if status is not None and (status in BACKPRESSURE_STATUSES
+                               or status >= 500):
+        return True
+    return bool(html) and is_blocked_html(html)
+
+
+class AdaptiveRateLimiter:
+    """
+    AIMD request pacer for one host. Safe to share between threads.
+
+    Each healthy response raises the rate by increase_per_minute; each
+    back-pressure response multiplies it by decrease_factor. Back-pressure
+    within cooldown seconds of the last cut is not cut again, since requests
+    already in flight report the same overload.
+    """
+
+    def __init__(self,
+                 per_minute: float = 30,
+                 min_per_minute: float = 3,
+                 max_per_minute: float = 300,
+                 increase_per_minute: float = 0.5,
+                 decrease_factor: float = 0.5,
+                 cooldown: float = 5.0,
+                 state_path: Optional[str] = None):
+        self.min_per_minute = min_per_minute
+        self.max_per_minute = max_per_minute
+        self.increase_per_minute = increase_per_minute
+        self.decrease_factor = decrease_factor
+        self.cooldown = cooldown
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._last_cut = float('-inf')
+        self.per_minute = self._clamp(self._load_rate() or per_minute)
+
+    def _clamp(self, per_minute: float) -> float:
+        return min(self.max_per_minute, max(self.min_per_minute, per_minute))
+
+    def reserve(self) -> float:
+        """Claim the next request slot, returning the seconds to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 60 / self.per_minute
+            return slot - now
+
+    def acquire(self):
+        """Block until the next request slot"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    def record_success(self):
+        with self._lock:
+            self.per_minute = self._clamp(self.per_minute +
+                                          self.increase_per_minute)
+
+    def record_backpressure(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return
+            self._last_cut = now
+            self.per_minute = self._clamp(self.per_minute *
+                                          self.decrease_factor)
+            # Push back the next slot so the cut takes effect immediately
+            self._next_slot = max(self._next_slot, now) + 60 / self.per_minute
+            logger.warning(
+                f'back-pressure from host, slowing to {self.per_minute:.1f} requests/minute'
+            )
+
+    def record(self, status: Optional[int], html: Optional[str] = None):
+        if is_backpressure(status, html):
+            self.record_backpressure()
+        else:
+            self.record_success()
+
+    def _load_rate(self) -> Optional[float]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path) as f:
+                return float(json.load(f)['per_minute'])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f'ignoring unreadable limiter state {self.state_path}: {e}')
+            return None
+
+    def save(self):
+        """Persist the current rate so the next run starts from it"""
+        if not self.state_path:
+            return
+        pathlib.Path(os.path.dirname(self.state_path) or '.').mkdir(
+            parents=True, exist_ok=True)
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'per_minute': self.per_minute}, f)
+        os.replace(tmp_path, self.state_path)
+
+
+class FixedRateLimiter(AdaptiveRateLimiter):
+    """
+    Request pacer for one host at a constant rate, for browser navigations
+    of scrapes without --adaptive-rate. Back-pressure does not change it.
+    """
+
+    def __init__(self, per_minute: float = 30):
+        super().__init__(per_minute=per_minute,
+                         min_per_minute=per_minute,
+                         max_per_minute=per_minute)
+
+    def record_success(self):
+        pass
+
+    def record_backpressure(self):
+        pass
+
+
+class AdaptiveLimiterSession(requests.Session):
+    """
+    requests session paced by an AdaptiveRateLimiter.
+
+    Only requests that reach the network are paced and reported, so with
+    CacheMixin in front cached responses are free.
+    """
+
+    def __init__(self, limiter: AdaptiveRateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.ConnectionError:
+            self.limiter.record_backpressure()
+            raise
+        html = response.text if 'html' in response.headers.get(
+            'content-type', '') else None
+        self.limiter.record(response.status_code, html)
+        return response
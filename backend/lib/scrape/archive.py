@@ -0,0 +1,88 @@
+"""
+Record/replay archive of fetched pages.
+
+A recording run writes every URL the scraper fetches, with its status and
+HTML, to <dir>/<year>/<source>.jsonl.gz. A replay run serves the same URLs
+from that file instead of the network, optionally sleeping to simulate
+latency, so a whole season can be re-scraped offline and repeatably.
+"""
+import gzip
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+import zlib
+from typing import Optional
+
+from .metrics import FetchResult
+
+logger = logging.getLogger(__name__)
+
+
+def archive_path(archive_dir: str, year: str, source: str) -> str:
+    return os.path.join(archive_dir, year, f'{source}.jsonl.gz')
+
+
+class ArchiveRecorder:
+    """Appends fetched pages to an archive. Safe to share between threads."""
+
+    def __init__(self, path: str):
+        pathlib.Path(os.path.dirname(path) or '.').mkdir(parents=True,
+                                                         exist_ok=True)
+        self.path = path
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'wt', encoding='utf-8')
+
+    def record(self, url: str, page_type: Optional[str],
+               result: FetchResult):
+        line = json.dumps({
+            'url': url,
+            'page_type': page_type,
+            'status': result.status,
+            'html': result.html,
+        })
+        with self._lock:
+            self._file.write(line + '\n')
+            self.recorded += 1
+
+    def close(self):
+        self._file.close()
+        logger.info(f'recorded {self.recorded} pages to {self.path}')
+
+
+class ArchiveReplayer:
+    """
+    Serves pages from an archive in place of the network.
+
+    Pages are kept zlib-compressed in memory and decompressed when served.
+    A URL recorded more than once serves its last recording.
+    """
+
+    def __init__(self, path: str, latency: float = 0):
+        self.path = path
+        self.latency = latency
+        self.misses = 0
+        self._pages: dict[str, tuple[Optional[int], Optional[bytes]]] = {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                html = entry['html']
+                self._pages[entry['url']] = (
+                    entry['status'],
+                    zlib.compress(html.encode()) if html is not None else None)
+        logger.info(f'replaying {len(self._pages)} pages from {path}')
+
+    def fetch(self, url: str) -> FetchResult:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        if url not in self._pages:
+            self.misses += 1
+            logger.warning(f'{url} is not in the replay archive')
+            return FetchResult(html=None)
+        status, compressed = self._pages[url]
+        html = zlib.decompress(compressed).decode(
+        ) if compressed is not None else None
+        return FetchResult(html=html, status=status)
@@ -28,4 +28,61 @@ def add_parsers(parsers):
     schedule_parser.add_argument('--div', help='Scrape by div id')
     schedule_parser.add_argument('--limit',
                                  help='Limit number of teams scraped')
+    schedule_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of teams/games fetched and parsed concurrently')
+    schedule_parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse final games from the existing games output instead of re-scraping them')
+    schedule_parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Write schedules and games incrementally to keep memory bounded')
+    schedule_parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted run from its journal instead of starting over')
+    schedule_parser.add_argument(
+        '--adaptive-rate',
+        action='store_true',
+        help='Adapt the request rate to server back-pressure instead of using a fixed limit')
+    schedule_parser.add_argument(
+        '--record-archive',
+        help='Directory to record every fetched page into, for offline replay')
+    schedule_parser.add_argument(
+        '--replay-archive',
+        help='Directory of a recorded archive to serve pages from instead of the network')
+    schedule_parser.add_argument(
+        '--replay-latency',
+        type=float,
+        default=0,
+        help='Seconds to sleep per replayed page, to simulate network latency')
+    schedule_parser.add_argument(
+        '--ncaa-fetcher',
+        choices=['browser', 'http'],
+        default='browser',
+        help='Fetch NCAA pages with headless Firefox, or with a Firefox-impersonating HTTP client that falls back to the browser when blocked')
+    schedule_parser.add_argument(
+        '--cache-max-mb',
+        type=float,
+        help='After scraping, prune expired entries and evict least recently used ones until each cache fits this size')
+    schedule_parser.add_argument(
+        '--shard',
+        help='Scrape only shard i of N (as i/N) of the teams and their games into out/<year>/shards, to be combined with merge. Needs the team list from `scrape teams` (or --team-list-file)')
+    schedule_parser.add_argument(
+        '--no-parse-cache',
+        dest='parse_cache',
+        action='store_false',
+        help='Convert every page again instead of reusing conversions of unchanged pages from out/cache/parse')
     schedule_parser.set_defaults(func=scrape.scrape_schedules)
+
+    merge_parser = scrape_subparsers.add_parser(
+        'merge', help='combine sharded schedule scrapes')
+    merge_parser.add_argument('--shards',
+                              type=int,
+                              required=True,
+                              help='Number of shards the scrape was split into')
+    merge_parser.set_defaults(func=scrape.merge_shards)
@@ -0,0 +1,150 @@
+"""
+Date and time parsing for the formats the scrapers see.
+
+The league sites print dates in a handful of fixed shapes ("Fri Feb 9 7:00pm
+2024", "Jan 31 2024 12:00 EST", "02/10/2024") and the scraped output stores
+ISO 8601 strings. These are parsed directly, falling back to dateutil for
+anything else, and memoized since a season repeats the same strings many
+times over. Results match what dateutil.parser.parse(..., tzinfos=TIMEZONES)
+would give.
+"""
+import datetime
+import functools
+import re
+
+import dateutil.parser
+
+# Offsets in seconds of the timezone abbreviations the sites use
+TIMEZONES = {
+    'PDT': -7 * 3600,
+    'PST': -8 * 3600,
+    'MDT': -6 * 3600,
+    'MST': -7 * 3600,
+    'CDT': -5 * 3600,
+    'CST': -6 * 3600,
+    'EDT': -4 * 3600,
+    'EST': -5 * 3600
+}
+
+MONTH_NAMES = [
+    'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+    'september', 'october', 'november', 'december'
+]
+# Full and abbreviated names, lower case
+MONTHS = {name: number
+          for number, name in enumerate(MONTH_NAMES, 1)
+          } | {name[:3]: number
+               for number, name in enumerate(MONTH_NAMES, 1)} | {'sept': 9}
+WEEKDAY_NAMES = [
+    'monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday',
+    'sunday'
+]
+WEEKDAYS = set(WEEKDAY_NAMES) | {name[:3]
+                                 for name in WEEKDAY_NAMES
+                                 } | {'tues', 'thur', 'thurs'}
+
+TIME_REGEX = re.compile(
+    r'(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>[ap]m)?',
+    re.IGNORECASE)
+TIME_STRING_REGEX = re.compile(
+    TIME_REGEX.pattern + r'(?:\s+(?P<tz>[A-Z]{3}))?', re.IGNORECASE)
+
+_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def is_time(text: str) -> bool:
+    """Whether text is a time of day, e.g. '7:00pm' or '12:00 EST'"""
+    match = TIME_STRING_REGEX.fullmatch(text.strip())
+    if match and _time(match) is not None and (
+            match.group('tz') is None or match.group('tz').upper() in TIMEZONES):
+        return True
+    try:
+        dateutil.parser.parse(text, tzinfos=TIMEZONES)
+        return True
+    except (ValueError, OverflowError):
+        return False
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def parse_datetime(text: str) -> str:
+    """Parse a site's date and time into an ISO 8601 string"""
+    parsed = _parse_known_format(text)
+    if parsed is None:
+        parsed = dateutil.parser.parse(text, tzinfos=TIMEZONES)
+    return parsed.isoformat()
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def mdy_to_iso_date(text: str) -> str:
+    """Convert an mm/dd/yyyy date into an ISO 8601 date"""
+    return datetime.datetime.strptime(text, '%m/%d/%Y').date().isoformat()
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def iso_date(text: str) -> datetime.date:
+    """The calendar date of an ISO 8601 date or datetime string"""
+    try:
+        return datetime.datetime.fromisoformat(text).date()
+    except ValueError:
+        return dateutil.parser.isoparse(text).date()
+
+
+def _time(match: re.Match) -> tuple[int, int] | None:
+    hour = int(match.group('hour'))
+    minute = int(match.group('minute') or 0)
+    meridiem = (match.group('meridiem') or '').lower()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == 'pm' else 0)
+    elif match.group('minute') is None:
+        # A bare number is a day or year, not a time
+        return None
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def _parse_known_format(text: str) -> datetime.datetime | None:
+    """
+    Parse "[weekday] month day [time] [tz] year" in any order of the time,
+    tz and year parts, or return None for anything else.
+    """
+    tokens = text.replace(',', ' ').split()
+    year = month = day = tz = time = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        lower = token.lower().rstrip('.')
+        if lower in WEEKDAYS and month is None:
+            pass
+        elif lower in MONTHS and month is None:
+            month = MONTHS[lower]
+        elif token.isdigit() and len(token) == 4 and year is None:
+            year = int(token)
+        elif token.isdigit() and len(token) <= 2 and day is None and month:
+            day = int(token)
+        elif token.upper() in TIMEZONES and tz is None:
+            tz = datetime.timezone(datetime.timedelta(
+                seconds=TIMEZONES[token.upper()]))
+        else:
+            # A time, possibly split from its am/pm
+            time_text = token
+            if i + 1 < len(tokens) and tokens[i + 1].lower() in ('am', 'pm'):
+                time_text += tokens[i + 1]
+                i += 1
+            match = TIME_REGEX.fullmatch(time_text)
+            if time is not None or not match:
+                return None
+            time = _time(match)
+            if time is None:
+                return None
+        i += 1
+    if year is None or month is None or day is None:
+        return None
+    hour, minute = time or (0, 0)
+    try:
+        return datetime.datetime(year, month, day, hour, minute, tzinfo=tz)
+    except ValueError:
+        return None
@@ -0,0 +1,186 @@
+"""
+Storage for the scrapers' requests_cache sessions.
+
+Responses are pickled and zlib-compressed, expire per URL pattern, and are
+tracked by last access so the cache can be pruned back under a size cap by
+evicting the least recently used responses first.
+
+Each source has its own cache, out/cache/<source>.sqlite. Older runs kept
+every source's responses uncompressed in out/cache.sqlite; a source's new
+cache imports its responses from there when it is first created, and the
+old file can be deleted once every source has run.
+"""
+import logging
+import time
+import zlib
+from urllib.parse import urlparse
+from datetime import timedelta
+from typing import Optional
+
+from requests_cache import NEVER_EXPIRE, SQLiteCache
+from requests_cache.serializers import SerializerPipeline, Stage, pickle_serializer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXPIRE_AFTER = timedelta(days=1)
+
+# The cache every source shared before they were split, under out/
+LEGACY_CACHE_FILE = 'cache.sqlite'
+
+# Glob patterns (without scheme) matched in order; unmatched URLs use
+# DEFAULT_EXPIRE_AFTER. Team lists, schedules and rosters change as games are
+# played, so only NCAA box scores live longer. MCLA game pages are linked
+# before games are played and fill in their results and stats later, so
+# they keep the default.
+URLS_EXPIRE_AFTER = {
+    # NCAA box scores are only linked once a game is final
+    'stats.ncaa.org/contests/*/individual_stats': NEVER_EXPIRE,
+}
+
+
+def _decompress(data: bytes) -> bytes:
+    try:
+        return zlib.decompress(data)
+    except zlib.error as e:
+        # Uncompressed entries from older caches are treated as misses
+        raise ValueError(f'Cached response is not compressed: {e}') from e
+
+
+compressed_serializer = SerializerPipeline(
+    [
+        *pickle_serializer.stages,
+        Stage(dumps=zlib.compress, loads=_decompress),
+    ],
+    name='pickle-zlib',
+    is_binary=True,
+)
+
+
+class LruSQLiteCache(SQLiteCache):
+    """
+    SQLite response cache that records when each response was last used.
+
+    Access times live in an extra table of the same database; prune() uses
+    them to evict the least recently used responses. Like the page and parse
+    caches it uses WAL and waits on locks, since the shards of a scrape and
+    `cache prune` may open it from other processes.
+    """
+
+    def __init__(self, db_path: str, **kwargs):
+        kwargs.setdefault('serializer', compressed_serializer)
+        kwargs.setdefault('wal', True)
+        kwargs.setdefault('busy_timeout', 30000)
+        super().__init__(db_path, **kwargs)
+        with self.responses.connection(commit=True) as con:
+            con.execute('CREATE TABLE IF NOT EXISTS access ('
+                        '    key TEXT PRIMARY KEY,'
+                        '    accessed_at REAL NOT NULL,'
+                        '    hits INTEGER NOT NULL DEFAULT 0'
+                        ')')
+
+    def _touch(self, key: str, hit: bool):
+        with self.responses.connection(commit=True) as con:
+            con.execute(
+                'INSERT INTO access (key, accessed_at, hits) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET accessed_at = excluded.accessed_at, '
+                'hits = hits + excluded.hits', (key, time.time(), int(hit)))
+
+    def get_response(self, key: str, default=None):
+        response = super().get_response(key, default)
+        if response is not default:
+            self._touch(key, hit=True)
+        return response
+
+    def save_response(self, response, cache_key: Optional[str] = None,
+                      expires=None):
+        super().save_response(response, cache_key, expires)
+        self._touch(cache_key or self.create_key(response.request), hit=False)
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self.responses.connection() as con:
+            entries, expired, stored_bytes = con.execute(
+                'SELECT COUNT(*), COALESCE(SUM(expires IS NOT NULL AND expires <= ?), 0), '
+                'COALESCE(SUM(LENGTH(value)), 0) FROM responses',
+                (now, )).fetchone()
+            hits = con.execute(
+                'SELECT COALESCE(SUM(hits), 0) FROM access').fetchone()[0]
+        return {
+            'entries': entries,
+            'expired': expired,
+            'stored_bytes': stored_bytes,
+            'file_bytes': self.responses.size(),
+            'hits': hits,
+        }
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete expired responses, then least recently used ones until the
+        stored responses fit in max_bytes. Returns the number deleted.
+        """
+        before = self.responses.count()
+        self.delete(expired=True)
+        if max_bytes is not None:
+            rows = self.usage()
+            total = sum(size for _, _, size in rows)
+            evict = []
+            for _, key, size in rows:
+                if total <= max_bytes:
+                    break
+                evict.append(key)
+                total -= size
+            self.evict(evict)
+        with self.responses.connection(commit=True) as con:
+            con.execute(
+                'DELETE FROM access WHERE key NOT IN (SELECT key FROM responses)')
+        deleted = before - self.responses.count()
+        self.responses.vacuum()
+        logger.info(f'pruned {deleted} responses from {self.responses.db_path}')
+        return deleted
+
+    def usage(self) -> list[tuple[float, str, int]]:
+        """(last access, key, stored bytes) of each response, oldest first"""
+        with self.responses.connection() as con:
+            return con.execute(
+                'SELECT COALESCE(a.accessed_at, 0), r.key, LENGTH(r.value) '
+                'FROM responses r LEFT JOIN access a ON a.key = r.key '
+                'ORDER BY 1 ASC').fetchall()
+
+    def evict(self, keys: list[str]):
+        if not keys:
+            return
+        self.delete(*keys)
+        with self.responses.connection(commit=True) as con:
+            con.executemany('DELETE FROM access WHERE key = ?',
+                            [(key, ) for key in keys])
+
+    def pages(self):
+        """Yield (url, status, html) for every cached response"""
+        for response in self.responses.values():
+            yield response.url, response.status_code, response.text
+
+
+def import_legacy_cache(legacy_path: str, cache: LruSQLiteCache,
+                        host: str) -> int:
+    """
+    Copy the unexpired responses for host from a cache written before caches
+    were split by source. Returns the number copied.
+    """
+    legacy = SQLiteCache(legacy_path)
+    copied = 0
+    try:
+        for key in list(legacy.responses.keys()):
+            try:
+                response = legacy.responses[key]
+            except Exception as e:
+                logger.debug(f'skipping unreadable legacy response {key}: {e}')
+                continue
+            if response.is_expired or urlparse(response.url).netloc != host:
+                continue
+            cache.save_response(response, key, response.expires)
+            copied += 1
+    finally:
+        legacy.close()
+    logger.info(f'imported {copied} {host} responses from {legacy_path} '
+                f'into {cache.responses.db_path}')
+    return copied
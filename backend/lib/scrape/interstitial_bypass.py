@@ -1,13 +1,33 @@
 """
 Akamai interstitial bypass wrapper for any HTTP session.
 Detects and solves interstitial challenges, delegates to underlying session.
+
+The clearance cookies earned by a solve can be persisted to a cookie file,
+so later runs and other worker processes reuse them instead of solving the
+challenge again on first contact.
 """
+import contextlib
+import fcntl
+import json
+import os
+import pathlib
 import re
 import logging
-from typing import Any
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any, Optional
+
+from requests.cookies import create_cookie
 
 logger = logging.getLogger(__name__)
 
+# Marker of the Akamai interstitial challenge page
+INTERSTITIAL_MARKER = 'bm-verify'
+
+# Lifetime assumed for persisted cookies that have no expiry of their own
+SESSION_COOKIE_TTL = 2 * 3600
+
 
 class InterstitialBypassSession:
     """
@@ -15,13 +35,20 @@ class InterstitialBypassSession:
     Can wrap any session object with a get() method.
     """
     
-    def __init__(self, base_session):
+    def __init__(self, base_session, cookie_file: Optional[str] = None):
         """
         Args:
             base_session: Any session with a get() method (requests.Session, 
                          CachedSession, LimitedCachedSession, etc.)
+            cookie_file: JSON file to load clearance cookies from and save
+                         them to after each solve
         """
         self.session = base_session
+        self.cookie_file = cookie_file
+        self._cookie_file_mtime: Optional[float] = None
+        self._cookie_lock = threading.Lock()
+        if cookie_file:
+            self._load_cookies()
     
     def get(self, url: str, **kwargs) -> Any:
         """
@@ -37,6 +64,13 @@ class InterstitialBypassSession:
             self._invalidate_cache(url)
             resp = self.session.get(url, **kwargs)
         
+        # Another process may have solved the challenge since our cookies
+        # were loaded; try its cookies before solving again
+        if self._is_interstitial(resp) and self._reload_cookies():
+            logger.info(f"Retrying {url} with refreshed clearance cookies")
+            self._invalidate_cache(url)
+            resp = self.session.get(url, **kwargs)
+
         # Check if we got an Akamai interstitial
         if self._is_interstitial(resp):
             logger.info(f"Akamai interstitial detected for {url}, solving...")
@@ -50,6 +84,7 @@ class InterstitialBypassSession:
                 
                 if not self._is_interstitial(resp):
                     logger.info("Akamai challenge solved successfully")
+                    self._save_cookies()
                 else:
                     logger.warning("Failed to solve Akamai challenge")
             else:
@@ -57,6 +92,10 @@ class InterstitialBypassSession:
         
         return resp
     
+    def invalidate(self, url: str):
+        """Drop a cached response, e.g. one later found to be a block page."""
+        self._invalidate_cache(url)
+
     def _invalidate_cache(self, url: str):
         """Invalidate cached response for a URL if session has a cache."""
         if hasattr(self.session, 'cache') and hasattr(self.session.cache, 'delete'):
@@ -66,10 +105,80 @@ class InterstitialBypassSession:
             except Exception as e:
                 logger.debug(f"Could not invalidate cache: {e}")
     
+    @contextlib.contextmanager
+    def _locked_cookie_file(self) -> Iterator[None]:
+        """Hold an exclusive lock on the cookie file across processes"""
+        pathlib.Path(os.path.dirname(self.cookie_file) or '.').mkdir(
+            parents=True, exist_ok=True)
+        with self._cookie_lock, open(self.cookie_file + '.lock', 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _load_cookies(self) -> int:
+        """Add the unexpired cookies in the cookie file to the session"""
+        with self._locked_cookie_file():
+            try:
+                mtime = os.path.getmtime(self.cookie_file)
+                with open(self.cookie_file) as f:
+                    saved = json.load(f)
+            except FileNotFoundError:
+                return 0
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable cookie file {self.cookie_file}: {e}")
+                return 0
+        self._cookie_file_mtime = mtime
+        now = time.time()
+        loaded = 0
+        for cookie in saved:
+            if cookie['expires'] is not None and cookie['expires'] <= now:
+                continue
+            self.session.cookies.set_cookie(create_cookie(**cookie))
+            loaded += 1
+        logger.info(f"Loaded {loaded} clearance cookies from {self.cookie_file}")
+        return loaded
+
+    def _reload_cookies(self) -> bool:
+        """Load the cookie file again if it changed since it was last read"""
+        if not self.cookie_file:
+            return False
+        try:
+            mtime = os.path.getmtime(self.cookie_file)
+        except OSError:
+            return False
+        if self._cookie_file_mtime is not None and mtime <= self._cookie_file_mtime:
+            return False
+        return self._load_cookies() > 0
+
+    def _save_cookies(self):
+        """Write the session's cookies to the cookie file, replacing it atomically"""
+        if not self.cookie_file:
+            return
+        now = time.time()
+        cookies = [{
+            'name': cookie.name,
+            'value': cookie.value,
+            'domain': cookie.domain,
+            'path': cookie.path,
+            'secure': cookie.secure,
+            # Session cookies are only trusted for a while
+            'expires': cookie.expires if cookie.expires is not None else
+            int(now + SESSION_COOKIE_TTL),
+        } for cookie in self.session.cookies]
+        with self._locked_cookie_file():
+            tmp_path = f'{self.cookie_file}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(cookies, f, indent=2)
+            os.replace(tmp_path, self.cookie_file)
+            self._cookie_file_mtime = os.path.getmtime(self.cookie_file)
+        logger.info(f"Saved {len(cookies)} clearance cookies to {self.cookie_file}")
+
     def _is_interstitial(self, resp) -> bool:
         """Check if response is an Akamai interstitial challenge."""
         try:
-            return resp.status_code == 200 and 'bm-verify' in resp.text
+            return resp.status_code == 200 and INTERSTITIAL_MARKER in resp.text
         except:
             return False
     
@@ -0,0 +1,102 @@
+"""
+Append-only journal of completed scrape work.
+
+Each finished unit of work (the team list, a team schedule with its roster,
+a game's details) is appended as one JSON line as soon as it completes, so
+a run that is killed part way can be resumed from the journal instead of
+starting over. A line cut short by the crash is discarded on replay.
+
+Replay only indexes byte offsets by (kind, id); entries are read back from
+disk when they are needed, so resuming does not hold the journalled season
+in memory.
+"""
+import json
+import logging
+import os
+import pathlib
+import threading
+from typing import Optional, TypeVar
+
+from ..shared.types import BaseType
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T', bound=BaseType)
+
+
+class ScrapeJournal:
+    """
+    Journal of completed work for one source and year.
+
+    With resume the existing journal is replayed and appended to; otherwise
+    it is truncated. Safe to share between threads.
+    """
+
+    def __init__(self, path: str, resume: bool = False):
+        pathlib.Path(os.path.dirname(path) or '.').mkdir(parents=True,
+                                                         exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets: dict[tuple[str, str], int] = {}
+        if resume and os.path.exists(path):
+            self._replay()
+        else:
+            open(path, 'wb').close()
+        self._writer = open(path, 'ab')
+        self._reader = open(path, 'rb')
+
+    def _replay(self):
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError('missing line terminator')
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        f'discarding truncated journal entry at byte {offset} of {self.path}'
+                    )
+                    break
+                self._offsets[(entry['kind'], entry['id'])] = offset
+                offset += len(line)
+        os.truncate(self.path, offset)
+
+    def record(self, kind: str, id: str, obj: Optional[BaseType] = None):
+        """Append a completed unit of work, flushed before returning"""
+        line = json.dumps({
+            'kind': kind,
+            'id': id,
+            'data': obj.to_dict() if obj is not None else None
+        }).encode() + b'\n'
+        with self._lock:
+            offset = self._writer.tell()
+            self._writer.write(line)
+            self._writer.flush()
+            self._offsets[(kind, id)] = offset
+
+    def has(self, kind: str, id: str) -> bool:
+        return (kind, id) in self._offsets
+
+    def count(self, kind: str) -> int:
+        return sum(1 for k, _ in self._offsets if k == kind)
+
+    def load(self, cls: type[T], kind: str, id: str) -> Optional[T]:
+        """Read back a recorded entry, or None if it is not in the journal"""
+        offset = self._offsets.get((kind, id))
+        if offset is None:
+            return None
+        with self._lock:
+            self._reader.seek(offset)
+            line = self._reader.readline()
+        data = json.loads(line)['data']
+        return cls.from_dict(data) if data is not None else None
+
+    def close(self):
+        self._writer.close()
+        self._reader.close()
+
+    def discard(self):
+        """Close and delete the journal once its run has completed"""
+        self.close()
+        os.remove(self.path)
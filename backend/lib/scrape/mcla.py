@@ -2,23 +2,11 @@ from collections.abc import Iterator
 import datetime
 import re
 from typing import Any, Generator
-from bs4 import BeautifulSoup
-import dateutil
-import dateutil.parser as parser
-from .tables import parse_table
+from .parsing import make_soup, subtrees
+from .dates import is_time, iso_date, parse_datetime
+from .tables import int_column, parse_table
 from ..shared.types import FaceOffResults, Team, Location, ScheduleGame, TeamSummary, Game, ScheduleGameResult, GameResult, GameStatLine, Roster, RosterPlayer, Coach, Conference, PlayerSummary
 
-TIMEZONES = {
-    'PDT': -7 * 3600,
-    'PST': -8 * 3600,
-    'MDT': -6 * 3600,
-    'MST': -7 * 3600,
-    'CDT': -5 * 3600,
-    'CST': -6 * 3600,
-    'EDT': -4 * 3600,
-    'EST': -5 * 3600
-}
-
 DIVISION_MAP = {
     'Division I': '1',
     'Division 1': '1',
@@ -31,6 +19,16 @@ DIVISION_MAP = {
 
 
 class Mcla():
+    # Bump when a converter's output changes, invalidating the parse cache
+    PARSER_VERSION = 1
+
+    # Converters that judge games against today's date, which the runner
+    # passes in so it becomes part of their parse cache key
+    DATED_CONVERTERS = frozenset({'convert_schedule_html'})
+
+    # The only parts of a game page convert_game_details_html reads
+    GAME_DETAILS_SUBTREES = subtrees('div', 'game-page-header', 'team-info',
+                                     'roster-groups')
 
     def get_team_list_urls(self, year: str) -> Generator[Location, Any, Any]:
         yield Location(
@@ -40,7 +38,7 @@ class Mcla():
 
     def convert_team_list_html(self, html: str, year: str,
                                location: Location) -> Iterator[Team]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         
         box_titles = soup.find_all('h4', class_='box__title')
         for title in box_titles:
@@ -80,9 +78,13 @@ class Mcla():
                     sport='ml',
                     source='mcla')
 
-    def convert_schedule_html(self, html: str,
-                              team: Team) -> Iterator[ScheduleGame]:
-        soup = BeautifulSoup(html, 'html.parser')
+    def convert_schedule_html(
+            self,
+            html: str,
+            team: Team,
+            today: datetime.date | None = None) -> Iterator[ScheduleGame]:
+        today = today or datetime.date.today()
+        soup = make_soup(html)
         opponent_rows = soup.find_all('div', class_='game-opponent-tile')
         games = []
         for row in opponent_rows:
@@ -92,7 +94,7 @@ class Mcla():
             time_string = next(
                 row.find('p',
                          class_='game-opponent-tile__time').stripped_strings)
-            time = time_string if _is_time(time_string) else ''
+            time = time_string if is_time(time_string) else ''
             score_div = row.find('div', class_='game-opponent-tile__result')
 
             opponent_p = opponent_div.find('p', class_='opponent__name')
@@ -110,7 +112,7 @@ class Mcla():
 
             date = ' '.join(
                 list(date_div.stripped_strings) + [time] + [team.year])
-            date = parser.parse(date, tzinfos=TIMEZONES).isoformat()
+            date = parse_datetime(date)
             game_details_url = score_div.a['href']
             details = Location(
                 url=self._convert_url_to_absolute(game_details_url))
@@ -128,8 +130,7 @@ class Mcla():
             if score_match:
                 points_for = int(score_match.group('points_for'))
                 points_against = int(score_match.group('points_against'))
-                d = dateutil.parser.isoparse(date).date()
-                today = datetime.date.today()
+                d = iso_date(date)
                 if d < today:
                     result = ScheduleGameResult(points_for=points_for,
                                                 points_against=points_against)
@@ -153,13 +154,13 @@ class Mcla():
 
         return games
 
-    def cross_link_schedules(self, schedules):
+    def cross_link_schedules(self, schedules, teams=None):
         pass
 
     def convert_game_details_html(self, html: str, location: Location,
                                   game_id: str, sport: str, source: str,
                                   home_team: Team, away_team: Team) -> Game:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, parse_only=self.GAME_DETAILS_SUBTREES)
         
         game_page_header = soup.find('div', class_='game-page-header')
         away_team_div = game_page_header.find('div', class_='game-page-header__team--away')
@@ -187,8 +188,8 @@ class Mcla():
         # Game details don't include time or timezone, default to noon EST
         year = getattr(home_team, 'year', None) or getattr(away_team, 'year', None)
         if not year:
-            year = str(datetime.date.today().year)
-        date = parser.parse(date_str + ' ' + year + ' 12:00 EST', tzinfos=TIMEZONES).isoformat()
+            raise Exception(f'No season year for game {game_id}')
+        date = parse_datetime(date_str + ' ' + year + ' 12:00 EST')
         
         home_team = TeamSummary(id=home_id, name=home_name)
         away_team = TeamSummary(id=away_id, name=away_name)
@@ -237,7 +238,7 @@ class Mcla():
                     away_stats=away_stats)
 
     def convert_roster(self, html: str, team: Team) -> Roster:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         head_coach_tag = soup.find('div', class_='coach-tile__info')
         if head_coach_tag:
             coach = Coach(
@@ -268,6 +269,9 @@ class Mcla():
     def get_limiter_session_args(self):
         return {'per_minute': 30}
 
+    def get_ready_selector(self, page_type):
+        return None
+
     def _parse_stats_tables(self, tables, sport, source):
         stats = []
 
@@ -281,11 +285,10 @@ class Mcla():
                 del kwargs['fol']
             return GameStatLine(face_offs=face_offs, **kwargs)
 
+        columns = self._stats_columns(sport, source)
         for table in tables:
-            rows = parse_table(
-                table, lambda col, cell: self._parse_stats_table_row(
-                    sport, source, col, cell), make_stats_line,
-                table.select_one('thead tr:not(.pre-header)'))
+            rows = parse_table(table, columns, make_stats_line,
+                               table.select_one('thead tr:not(.pre-header)'))
             stats.extend(rows)
         return stats
 
@@ -352,39 +355,35 @@ class Mcla():
                             weight=weight,
                             hometown=hometown)
 
-    def _parse_stats_table_row(self, sport, source, col_name, cell):
-        if col_name == '#':
-            return {'number': int(cell.string) if cell.string else None}
-        if col_name == 'Player':
+    def _stats_columns(self, sport, source):
+
+        def set_number(cell, row):
+            row['number'] = int(cell.string) if cell.string else None
+
+        def set_player(cell, row):
             link = cell.find('a')
             if not link:
-                return None
-            name = link.get_text(strip=True)
+                return
             pos_tag = cell.find('span', class_='position')
-            position = pos_tag.get_text(strip=True) if pos_tag else None
-            return {
-                'player':
-                PlayerSummary(id=self._parse_player_link_into_id(
-                    sport, source, link['href']),
-                              name=name,
-                              external_link=self._convert_url_to_absolute(
-                                  link['href'])),
-                'position': position
-            }
-        if col_name == 'FO-W':
-            return {'fow': int(cell.string)}
-        if col_name == 'FO-L':
-            return {'fol': int(cell.string)}
-        if col_name == 'GB':
-            return {'gb': int(cell.string)}
-        if col_name == 'G':
-            return {'g': int(cell.string)}
-        if col_name == 'A':
-            return {'a': int(cell.string)}
-        if col_name == 'SV':
-            return {'s': int(cell.string)}
-        if col_name == 'GA':
-            return {'ga': int(cell.string)}
+            row['player'] = PlayerSummary(
+                id=self._parse_player_link_into_id(sport, source,
+                                                   link['href']),
+                name=link.get_text(strip=True),
+                external_link=self._convert_url_to_absolute(link['href']))
+            row['position'] = pos_tag.get_text(
+                strip=True) if pos_tag else None
+
+        return {
+            '#': set_number,
+            'Player': set_player,
+            'FO-W': int_column('fow'),
+            'FO-L': int_column('fol'),
+            'GB': int_column('gb'),
+            'G': int_column('g'),
+            'A': int_column('a'),
+            'SV': int_column('s'),
+            'GA': int_column('ga'),
+        }
 
     def _normalize_slug(self, slug):
         return re.sub(r'\_', '-', slug)
@@ -420,10 +419,3 @@ class Mcla():
         else:
             return 'https://mcla.us' + href
 
-
-def _is_time(time_string):
-    try:
-        parser.parse(time_string, tzinfos=TIMEZONES)
-        return True
-    except:
-        return False
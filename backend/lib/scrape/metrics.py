@@ -0,0 +1,172 @@
+"""
+Per-run scrape telemetry.
+
+ScrapeRunner records every fetch and every conversion here, keyed by page
+type (team_list, schedule, roster, game_details). At the end of the run the
+totals and latency percentiles are written to
+out/<year>/<source>-scrape-metrics.json and logged as a table, so runs can
+be compared to see where scrape time goes.
+"""
+import contextlib
+import dataclasses
+import datetime
+import json
+import math
+import threading
+import time
+from collections.abc import Iterator
+from typing import Optional
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclasses.dataclass
+class FetchResult:
+    """Outcome of fetching one page, as seen by the fetcher"""
+    html: Optional[str]
+    status: Optional[int] = None
+    from_cache: bool = False
+    # Navigations or requests made, including the successful one
+    attempts: int = 1
+    # Attempts answered with a block page or back-pressure status
+    blocked_attempts: int = 0
+
+
+@dataclasses.dataclass
+class PageTypeMetrics:
+    fetches: int = 0
+    cache_hits: int = 0
+    failures: int = 0
+    bytes: int = 0
+    retries: int = 0
+    blocks: int = 0
+    parses: int = 0
+    parse_failures: int = 0
+    # Conversions served from the parse cache instead of parsing
+    parse_cache_hits: int = 0
+    fetch_seconds: list[float] = dataclasses.field(default_factory=list)
+    parse_seconds: list[float] = dataclasses.field(default_factory=list)
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize_seconds(values: list[float]) -> dict:
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+    summary = {
+        'count': len(ordered),
+        'total': sum(ordered),
+        'mean': sum(ordered) / len(ordered),
+    }
+    for p in PERCENTILES:
+        summary[f'p{p}'] = percentile(ordered, p)
+    summary['max'] = ordered[-1]
+    return summary
+
+
+class ScrapeMetrics:
+    """Fetch and parse measurements for one scrape run. Safe to share between threads."""
+
+    def __init__(self, source: str, year: str):
+        self.source = source
+        self.year = year
+        self.started_at = datetime.datetime.now(datetime.UTC)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.page_types: dict[str, PageTypeMetrics] = {}
+
+    def _page_type(self, page_type: Optional[str]) -> PageTypeMetrics:
+        return self.page_types.setdefault(page_type or 'other',
+                                          PageTypeMetrics())
+
+    def record_fetch(self, page_type: Optional[str], seconds: float,
+                     result: FetchResult):
+        with self._lock:
+            metrics = self._page_type(page_type)
+            metrics.fetches += 1
+            metrics.fetch_seconds.append(seconds)
+            metrics.cache_hits += result.from_cache
+            metrics.retries += max(0, result.attempts - 1)
+            metrics.blocks += result.blocked_attempts
+            if result.html is None:
+                metrics.failures += 1
+            else:
+                metrics.bytes += len(result.html.encode())
+
+    @contextlib.contextmanager
+    def time_parse(self, page_type: Optional[str]) -> Iterator[None]:
+        """Time the conversion in the body, counting it failed if it raises"""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                metrics = self._page_type(page_type)
+                metrics.parses += 1
+                metrics.parse_failures += failed
+                metrics.parse_seconds.append(seconds)
+
+    def record_parse_cache_hit(self, page_type: Optional[str]):
+        with self._lock:
+            self._page_type(page_type).parse_cache_hits += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            page_types = {
+                name: {
+                    'fetches': m.fetches,
+                    'cache_hits': m.cache_hits,
+                    'cache_misses': m.fetches - m.cache_hits,
+                    'failures': m.failures,
+                    'bytes': m.bytes,
+                    'retries': m.retries,
+                    'blocks': m.blocks,
+                    'fetch_seconds': summarize_seconds(m.fetch_seconds),
+                    'parses': m.parses,
+                    'parse_failures': m.parse_failures,
+                    'parse_cache_hits': m.parse_cache_hits,
+                    'parse_seconds': summarize_seconds(m.parse_seconds),
+                }
+                for name, m in sorted(self.page_types.items())
+            }
+        return {
+            'source': self.source,
+            'year': self.year,
+            'started_at': self.started_at.isoformat(),
+            'elapsed_seconds': time.perf_counter() - self._start,
+            'page_types': page_types,
+        }
+
+    def write(self, path: str):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def format_table(self) -> str:
+        summary = self.summary()
+        lines = [
+            f'{"page type":<14}{"fetches":>8}{"hit %":>7}{"MiB":>8}'
+            f'{"retries":>8}{"blocks":>7}{"fetch p50":>10}{"p90":>8}'
+            f'{"p99":>8}{"parse p50":>10}{"p99":>8}'
+        ]
+        for name, m in summary['page_types'].items():
+            fetch = m['fetch_seconds']
+            parse = m['parse_seconds']
+            hit_rate = m['cache_hits'] / m['fetches'] if m['fetches'] else 0
+            lines.append(f'{name:<14}{m["fetches"]:>8}{hit_rate:>7.0%}'
+                         f'{m["bytes"] / 2**20:>8.1f}{m["retries"]:>8}'
+                         f'{m["blocks"]:>7}'
+                         f'{fetch.get("p50", 0):>10.3f}{fetch.get("p90", 0):>8.3f}'
+                         f'{fetch.get("p99", 0):>8.3f}'
+                         f'{parse.get("p50", 0):>10.3f}{parse.get("p99", 0):>8.3f}')
+        lines.append(f'elapsed {summary["elapsed_seconds"]:.1f}s')
+        return '\n'.join(lines)
@@ -1,19 +1,34 @@
-from typing import Any
-
 from .tables import parse_table
 from ..shared.types import Game, GameResult, GameStatLine, PlayerSummary, ScheduleGame, ScheduleGameResult, Scraper, Location, Team, TeamDetail, TeamSummary
 from urllib.parse import urlparse, parse_qsl
 from collections.abc import Iterator
-from bs4 import BeautifulSoup
-import datetime
+from .dates import mdy_to_iso_date
+from .parsing import make_soup, subtrees
 import re
 
 SPORT_MAP = {'MLA': 'ml', 'WLA': 'wl'}
 
+# DOM that each converter reads; browser fetches return once it exists
+READY_SELECTORS = {
+    'team_list': 'table',
+    'schedule': 'div.card-header:has-text("Schedule/Results")',
+    'game_details': 'table.dataTable',
+}
+
 
 class Ncaa(Scraper):
     base_url = 'https://stats.ncaa.org'
 
+    # Bump when a converter's output changes, invalidating the parse cache
+    PARSER_VERSION = 1
+
+    # No converter depends on the date it runs
+    DATED_CONVERTERS = frozenset()
+
+    # The score header and the player stats cards are all table-responsive
+    # blocks; convert_game_details_html reads nothing else on the page
+    GAME_DETAILS_SUBTREES = subtrees('div', 'table-responsive')
+
     def __init__(self, sports=['MLA', 'WLA'], divs=['1', '2', '3']):
         self.sports = sports
         self.divs = divs
@@ -28,7 +43,7 @@ class Ncaa(Scraper):
 
     def convert_team_list_html(self, html: str, year: str,
                                location: Location) -> Iterator[Team]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         team_links = soup.table.find_all('a')
         params = {k: v for (k, v) in parse_qsl(urlparse(location.url).query)}
         sport = SPORT_MAP[params['sport_code']]
@@ -57,7 +72,7 @@ class Ncaa(Scraper):
 
     def convert_schedule_html(self, html: str,
                               team: Team) -> Iterator[ScheduleGame]:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html)
         year_list = soup.find(id='year_list')
         if year_list:
             selected = year_list.find('option', attrs={'selected': 'selected'})
@@ -134,11 +149,12 @@ class Ncaa(Scraper):
     TEAM_NAME_REGEX = re.compile(
         r'(#\d+ )?(?P<name>[a-zA-Z0-9\-_&\' .()]+) \(\d+-\d+\)')
 
-    def cross_link_schedules(self, schedules: list[TeamDetail]):
-        ids_by_alt_ids = {
-            schedule.team.alt_id: schedule.team.id
-            for schedule in schedules
-        }
+    def cross_link_schedules(self,
+                             schedules: list[TeamDetail],
+                             teams: list[Team] | None = None):
+        if teams is None:
+            teams = [schedule.team for schedule in schedules]
+        ids_by_alt_ids = {team.alt_id: team.id for team in teams}
         for schedule in schedules:
             if not schedule.games:
                 continue
@@ -149,7 +165,7 @@ class Ncaa(Scraper):
     def convert_game_details_html(self, html: str, location: Location,
                                   game_id: str, sport: str, source: str,
                                   home_team: Team, away_team: Team) -> Game:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, parse_only=self.GAME_DETAILS_SUBTREES)
         header = soup.find('div', class_='table-responsive')
         header_table_rows = list(header.table.table.find_all('tr'))
         date_row = header_table_rows[3]
@@ -183,73 +199,75 @@ class Ncaa(Scraper):
             home_score=home_score,
             away_score=away_score) if home_score and away_score else None
 
+        columns = self._stats_columns(sport, source)
+
+        def make_stats_line(**args):
+            return GameStatLine(**args) if 'player' in args else None
+
         return Game(id=game_id,
                     date=date,
                     external_link=location.url,
                     home_team=home_team,
                     away_team=away_team,
                     result=result,
-                    away_stats=parse_table(
-                        stats_tables[0],
-                        lambda col_name, cell: self._map_statistic(
-                            sport, source, col_name, cell),
-                        lambda **args: GameStatLine(**args)
-                        if 'player' in args else None),
-                    home_stats=parse_table(
-                        stats_tables[1],
-                        lambda col_name, cell: self._map_statistic(
-                            sport, source, col_name, cell),
-                        lambda **args: GameStatLine(**args)
-                        if 'player' in args else None))
+                    away_stats=parse_table(stats_tables[0], columns,
+                                           make_stats_line),
+                    home_stats=parse_table(stats_tables[1], columns,
+                                           make_stats_line))
 
     def get_limiter_session_args(self):
         return {'per_minute': 30}
 
+    def get_ready_selector(self, page_type):
+        return READY_SELECTORS.get(page_type)
+
     def convert_roster(self, html, team):
         return None
 
     PLAYER_HREF_REGEX = re.compile(r'/players/(?P<player_id>\d+)')
 
-    def _map_statistic(self, sport, source, key, tag) -> tuple[str, Any]:
-        text = tag.get_text(strip=True)
-
-        def get_num(t):
-            return int(t.replace('/', '') if t else 0)
-
-        try:
-            match key:
-                case '#':
-                    return {'number': get_num(text)}
-                case 'Name':
-                    a = tag.find('a')
-                    if not a:
-                        return None
-                    href = a['href']
-                    href_match = self.PLAYER_HREF_REGEX.match(href)
-                    if not href_match:
-                        raise Exception(f'no match {href}')
-                    return {
-                        'player':
-                        PlayerSummary(name=text,
-                                      id=sport + '-' + source + '-' +
-                                      href_match.group('player_id'),
-                                      external_link=self.base_url + href)
-                    }
-                case 'P':
-                    return {'position': text} if text else None
-                case 'Goals':
-                    return {'g': get_num(text)}
-                case 'Assists':
-                    return {'a': get_num(text)}
-                case 'GB':
-                    return {'gb': get_num(text)}
-                case _:
-                    return None
-        except Exception as ex:
-            raise Exception(f'error mapping statistic {tag}: {ex}')
+    def _stats_columns(self, sport, source):
+
+        def get_num(cell):
+            text = cell.get_text(strip=True)
+            return int(text.replace('/', '') if text else 0)
+
+        def num_column(field):
+
+            def set_num(cell, row):
+                row[field] = get_num(cell)
+
+            return set_num
+
+        def set_player(cell, row):
+            a = cell.find('a')
+            if not a:
+                return
+            href = a['href']
+            href_match = self.PLAYER_HREF_REGEX.match(href)
+            if not href_match:
+                raise Exception(f'no match {href}')
+            row['player'] = PlayerSummary(name=cell.get_text(strip=True),
+                                          id=sport + '-' + source + '-' +
+                                          href_match.group('player_id'),
+                                          external_link=self.base_url + href)
+
+        def set_position(cell, row):
+            text = cell.get_text(strip=True)
+            if text:
+                row['position'] = text
+
+        return {
+            '#': num_column('number'),
+            'Name': set_player,
+            'P': set_position,
+            'Goals': num_column('g'),
+            'Assists': num_column('a'),
+            'GB': num_column('gb'),
+        }
 
     def _to_iso_format(self, date):
-        return datetime.datetime.strptime(date, '%m/%d/%Y').date().isoformat()
+        return mdy_to_iso_date(date)
 
     def _foreign_opponent_id(self, sport, source, name):
         return f'{sport}-{source}-nd-' + self._generate_slug(name)
@@ -0,0 +1,180 @@
+"""
+Persistent HTML cache for pages fetched through the browser.
+
+requests_cache only sees traffic that goes through a requests session, so
+NCAA pages rendered by PlaywrightFetcher are cached here instead, keyed by
+URL with a time-to-live chosen per page type. Pages are stored
+zlib-compressed and stamped with their last access, so prune() can evict
+the least recently used ones to keep the file under a size cap.
+"""
+import logging
+import os
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# (url pattern, ttl) pairs; the first matching pattern wins and a ttl of None
+# means the page never expires.
+DEFAULT_TTL_POLICIES: tuple[tuple[re.Pattern, Optional[timedelta]], ...] = (
+    # Box scores are only linked once a game is final, so they never change
+    (re.compile(r'/contests/\d+/individual_stats'), None),
+    # Team schedules and team lists change as games are played
+    (re.compile(r'/teams/\d+'), timedelta(days=1)),
+    (re.compile(r'/team/inst_team_list'), timedelta(days=1)),
+)
+DEFAULT_TTL = timedelta(days=1)
+
+
+class PageCache:
+    """
+    SQLite-backed URL -> HTML cache with per-pattern expiry.
+
+    Safe to share between threads. Tracks hits and misses for reporting.
+    """
+
+    def __init__(self,
+                 path: str,
+                 ttl_policies=DEFAULT_TTL_POLICIES,
+                 default_ttl: Optional[timedelta] = DEFAULT_TTL):
+        pathlib.Path(os.path.dirname(path) or '.').mkdir(parents=True,
+                                                         exist_ok=True)
+        self.path = path
+        self.ttl_policies = ttl_policies
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                html TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                expires_at REAL
+            )''')
+        columns = {
+            row[1]
+            for row in self._conn.execute('PRAGMA table_info(pages)')
+        }
+        if 'accessed_at' not in columns:
+            self._conn.execute('ALTER TABLE pages ADD COLUMN accessed_at REAL')
+        self._conn.commit()
+
+    def ttl_for(self, url: str) -> Optional[timedelta]:
+        for pattern, ttl in self.ttl_policies:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, url: str) -> Optional[str]:
+        """Return cached HTML for url, or None if missing or expired"""
+        with self._lock:
+            now = time.time()
+            row = self._conn.execute(
+                'SELECT html, expires_at FROM pages WHERE url = ?',
+                (url, )).fetchone()
+            if row and (row[1] is None or row[1] > now):
+                self.hits += 1
+                self._conn.execute(
+                    'UPDATE pages SET accessed_at = ? WHERE url = ?',
+                    (now, url))
+                self._conn.commit()
+                return self._decode(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, url: str, html: str):
+        now = time.time()
+        ttl = self.ttl_for(url)
+        expires_at = now + ttl.total_seconds() if ttl is not None else None
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO pages (url, html, fetched_at, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (url, zlib.compress(html.encode()), now, expires_at, now))
+            self._conn.commit()
+
+    @staticmethod
+    def _decode(stored) -> str:
+        # Pages stored before compression was added are plain text
+        if isinstance(stored, bytes):
+            return zlib.decompress(stored).decode()
+        return stored
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def storage_stats(self) -> dict[str, int]:
+        with self._lock:
+            entries, expired, stored_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(expires_at IS NOT NULL AND expires_at <= ?), 0), '
+                'COALESCE(SUM(LENGTH(html)), 0) FROM pages',
+                (time.time(), )).fetchone()
+        return {
+            'entries': entries,
+            'expired': expired,
+            'stored_bytes': stored_bytes,
+            'file_bytes': os.path.getsize(self.path),
+        }
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Delete expired pages, then least recently used ones until the stored
+        pages fit in max_bytes. Returns the number deleted.
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM pages WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                (time.time(), )).rowcount
+            self._conn.commit()
+        if max_bytes is not None:
+            rows = self.usage()
+            total = sum(size for _, _, size in rows)
+            evict = []
+            for _, url, size in rows:
+                if total <= max_bytes:
+                    break
+                evict.append(url)
+                total -= size
+            self.evict(evict)
+            deleted += len(evict)
+        with self._lock:
+            self._conn.execute('VACUUM')
+        logger.info(f'pruned {deleted} pages from {self.path}')
+        return deleted
+
+    def usage(self) -> list[tuple[float, str, int]]:
+        """(last access, url, stored bytes) of each page, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COALESCE(accessed_at, fetched_at), url, LENGTH(html) '
+                'FROM pages ORDER BY 1 ASC').fetchall()
+
+    def evict(self, urls: list[str]):
+        with self._lock:
+            self._conn.executemany('DELETE FROM pages WHERE url = ?',
+                                   [(url, ) for url in urls])
+            self._conn.commit()
+
+    def pages(self):
+        """Yield (url, html) for every stored page"""
+        with self._lock:
+            rows = self._conn.execute('SELECT url, html FROM pages').fetchall()
+        for url, stored in rows:
+            yield url, self._decode(stored)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
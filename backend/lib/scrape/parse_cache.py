@@ -0,0 +1,167 @@
+"""
+Memoized page conversions.
+
+Converting a page is keyed by the converter, its scraper's PARSER_VERSION,
+the HTML parser backend, a SHA-256 of the HTML and a digest of the other
+converter arguments, including the date for converters that depend on it.
+When a page comes back with the same HTML as a previous run, its converted
+dataclasses are read from here instead of parsing it again. Results are stored as zlib-compressed JSON, together with the state
+of the dataclass arguments after conversion, since converters may fill them
+in (the NCAA schedule converter sets the team's alt_id).
+
+Each page keeps only its latest conversion, so the cache grows with the
+number of pages scraped rather than with every version of them.
+
+The cache also remembers the last hash seen for each page (a team's schedule,
+a game's box score), so a run can report which pages did not change since
+the previous one.
+"""
+import dataclasses
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sqlite3
+import threading
+import zlib
+from typing import Any
+
+from ..shared.types import BaseType
+
+logger = logging.getLogger(__name__)
+
+
+def html_hash(html: str) -> str:
+    return hashlib.sha256(html.encode()).hexdigest()
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, BaseType):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def args_digest(*args) -> str:
+    """Digest of the converter arguments other than the HTML"""
+    return hashlib.sha256(
+        json.dumps(_to_json(list(args)),
+                   sort_keys=True).encode()).hexdigest()[:16]
+
+
+class ParseCache:
+    """
+    SQLite-backed cache of converted pages. Safe to share between threads.
+    """
+
+    def __init__(self, path: str):
+        pathlib.Path(os.path.dirname(path) or '.').mkdir(parents=True,
+                                                         exist_ok=True)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        columns = [
+            row[1] for row in self._conn.execute('PRAGMA table_info(results)')
+        ]
+        if columns and 'page' not in columns:
+            # Written before conversions were kept per page
+            self._conn.execute('DROP TABLE results')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                page TEXT,
+                result BLOB NOT NULL
+            )''')
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS results_page ON results (page)')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS latest (
+                page TEXT PRIMARY KEY,
+                sha TEXT NOT NULL
+            )''')
+        self._conn.commit()
+
+    @staticmethod
+    def key(converter: str, version: int, backend: str, sha: str,
+            digest: str) -> str:
+        return f'{converter}:{version}:{backend}:{sha}:{digest}'
+
+    def get(self, key: str, cls: type[BaseType], args=()) -> tuple[bool, Any]:
+        """
+        Return (found, result), decoding the result into cls instances and
+        restoring the converted state of the dataclass args.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM results WHERE key = ?',
+                (key, )).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        data = json.loads(zlib.decompress(row[0]))
+        for arg, state in zip(args, data['args']):
+            if isinstance(arg, BaseType):
+                restored = type(arg).from_dict(state)
+                for field in dataclasses.fields(arg):
+                    setattr(arg, field.name, getattr(restored, field.name))
+        result = data['result']
+        if result is None:
+            return True, None
+        if isinstance(result, list):
+            return True, [cls.from_dict(d) for d in result]
+        return True, cls.from_dict(result)
+
+    def put(self, key: str, result: Any, args=(), page: str | None = None):
+        """Store a conversion, replacing the page's earlier conversions"""
+        blob = zlib.compress(
+            json.dumps({
+                'result': _to_json(result),
+                'args': _to_json(list(args)),
+            }).encode())
+        with self._lock:
+            if page is not None:
+                self._conn.execute('DELETE FROM results WHERE page = ?',
+                                   (page, ))
+            self._conn.execute(
+                'INSERT OR REPLACE INTO results (key, page, result) '
+                'VALUES (?, ?, ?)', (key, page, blob))
+            self._conn.commit()
+
+    def mark(self, page: str, sha: str) -> bool:
+        """Record the latest hash of a page, returning whether it is unchanged"""
+        with self._lock:
+            row = self._conn.execute('SELECT sha FROM latest WHERE page = ?',
+                                     (page, )).fetchone()
+            if row and row[0] == sha:
+                return True
+            self._conn.execute(
+                'INSERT OR REPLACE INTO latest (page, sha) VALUES (?, ?)',
+                (page, sha))
+            self._conn.commit()
+            return False
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
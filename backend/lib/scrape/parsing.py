@@ -0,0 +1,56 @@
+"""
+HTML parser backend selection for the scrapers.
+
+All converters build their trees through make_soup. The C-backed lxml tree
+builder is used when it is installed; html.parser is the pure-Python
+fallback. Set SCRAPE_HTML_PARSER to force a backend.
+"""
+import importlib.util
+import os
+import re
+from typing import Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+FAST_BACKEND = 'lxml'
+FALLBACK_BACKEND = 'html.parser'
+
+
+def available_backends() -> list[str]:
+    backends = [FALLBACK_BACKEND]
+    if importlib.util.find_spec(FAST_BACKEND):
+        backends.append(FAST_BACKEND)
+    return backends
+
+
+def default_backend() -> str:
+    override = os.environ.get('SCRAPE_HTML_PARSER')
+    if override:
+        if override not in available_backends():
+            raise ValueError(f'HTML parser backend {override} is not available')
+        return override
+    return available_backends()[-1]
+
+
+BACKEND = default_backend()
+
+
+def make_soup(html: str,
+              backend: Optional[str] = None,
+              parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parse html with the configured backend.
+
+    With parse_only, only the matching elements and their descendants are
+    built into the tree; everything else is skipped while parsing.
+    """
+    return BeautifulSoup(html, backend or BACKEND, parse_only=parse_only)
+
+
+def subtrees(name: str, *classes: str) -> SoupStrainer:
+    """Strainer keeping <name> elements that carry any of the given classes"""
+    # The class attribute is still a raw string while parsing, so match
+    # whole words in it rather than relying on multi-valued class handling
+    pattern = re.compile(r'(^|\s)(' + '|'.join(map(re.escape, classes)) +
+                         r')(\s|$)')
+    return SoupStrainer(name, attrs={'class': pattern})
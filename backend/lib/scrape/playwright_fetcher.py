@@ -3,15 +3,23 @@ Playwright-based HTML fetcher for stats.ncaa.org.
 
 Uses Firefox to bypass Akamai bot detection that blocks Chromium.
 Uses async API to avoid conflicts with pytest-asyncio in CI.
+Keeps a pool of pages in one browser so several navigations can be in
+flight at once.
 """
 
 import logging
 import asyncio
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser, Page, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from collections.abc import AsyncIterator
 from typing import Optional
 import random
+import threading
 import time
 
+from .adaptive_limiter import BLOCK_INDICATORS, AdaptiveRateLimiter, is_backpressure, is_blocked_html
+from .metrics import FetchResult
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,63 +31,108 @@ class PlaywrightFetcher:
     blocks Chromium but allows Firefox through.
     """
 
-    BLOCK_INDICATORS = (
-        'Access Denied',
-        'access denied',
-        'queue full',
-        'under heavy load',
-        'too many people are accessing this website',
+    BLOCK_INDICATORS = BLOCK_INDICATORS
+
+    # Converters only read the HTML document, so subresources are aborted
+    BLOCKED_RESOURCE_TYPES = ('image', 'stylesheet', 'font', 'media')
+    BLOCKED_URL_PATTERNS = (
+        'google-analytics.com',
+        'googletagmanager.com',
+        'doubleclick.net',
+        'facebook.net',
     )
     
-    def __init__(self, headless: bool = True, max_attempts: int = 4):
+    def __init__(self,
+                 headless: bool = True,
+                 max_attempts: int = 4,
+                 pool_size: int = 1,
+                 max_in_flight: Optional[int] = None,
+                 blocked_resource_types: tuple[str, ...] = BLOCKED_RESOURCE_TYPES,
+                 limiter: Optional[AdaptiveRateLimiter] = None):
+        """
+        Args:
+            headless: Run Firefox without a window
+            max_attempts: Attempts per URL before giving up
+            pool_size: Number of pages kept open in the browser
+            max_in_flight: Maximum concurrent navigations (defaults to pool_size)
+            blocked_resource_types: Playwright resource types to abort (empty to load everything)
+            limiter: Paces navigations and learns from back-pressure; replaces
+                the fixed backoff between attempts
+        """
         self.headless = headless
+        self.blocked_resource_types = blocked_resource_types
+        self.limiter = limiter
         self.max_attempts = max_attempts
+        self.pool_size = max(1, pool_size)
+        self.max_in_flight = max(1, max_in_flight or self.pool_size)
         self.playwright = None
         self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
-    
+        self._open_pages: list[Page] = []
+        self._pages: Optional[asyncio.Queue] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+
+    @property
+    def page(self) -> Optional[Page]:
+        """First open page (kept for callers that predate the page pool)"""
+        return self._open_pages[0] if self._open_pages else None
+
     def __enter__(self):
         """Context manager entry - launch browser"""
-        logger.info("Launching Firefox browser (headless=%s)", self.headless)
-        
-        # Get or create event loop
-        try:
-            # Check if there's a running loop
-            asyncio.get_running_loop()
-            # If we get here, we're in an async context - create a new loop in a thread
-            raise RuntimeError("Cannot use PlaywrightFetcher in async context")
-        except RuntimeError as e:
-            if "no running event loop" not in str(e).lower() and "cannot" not in str(e).lower():
-                # There is a running loop, can't proceed
-                raise
-            # No running loop - safe to create one
-        
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
+        logger.info("Launching Firefox browser (headless=%s, pages=%s)",
+                    self.headless, self.pool_size)
+
+        self._start_loop()
+
         async def start():
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.firefox.launch(headless=self.headless)
-            self.page = await self._new_page()
-        
-        loop.run_until_complete(start())
-        self._loop = loop
-        
+            await self._fill_pool()
+
+        self._run(start())
+
         return self
-    
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit - close browser"""
         async def stop():
-            if self.page:
-                await self.page.close()
+            for page in list(self._open_pages):
+                await self._close_page(page)
             if self.browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
-        
-        if hasattr(self, '_loop'):
-            self._loop.run_until_complete(stop())
+
+        if self._loop:
+            self._run(stop())
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._loop_thread.join()
             self._loop.close()
+            self._loop = None
+
+    def _start_loop(self):
+        """
+        Run a private event loop on a background thread.
+
+        Callers on any thread submit coroutines to it, so navigations from
+        several scrape workers share one browser and run concurrently.
+        """
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever,
+                                             name='playwright-fetcher',
+                                             daemon=True)
+        self._loop_thread.start()
+
+    def _run(self, coro):
+        """Run a coroutine on the fetcher's loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _fill_pool(self):
+        self._pages = asyncio.Queue()
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        for _ in range(self.pool_size):
+            self._pages.put_nowait(await self._new_page())
 
     async def _new_page(self) -> Page:
         if not self.browser:
@@ -92,114 +145,208 @@ class PlaywrightFetcher:
             'Accept-Language': 'en-US,en;q=0.9',
             'Upgrade-Insecure-Requests': '1',
         })
+        if self.blocked_resource_types:
+            await page.route('**/*', self._route)
+        self._open_pages.append(page)
         return page
 
+    async def _route(self, route: Route):
+        request = route.request
+        if request.resource_type in self.blocked_resource_types or any(
+                pattern in request.url for pattern in self.BLOCKED_URL_PATTERNS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _close_page(self, page: Page):
+        if page in self._open_pages:
+            self._open_pages.remove(page)
+        await page.close()
+
     def _is_blocked_or_busy_html(self, html: str) -> bool:
-        lowered = html.lower()
-        return any(indicator.lower() in lowered for indicator in self.BLOCK_INDICATORS)
+        return is_blocked_html(html)
 
-    def fetch(self, url: str, wait_until: str = 'networkidle', timeout: int = 30000) -> str:
+    def fetch(self,
+              url: str,
+              wait_until: str = 'networkidle',
+              timeout: int = 30000,
+              ready_selector: Optional[str] = None) -> str:
+        """Fetch HTML from URL using Playwright (see fetch_result)"""
+        return self.fetch_result(url, wait_until, timeout, ready_selector).html
+
+    def fetch_result(self,
+                     url: str,
+                     wait_until: str = 'networkidle',
+                     timeout: int = 30000,
+                     ready_selector: Optional[str] = None) -> FetchResult:
         """
-        Fetch HTML from URL using Playwright.
-        
+        Fetch a URL using Playwright, reporting status and attempts.
+
+        Safe to call from several threads at once; each call borrows a page
+        from the pool.
+
         Args:
             url: URL to fetch
             wait_until: Load state to wait for ('load', 'domcontentloaded', 'networkidle')
             timeout: Timeout in milliseconds
-        
+            ready_selector: If set, return as soon as the DOM is parsed and this
+                selector matches instead of waiting for wait_until
+
         Returns:
-            Rendered HTML content
-        
+            Rendered HTML content with the final status and attempt counts
+
         Raises:
             Exception if page fails to load or returns Access Denied
         """
-        if not self.page:
+        if not self._pages:
             raise RuntimeError("Fetcher not initialized. Use 'with' context manager.")
-        
+
         logger.debug(f"Fetching: {url}")
         start = time.time()
-        
-        async def fetch_async():
-            last_error = None
-            current_page = self.page
-
-            for attempt in range(1, self.max_attempts + 1):
-                try:
-                    response = await current_page.goto(url, wait_until=wait_until, timeout=timeout)
-                    status = response.status if response else None
-
-                    if status != 200:
-                        logger.warning(f"Non-200 status: {status} for {url} (attempt {attempt}/{self.max_attempts})")
-
-                    html = await current_page.content()
-
-                    if status == 200 and not self._is_blocked_or_busy_html(html):
-                        if current_page is not self.page:
-                            if self.page:
-                                await self.page.close()
-                            self.page = current_page
-                        return html, status
-
-                    if self._is_blocked_or_busy_html(html):
-                        reason = 'blocked or queue-full html'
-                    else:
-                        reason = f'unexpected status {status}'
-                    raise Exception(f"Transient NCAA fetch failure for {url}: {reason}")
-                except Exception as e:
-                    last_error = e
-                    logger.warning(
-                        "Fetch attempt %s/%s failed for %s: %s",
-                        attempt,
-                        self.max_attempts,
-                        url,
-                        e,
-                    )
-                    if attempt == self.max_attempts:
-                        break
-
-                    if current_page:
-                        await current_page.close()
-                    current_page = await self._new_page()
-                    await current_page.wait_for_timeout(int((1.5 * attempt + random.uniform(0, 0.75)) * 1000))
-
-            raise last_error or Exception(f"Failed to fetch {url}")
-        
+
         try:
-            html, status = self._loop.run_until_complete(fetch_async())
-            
+            result = self._run(
+                self._fetch_async(url, wait_until, timeout, ready_selector=ready_selector))
+
             elapsed = time.time() - start
-            logger.debug(f"Fetched {url} in {elapsed:.2f}s (status={status})")
-            
-            return html
-        
+            logger.debug(f"Fetched {url} in {elapsed:.2f}s (status={result.status})")
+
+            return result
+
         except Exception as e:
             logger.error(f"Failed to fetch {url}: {e}")
             raise
-    
-    def fetch_multiple(self, urls: list[str], delay: float = 1.0) -> list[str]:
+
+    async def _fetch_async(self,
+                           url: str,
+                           wait_until: str,
+                           timeout: int,
+                           delay: float = 0,
+                           ready_selector: Optional[str] = None) -> FetchResult:
+        if ready_selector:
+            wait_until = 'domcontentloaded'
+        async with self._in_flight:
+            current_page = await self._pages.get()
+            last_error = None
+            blocked_attempts = 0
+            try:
+                for attempt in range(1, self.max_attempts + 1):
+                    try:
+                        response = await self._goto(current_page, url, wait_until, timeout)
+                        status = response.status if response else None
+                        if ready_selector and status == 200:
+                            await self._wait_for_ready(current_page, ready_selector, timeout)
+
+                        if status != 200:
+                            logger.warning(f"Non-200 status: {status} for {url} (attempt {attempt}/{self.max_attempts})")
+
+                        html = await current_page.content()
+                        if self.limiter:
+                            self.limiter.record(status, html)
+                        blocked_attempts += is_backpressure(status, html)
+
+                        if status == 200 and not self._is_blocked_or_busy_html(html):
+                            return FetchResult(html=html,
+                                               status=status,
+                                               attempts=attempt,
+                                               blocked_attempts=blocked_attempts)
+
+                        if self._is_blocked_or_busy_html(html):
+                            reason = 'blocked or queue-full html'
+                        else:
+                            reason = f'unexpected status {status}'
+                        raise Exception(f"Transient NCAA fetch failure for {url}: {reason}")
+                    except Exception as e:
+                        last_error = e
+                        logger.warning(
+                            "Fetch attempt %s/%s failed for %s: %s",
+                            attempt,
+                            self.max_attempts,
+                            url,
+                            e,
+                        )
+                        if attempt == self.max_attempts:
+                            break
+
+                        await self._close_page(current_page)
+                        current_page = await self._new_page()
+                        if not self.limiter:
+                            await current_page.wait_for_timeout(int((1.5 * attempt + random.uniform(0, 0.75)) * 1000))
+
+                raise last_error or Exception(f"Failed to fetch {url}")
+            finally:
+                # Return the page (possibly a fresh replacement) to the pool,
+                # after the politeness delay if one is set
+                if delay > 0:
+                    asyncio.get_running_loop().call_later(
+                        delay, self._pages.put_nowait, current_page)
+                else:
+                    self._pages.put_nowait(current_page)
+
+    async def _goto(self, page: Page, url: str, wait_until: str, timeout: int):
+        if self.limiter:
+            await asyncio.sleep(self.limiter.reserve())
+        try:
+            return await page.goto(url, wait_until=wait_until, timeout=timeout)
+        except PlaywrightTimeoutError:
+            # An overloaded host shows up as navigations that never finish
+            if self.limiter:
+                self.limiter.record_backpressure()
+            raise
+
+    async def _wait_for_ready(self, page: Page, selector: str, timeout: int):
+        try:
+            await page.wait_for_selector(selector, timeout=timeout)
+        except PlaywrightTimeoutError:
+            # Block pages and pages without the section (e.g. a team with no
+            # schedule) never match; the content checks below decide
+            logger.debug(f"Ready selector {selector!r} not found on {page.url}")
+
+    async def fetch_many(
+            self,
+            urls: list[str],
+            wait_until: str = 'networkidle',
+            timeout: int = 30000,
+            delay: float = 0,
+            ready_selector: Optional[str] = None) -> AsyncIterator[tuple[str, Optional[str]]]:
         """
-        Fetch multiple URLs sequentially with delay between requests.
-        
+        Fetch URLs concurrently across the page pool.
+
+        Must run on the fetcher's event loop. Yields (url, html) pairs as
+        each fetch completes; html is None for URLs that failed.
+
         Args:
-            urls: List of URLs to fetch
-            delay: Seconds to wait between requests (default 1.0)
-        
-        Returns:
-            List of HTML content (same order as input URLs)
+            urls: URLs to fetch
+            wait_until: Load state to wait for
+            timeout: Timeout in milliseconds per navigation
+            delay: Seconds a page rests before its next navigation
+            ready_selector: Selector that marks the page as ready (see fetch)
         """
-        results = []
-        
-        for i, url in enumerate(urls):
+        async def fetch_one(url):
             try:
-                html = self.fetch(url)
-                results.append(html)
-                
-                # Add delay between requests (except after last one)
-                if i < len(urls) - 1 and delay > 0:
-                    time.sleep(delay)
-            
+                result = await self._fetch_async(url, wait_until, timeout, delay,
+                                                 ready_selector)
+                return url, result.html
             except Exception as e:
                 logger.warning(f"Skipping {url} due to error: {e}")
-                results.append(None)
-        
-        return results
+                return url, None
+
+        for next_result in asyncio.as_completed([fetch_one(url) for url in urls]):
+            yield await next_result
+
+    def fetch_multiple(self, urls: list[str], delay: float = 1.0) -> list[str]:
+        """
+        Fetch multiple URLs concurrently across the page pool.
+
+        Args:
+            urls: List of URLs to fetch
+            delay: Seconds each page waits between requests (default 1.0)
+
+        Returns:
+            List of HTML content (same order as input URLs, None on error)
+        """
+        async def collect():
+            return {url: html async for url, html in self.fetch_many(urls, delay=delay)}
+
+        results = self._run(collect())
+        return [results[url] for url in urls]
@@ -1,23 +1,39 @@
 import datetime
 
-import dateutil
-import dateutil.parser
 from lib.scrape import mcla
-from . import ncaa, mcla
+from . import ncaa, mcla, parsing
 from ..shared import shared
-from ..shared.types import Game, ScrapeArgs, Scraper, Team, TeamDetail, Location
+from ..shared.types import Game, Roster, ScheduleGame, ScrapeArgs, Scraper, Team, TeamDetail, Location
 from collections.abc import Iterator
+import pyarrow.parquet as pq
+import requests
 from requests_cache import CacheMixin, CachedSession
 from requests_ratelimiter import LimiterSession
-from datetime import UTC, timedelta, tzinfo
-from typing import Optional
+from datetime import UTC, tzinfo
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional, TypeVar
+import collections
+import json
 import os
 import pathlib
 import logging
+import threading
+import time
 import traceback
-
-from .interstitial_bypass import InterstitialBypassSession
+from urllib.parse import urlparse
+
+from .archive import ArchiveRecorder, ArchiveReplayer, archive_path
+from .dates import iso_date
+from .adaptive_limiter import AdaptiveLimiterSession, AdaptiveRateLimiter, FixedRateLimiter, is_backpressure, is_blocked_html
+from .http_cache import DEFAULT_EXPIRE_AFTER, LEGACY_CACHE_FILE, URLS_EXPIRE_AFTER, LruSQLiteCache, import_legacy_cache
+from .impersonate import CurlCffiAdapter
+from .interstitial_bypass import INTERSTITIAL_MARKER, InterstitialBypassSession
+from .journal import ScrapeJournal
+from .metrics import FetchResult, ScrapeMetrics
+from .page_cache import PageCache
+from .parse_cache import ParseCache, args_digest, html_hash
 from .playwright_fetcher import PlaywrightFetcher
+from .shard import game_owner, parse_shard, shard_dir, shard_of
 
 USER_AGENT = 'sportnumerics-scraper/1.0 (https://sportnumerics.com)'
 
@@ -34,32 +50,165 @@ def scrape_team_list(args: ScrapeArgs):
 
 
 def scrape_schedules(args: ScrapeArgs):
+    shard = parse_shard(args.shard) if args.shard else None
     for year in shared.years(args.year):
         runner = ScrapeRunner(source=args.source,
                               year=year,
                               out_dir=args.out_dir,
                               team=args.team,
                               div=args.div,
-                              limit=args.limit)
+                              limit=args.limit,
+                              concurrency=args.concurrency,
+                              incremental=args.incremental,
+                              stream=args.stream,
+                              adaptive_rate=args.adaptive_rate,
+                              record_archive=args.record_archive,
+                              replay_archive=args.replay_archive,
+                              replay_latency=args.replay_latency,
+                              ncaa_fetcher=args.ncaa_fetcher,
+                              cache_max_mb=args.cache_max_mb,
+                              shard=shard,
+                              parse_cache=args.parse_cache)
         try:
-            if hasattr(args, 'team_list_file') and args.team_list_file:
-                team_list_json_file = args.team_list_file
-            else:
+            team_list_file = getattr(args, 'team_list_file', None)
+            # Every shard must partition the same team list, so it is scraped
+            # once beforehand rather than by whichever shard starts first
+            if shard and not team_list_file and not os.path.exists(
+                    runner.teams_path()):
+                raise Exception(
+                    f'Sharded scrapes read the team list from {runner.teams_path()}, '
+                    f'scrape the {args.source} ({year}) teams first with `scrape teams`'
+                )
+            runner.open_journal(resume=args.resume)
+            if not team_list_file and not shard:
                 runner.scrape_and_write_team_lists()
-                team_list_json_file = None
 
-            runner.scrape_and_write_schedules(team_list_json_file)
+            runner.scrape_and_write_schedules(team_list_file)
+            runner.journal.discard()
+            runner.journal = None
+        finally:
+            runner.cleanup()
+
+
+def merge_shards(args):
+    for year in shared.years(args.year):
+        merge_shard_outputs(args.source, year, args.out_dir, args.shards)
+
+
+def merge_shard_outputs(source: str, year: str, out_dir: str, count: int):
+    """
+    Combine the outputs of shards 0..count-1 into the canonical schedules
+    and games datasets, cross linking the schedules of all shards.
+
+    A game between two scraped teams is left to one of their shards, which
+    may not fetch it (the schedule fetch failed, or lacks the game or its
+    details link). Games in the merged schedules that no shard fetched are
+    fetched here, as an unsharded scrape would have.
+    """
+    log = logging.getLogger(__name__)
+    schedules: list[TeamDetail] = []
+    games: dict[str, Game] = {}
+    unchanged = {'teams': [], 'games': []}
+    for index in range(count):
+        directory = shard_dir(out_dir, year, source, index, count)
+        # Written last by a shard, so its absence means the shard is not done
+        unchanged_path = os.path.join(directory, f'{source}-unchanged.json')
+        if not os.path.exists(unchanged_path):
+            raise Exception(
+                f'Shard {index}/{count} of {source} ({year}) has not finished, missing {unchanged_path}'
+            )
+        with open(unchanged_path) as f:
+            shard_unchanged = json.load(f)
+        for kind in unchanged:
+            unchanged[kind].extend(shard_unchanged[kind])
+        schedules_path = os.path.join(directory, 'schedules.parquet')
+        if os.path.exists(schedules_path):
+            schedules.extend(shared.load_parquet(TeamDetail, schedules_path))
+        games_path = os.path.join(directory, 'games.parquet')
+        if os.path.exists(games_path):
+            games.update(
+                (game.id, game)
+                for game in shared.load_parquet(Game, games_path))
+    log.info(
+        f'merging {count} shards of {source} ({year}): {len(schedules)} schedules, {len(games)} games'
+    )
+
+    schedules.sort(key=lambda s: s.team.id)
+    if any(game.details and game.id not in games for schedule in schedules
+           for game in schedule.games):
+        runner = ScrapeRunner(source=source, year=year, out_dir=out_dir)
+        try:
+            log.info('fetching games no shard fetched')
+            games.update((game.id, game) for game in
+                         runner.scrape_pending_games(schedules, set(games)))
         finally:
             runner.cleanup()
+    get_scraper(source).cross_link_schedules(schedules)
+
+    schedule_dir = os.path.join(out_dir, year, 'schedules')
+    pathlib.Path(schedule_dir).mkdir(parents=True, exist_ok=True)
+    for schedule in schedules:
+        with open(os.path.join(schedule_dir, schedule.team.id + '.json'),
+                  'w') as f:
+            shared.dump(schedule, f)
+    shared.dump_parquet(schedules,
+                        shared.parquet_path(out_dir, year, 'schedules',
+                                            f'{source}.parquet'),
+                        sort_order=[('team.id', 'ascending')])
+
+    games_dir = os.path.join(out_dir, year, 'games')
+    pathlib.Path(games_dir).mkdir(parents=True, exist_ok=True)
+    for game in games.values():
+        with open(os.path.join(games_dir, game.id + '.json'), 'w') as f:
+            shared.dump(game, f)
+    shared.dump_parquet(sorted(games.values(), key=lambda g: g.id),
+                        shared.parquet_path(out_dir, year, 'games',
+                                            f'{source}.parquet'),
+                        sort_order=[('id', 'ascending')])
+
+    with open(os.path.join(out_dir, year, f'{source}-unchanged.json'),
+              'w') as f:
+        json.dump({kind: sorted(ids) for kind, ids in unchanged.items()},
+                  f,
+                  indent=2)
+
+
+def get_scraper(source: str) -> Scraper:
+    if source == 'ncaa':
+        return ncaa.Ncaa()
+    elif source in ('mcla', 'mcla2'):
+        return mcla.Mcla()
+    raise Exception(f'Unimplemented source {source}')
+
+
+def is_final(game: Game) -> bool:
+    """A game is final once it has a result and its date has passed"""
+    return game.result is not None and iso_date(
+        game.date) < datetime.date.today()
 
 
 class LimitedCachedSession(CacheMixin, LimiterSession):
     pass
 
 
+class AdaptiveCachedSession(CacheMixin, AdaptiveLimiterSession):
+    pass
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
 class ScrapeRunner():
     scraper: Scraper
     playwright_fetcher: Optional[PlaywrightFetcher] = None
+    page_cache: Optional[PageCache] = None
+    journal: Optional[ScrapeJournal] = None
+    limiter: Optional[AdaptiveRateLimiter] = None
+    browser_limiter: Optional[AdaptiveRateLimiter] = None
+    recorder: Optional[ArchiveRecorder] = None
+    replayer: Optional[ArchiveReplayer] = None
+    parse_cache: Optional[ParseCache] = None
 
     def __init__(self,
                  source: str,
@@ -67,15 +216,19 @@ class ScrapeRunner():
                  out_dir: str,
                  team: str = None,
                  div: str = None,
-                 limit: int = None):
-        if source == 'ncaa':
-            self.scraper = ncaa.Ncaa()
-        elif source == 'mcla':
-            self.scraper = mcla.Mcla()
-        elif source == 'mcla2':
-            self.scraper = mcla.Mcla()
-        else:
-            raise Exception(f'Unimplemented source {source}')
+                 limit: int = None,
+                 concurrency: int = 1,
+                 incremental: bool = False,
+                 stream: bool = False,
+                 adaptive_rate: bool = False,
+                 record_archive: str | None = None,
+                 replay_archive: str | None = None,
+                 replay_latency: float = 0,
+                 ncaa_fetcher: str = 'browser',
+                 cache_max_mb: float | None = None,
+                 shard: tuple[int, int] | None = None,
+                 parse_cache: bool = True):
+        self.scraper = get_scraper(source)
         self.source = source
 
         self.year = year
@@ -83,24 +236,123 @@ class ScrapeRunner():
         self.out_dir = out_dir
         self.log = logging.getLogger(type(self.scraper).__name__)
 
-        # Create cached + rate-limited session
-        cache_name = os.path.join(self.out_dir, 'cache')
+        # Create cached + rate-limited session. Each source has its own
+        # cache so scrapes of different sources can run in separate processes
+        http_cache_path = os.path.join(self.out_dir, 'cache',
+                                       f'{source}.sqlite')
+        legacy_cache_path = os.path.join(self.out_dir, LEGACY_CACHE_FILE)
+        import_legacy = (not os.path.exists(http_cache_path)
+                         and os.path.exists(legacy_cache_path))
+        self.http_cache = LruSQLiteCache(http_cache_path)
+        if import_legacy:
+            # Every page of a source is on its team list's host
+            team_list = next(self.scraper.get_team_list_urls(year))
+            import_legacy_cache(legacy_cache_path, self.http_cache,
+                                urlparse(team_list.url).netloc)
+        cache_args = dict(backend=self.http_cache,
+                          expire_after=DEFAULT_EXPIRE_AFTER,
+                          urls_expire_after=URLS_EXPIRE_AFTER)
         session_args = self.scraper.get_limiter_session_args()
-        Session = LimitedCachedSession if session_args else CachedSession
-        session = Session(cache_name=cache_name,
-                         expire_after=timedelta(days=1),
-                         **session_args)
+        if adaptive_rate:
+            # The fixed rate is only the starting point; the limiter then
+            # follows the host's back-pressure
+            self.limiter = AdaptiveRateLimiter(
+                per_minute=session_args.get('per_minute', 30),
+                state_path=os.path.join(self.out_dir, 'cache',
+                                        f'{source}-rate.json'))
+            self.log.info(
+                f'adaptive rate limit starting at {self.limiter.per_minute:.1f} requests/minute'
+            )
+            session = AdaptiveCachedSession(limiter=self.limiter,
+                                            **cache_args)
+        else:
+            Session = LimitedCachedSession if session_args else CachedSession
+            session = Session(**cache_args, **session_args)
+        # Browser navigations bypass the session, so they are paced by the
+        # adaptive limiter or at the session's fixed rate
+        if self.limiter:
+            self.browser_limiter = self.limiter
+        elif session_args:
+            self.browser_limiter = FixedRateLimiter(
+                per_minute=session_args['per_minute'])
         
         # Wrap with interstitial bypass for NCAA
         if source == 'ncaa':
-            session = InterstitialBypassSession(session)
+            if ncaa_fetcher == 'http':
+                # Browser-fingerprinted HTTP underneath the cache and limiter
+                session.mount('https://', CurlCffiAdapter())
+            # Clearance cookies are shared with later runs and other workers
+            session = InterstitialBypassSession(
+                session,
+                cookie_file=os.path.join(self.out_dir, 'cache',
+                                         f'{source}-cookies.json'))
+            # Browser-rendered pages bypass requests_cache, so cache them here
+            self.page_cache = PageCache(
+                os.path.join(self.out_dir, 'cache', 'pages.sqlite'))
         
         self.cache = session
         self.team = team
         self.div = div
         self.limit = int(limit) if limit else None
+        # Worker threads share self.cache, so the session's rate limiter acts
+        # as a single token bucket per host across all workers.
+        self.concurrency = max(1, int(concurrency or 1))
+        self._playwright_lock = threading.Lock()
+        self.incremental = incremental
+        self.ncaa_fetcher = ncaa_fetcher
+        self.cache_max_mb = cache_max_mb
+        self.metrics = ScrapeMetrics(source, year)
+        if parse_cache:
+            self.parse_cache = ParseCache(
+                os.path.join(self.out_dir, 'cache', 'parse',
+                             f'{source}.sqlite'))
+        # (page type, id) -> whether the page's html matched the last run's
+        self.page_changes: dict[tuple[str, str], bool] = {}
+        self._page_changes_lock = threading.Lock()
+
+        if record_archive and replay_archive:
+            raise Exception('Cannot record and replay an archive at once')
+        if record_archive:
+            self.recorder = ArchiveRecorder(
+                archive_path(record_archive, year, source))
+        if replay_archive:
+            self.replayer = ArchiveReplayer(archive_path(
+                replay_archive, year, source),
+                                            latency=replay_latency)
+        self.stream = stream
+        self.shard = shard
+        # Run reports and the journal are per shard, so shards sharing an
+        # output directory do not overwrite each other's
+        if shard:
+            self.report_dir = shard_dir(out_dir, year, source, *shard)
+        else:
+            self.report_dir = os.path.join(out_dir, year)
+
+    def teams_path(self) -> str:
+        return shared.parquet_path(self.out_dir, self.year, 'teams',
+                                   f'{self.source}.parquet')
+
+    def open_journal(self, resume: bool = False):
+        """
+        Start journalling completed work for this source and year.
+
+        With resume, work recorded by an interrupted run is reused instead of
+        being fetched again.
+        """
+        self.journal = ScrapeJournal(os.path.join(self.report_dir,
+                                                  f'{self.source}-journal.jsonl'),
+                                     resume=resume)
+        if resume:
+            self.log.info(
+                f'resuming from journal: {self.journal.count("team_detail")} schedules and {self.journal.count("game")} games already scraped'
+            )
 
     def scrape_and_write_team_lists(self):
+        if self.journal and self.journal.has('team_list', self.source):
+            self.log.info(
+                f'team list for {self.source} ({self.year}) already written, skipping'
+            )
+            return
         self.log.info(
             f'scraping teams for {self.source} ({self.year}) into {self.out_dir}'
         )
@@ -121,6 +373,9 @@ class ScrapeRunner():
                              f'{self.source}-teams.json'), 'w') as f:
             shared.dump(teams, f, many=True)
 
+        if self.journal:
+            self.journal.record('team_list', self.source)
+
     def scrape_and_write_schedules(self, team_list_json_file: str | None):
         self.log.info(
             f'scraping schedules for {self.source} ({self.year}) into {self.out_dir}'
@@ -130,8 +385,7 @@ class ScrapeRunner():
             with open(team_list_json_file) as f:
                 teams = shared.load_many(Team, f)
         else:
-            teams_path = shared.parquet_path(self.out_dir, self.year, 'teams',
-                                            f'{self.source}.parquet')
+            teams_path = self.teams_path()
             if not os.path.exists(teams_path):
                 self.log.warning(
                     f'Teams file not found at {teams_path}, skipping schedule scraping. '
@@ -147,19 +401,26 @@ class ScrapeRunner():
         pathlib.Path(schedule_dir).mkdir(parents=True, exist_ok=True)
         games_dir = os.path.join(self.out_dir, self.year, 'games')
         pathlib.Path(games_dir).mkdir(parents=True, exist_ok=True)
-        schedules: list[TeamDetail] = []
-        for team in teams:
-            if self.team and self.team != team.id:
-                continue
-            if self.div and self.div != team.div:
-                continue
-            self.log.info(f'scraping schedule for {team.name}')
-            games = self.scrape_schedule(team)
-            if not games:
-                self.log.warning(f'No schedule for {team.name}')
-                continue
-            roster = self.scrape_roster(team)
-            schedules.append(TeamDetail(team=team, games=games, roster=roster))
+        selected_teams = [
+            team for team in teams
+            if (not self.team or self.team == team.id) and (
+                not self.div or self.div == team.div)
+        ]
+        if self.shard:
+            self.scrape_and_write_shard(selected_teams)
+            self.write_unchanged()
+            return
+        if self.stream:
+            self.stream_schedules_and_games(selected_teams, schedule_dir,
+                                            games_dir)
+            self.write_unchanged()
+            return
+
+        schedules: list[TeamDetail] = [
+            schedule
+            for schedule in self._map(self.scrape_team_detail, selected_teams)
+            if schedule
+        ]
 
         self.cross_link_schedules(schedules)
 
@@ -174,59 +435,315 @@ class ScrapeRunner():
                                                 f'{self.source}.parquet'),
                             sort_order=[('team.id', 'ascending')])
 
-        all_games = {}
+        # In incremental mode, games stored as final by a previous run are
+        # carried over instead of being fetched and parsed again
+        previous_games = self.load_previous_games() if self.incremental else {}
+        final_game_ids = {
+            id
+            for id, game in previous_games.items() if is_final(game)
+        }
+        if self.incremental:
+            self.log.info(
+                f'reusing {len(final_game_ids)} final games from previous run')
+
+        all_games = dict(previous_games)
+        for game_details in self.scrape_pending_games(schedules,
+                                                      final_game_ids):
+            all_games[game_details.id] = game_details
+            with open(os.path.join(games_dir, game_details.id + '.json'),
+                      'w') as f:
+                shared.dump(game_details, f)
+
+        shared.dump_parquet(sorted(all_games.values(), key=lambda g: g.id),
+                            shared.parquet_path(self.out_dir, self.year,
+                                                'games',
+                                                f'{self.source}.parquet'),
+                            sort_order=[('id', 'ascending')])
+        self.write_unchanged()
+
+    def write_unchanged(self):
+        """
+        Write the teams and games whose pages were identical to the last
+        run's, so later stages can skip them.
+
+        A team is unchanged when its schedule and roster both are.
+        """
+        with self._page_changes_lock:
+            page_changes = dict(self.page_changes)
+        teams = sorted(
+            id for (page_type, id), unchanged in page_changes.items()
+            if page_type == 'schedule' and unchanged
+            and page_changes.get(('roster', id), True))
+        games = sorted(id
+                       for (page_type, id), unchanged in page_changes.items()
+                       if page_type == 'game_details' and unchanged)
+        pathlib.Path(self.report_dir).mkdir(parents=True, exist_ok=True)
+        with open(
+                os.path.join(self.report_dir,
+                             f'{self.source}-unchanged.json'), 'w') as f:
+            json.dump({'teams': teams, 'games': games}, f, indent=2)
+        self.log.info(
+            f'{len(teams)} teams and {len(games)} games unchanged since the last run'
+        )
+
+    def scrape_and_write_shard(self, teams: list[Team]):
+        """
+        Scrape this shard's teams and the games they own into the shard's
+        directory, leaving cross linking to the merge.
+        """
+        index, count = self.shard
+        team_ids = {team.id for team in teams}
+        shard_teams = [
+            team for team in teams if shard_of(team.id, count) == index
+        ]
+        self.log.info(
+            f'shard {index}/{count}: scraping {len(shard_teams)} of {len(teams)} teams'
+        )
+        schedules: list[TeamDetail] = [
+            schedule
+            for schedule in self._map(self.scrape_team_detail, shard_teams)
+            if schedule
+        ]
+
+        owned_games = [
+            (team, game)
+            for team, game in self.pending_games(schedules, set())
+            if shard_of(game_owner(team, game, team_ids), count) == index
+        ]
+        previous_games = self.load_previous_games() if self.incremental else {}
+        games = [
+            previous_games[game.id] for _, game in owned_games
+            if game.id in previous_games and is_final(previous_games[game.id])
+        ]
+        reused_game_ids = {game.id for game in games}
+        if self.incremental:
+            self.log.info(
+                f'reusing {len(games)} final games from previous run')
+        games.extend(game for game in self._map(
+            lambda team_game: self.scrape_schedule_game(*team_game), [
+                (team, game)
+                for team, game in owned_games if game.id not in reused_game_ids
+            ]) if game)
+
+        shared.dump_parquet(sorted(schedules, key=lambda s: s.team.id),
+                            os.path.join(self.report_dir, 'schedules.parquet'),
+                            sort_order=[('team.id', 'ascending')])
+        shared.dump_parquet(sorted(games, key=lambda g: g.id),
+                            os.path.join(self.report_dir, 'games.parquet'),
+                            sort_order=[('id', 'ascending')])
+
+    def stream_schedules_and_games(self, teams: list[Team], schedule_dir: str,
+                                   games_dir: str):
+        """
+        Scrape schedules and games writing each as soon as it is ready.
+
+        Schedules are spilled to their json files as they arrive, keeping
+        only the teams for cross linking. They are then read back one at a
+        time, cross linked and appended to the schedules parquet while their
+        games are fetched and appended to the games parquet. Peak memory is
+        bounded by the batch size and the number of workers rather than the
+        size of the season. Rows of the games parquet are in the order they
+        were scraped rather than sorted by id.
+        """
+        scraped_teams: list[Team] = []
+        for schedule in self._map(self.scrape_team_detail, teams):
+            if not schedule:
+                continue
+            with open(os.path.join(schedule_dir, schedule.team.id + '.json'),
+                      'w') as f:
+                shared.dump(schedule, f)
+            scraped_teams.append(schedule.team)
+        scraped_teams.sort(key=lambda t: t.id)
+
+        final_game_ids = {
+            game.id
+            for game in self.iter_previous_games() if is_final(game)
+        } if self.incremental else set()
+        if self.incremental:
+            self.log.info(
+                f'reusing {len(final_game_ids)} final games from previous run')
+
+        schedules_writer = shared.ParquetBatchWriter(
+            TeamDetail,
+            shared.parquet_path(self.out_dir, self.year, 'schedules',
+                                f'{self.source}.parquet'))
+        games_writer = shared.ParquetBatchWriter(
+            Game,
+            shared.parquet_path(self.out_dir, self.year, 'games',
+                                f'{self.source}.parquet'))
+
+        def linked_schedules() -> Iterator[TeamDetail]:
+            for team in scraped_teams:
+                file_name = os.path.join(schedule_dir, team.id + '.json')
+                with open(file_name) as f:
+                    schedule = shared.load(TeamDetail, f)
+                self.cross_link_schedules([schedule], scraped_teams)
+                with open(file_name, 'w') as f:
+                    shared.dump(schedule, f)
+                schedules_writer.write(schedule)
+                yield schedule
+
+        written_game_ids = set()
+        with schedules_writer, games_writer:
+            for game_details in self.scrape_pending_games(
+                    linked_schedules(), final_game_ids):
+                written_game_ids.add(game_details.id)
+                with open(os.path.join(games_dir, game_details.id + '.json'),
+                          'w') as f:
+                    shared.dump(game_details, f)
+                games_writer.write(game_details)
+
+            if self.incremental:
+                for game in self.iter_previous_games():
+                    if game.id not in written_game_ids:
+                        games_writer.write(game)
+
+    def scrape_pending_games(self, schedules: Iterable[TeamDetail],
+                             skip_game_ids: set[str]) -> Iterator[Game]:
+        """
+        Fetch the details of each pending game. A game whose fetch failed is
+        tried again from the other team's schedule once every schedule has
+        been seen, since a game is only fetched from the first one listing it.
+        """
+        alternates: dict[str, tuple[Team, ScheduleGame]] = {}
+        failed_game_ids = []
+
+        def fetch(team_game: tuple[Team, ScheduleGame]):
+            return team_game[1].id, self.scrape_schedule_game(*team_game)
+
+        for game_id, game_details in self._map(
+                fetch, self.pending_games(schedules, skip_game_ids,
+                                          alternates)):
+            if game_details:
+                yield game_details
+            else:
+                failed_game_ids.append(game_id)
+
+        retries = [alternates[id] for id in failed_game_ids if id in alternates]
+        if retries:
+            self.log.info(
+                f'retrying {len(retries)} failed games from their opponents\' schedules'
+            )
+        for _, game_details in self._map(fetch, retries):
+            if game_details:
+                yield game_details
+
+    def pending_games(
+        self,
+        schedules: Iterable[TeamDetail],
+        skip_game_ids: set[str],
+        alternates: dict[str, tuple[Team, ScheduleGame]] | None = None
+    ) -> Iterator[tuple[Team, ScheduleGame]]:
+        """
+        Games with details to fetch, once each, skipping future games. The
+        later schedules listing a game are kept in alternates.
+        """
+        pending_game_ids = set()
         for schedule in schedules:
             team = schedule.team
             for game in schedule.games:
-                if not game.details:
+                if not game.details or game.id in skip_game_ids:
                     continue
 
-                if game.id in all_games:
+                if game.id in pending_game_ids:
                     self.log.info(
-                        f'already fetched game details for game {team.name} vs {game.opponent.name} on {game.date}'
+                        f'already fetching game details for game {team.name} vs {game.opponent.name} on {game.date}'
                     )
+                    if alternates is not None:
+                        alternates.setdefault(game.id, (team, game))
                     continue
 
-                if dateutil.parser.isoparse(
-                        game.date).date() > datetime.date.today():
+                if iso_date(game.date) > datetime.date.today():
                     continue
 
-                self.log.info(
-                    f'scraping game details for game {team.name} vs {game.opponent.name} on {game.date}'
-                )
-                opponent = game.opponent
-                (home_team,
-                 away_team) = (team, opponent) if game.home else (opponent,
-                                                                  team)
-                game_details = self.scrape_game_details(
-                    game.details, game.id, team.sport, team.source, home_team,
-                    away_team)
-                if not game_details:
-                    self.log.warning(
-                        f'no game details for game {team.name} vs {game.opponent.name} on {game.date}'
-                    )
-                    continue
-                all_games[game_details.id] = game_details
-                with open(os.path.join(games_dir, game_details.id + '.json'),
-                          'w') as f:
-                    shared.dump(game_details, f)
+                pending_game_ids.add(game.id)
+                yield team, game
 
-        shared.dump_parquet(sorted(all_games.values(), key=lambda g: g.id),
-                            shared.parquet_path(self.out_dir, self.year,
-                                                'games',
-                                                f'{self.source}.parquet'),
-                            sort_order=[('id', 'ascending')])
+    def load_previous_games(self) -> dict[str, Game]:
+        return {game.id: game for game in self.iter_previous_games()}
+
+    def iter_previous_games(self) -> Iterator[Game]:
+        games_path = shared.parquet_path(self.out_dir, self.year, 'games',
+                                         f'{self.source}.parquet')
+        if os.path.exists(games_path):
+            for batch in pq.ParquetFile(games_path).iter_batches():
+                yield from (Game.from_dict(r) for r in batch.to_pylist())
+            return
+        games_dir = os.path.join(self.out_dir, self.year, 'games')
+        files = [
+            os.path.join(games_dir, f) for f in os.listdir(games_dir)
+            if f.endswith('.json') and f.split('-')[1:2] == [self.source]
+        ] if os.path.exists(games_dir) else []
+        yield from shared.load_from_files(Game, files)
+
+    def scrape_team_detail(self, team: Team) -> TeamDetail | None:
+        if self.journal and self.journal.has('team_detail', team.id):
+            self.log.info(f'schedule for {team.name} already in journal')
+            return self.journal.load(TeamDetail, 'team_detail', team.id)
+        self.log.info(f'scraping schedule for {team.name}')
+        games = self.scrape_schedule(team)
+        if not games:
+            self.log.warning(f'No schedule for {team.name}')
+            return None
+        roster = self.scrape_roster(team)
+        team_detail = TeamDetail(team=team, games=games, roster=roster)
+        if self.journal:
+            self.journal.record('team_detail', team.id, team_detail)
+        return team_detail
+
+    def scrape_schedule_game(self, team: Team,
+                             game: ScheduleGame) -> Game | None:
+        if self.journal and self.journal.has('game', game.id):
+            self.log.info(f'game details for {game.id} already in journal')
+            return self.journal.load(Game, 'game', game.id)
+        self.log.info(
+            f'scraping game details for game {team.name} vs {game.opponent.name} on {game.date}'
+        )
+        opponent = game.opponent
+        (home_team, away_team) = (team, opponent) if game.home else (opponent,
+                                                                     team)
+        game_details = self.scrape_game_details(game.details, game.id,
+                                                team.sport, team.source,
+                                                home_team, away_team)
+        if not game_details:
+            self.log.warning(
+                f'no game details for game {team.name} vs {game.opponent.name} on {game.date}'
+            )
+        elif self.journal:
+            self.journal.record('game', game.id, game_details)
+        return game_details
+
+    def _map(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterator[R]:
+        """Apply fn to each item, on a bounded thread pool if concurrency > 1.
+
+        Results are yielded in input order, so outputs are identical to a
+        sequential run; network waits and parsing of different items overlap.
+        """
+        if self.concurrency <= 1:
+            yield from map(fn, items)
+            return
+        # Submit lazily with a bounded window so a streamed input is not
+        # drained up front and finished results do not pile up
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = collections.deque()
+            for item in items:
+                if len(futures) >= 2 * self.concurrency:
+                    yield futures.popleft().result()
+                futures.append(executor.submit(fn, item))
+            while futures:
+                yield futures.popleft().result()
 
     def scrape_teams(self) -> Iterator[Team]:
         for url in self.scraper.get_team_list_urls(self.year):
-            html = self.fetch(url)
+            html = self.fetch(url, 'team_list')
             if not html:
                 self.log.warning(
                     f'No team list html returned from {url}, skipping')
                 continue
             try:
-                yield from self.scraper.convert_team_list_html(
-                    html, self.year, url)
+                with self.metrics.time_parse('team_list'):
+                    yield from self.scraper.convert_team_list_html(
+                        html, self.year, url)
             except Exception as e:
                 self.log.error(
                     f'Unable to convert team list html from {url}: {e}')
@@ -241,11 +758,13 @@ class ScrapeRunner():
 
     def scrape_schedule(self, team: Team):
         schedule_location = team.schedule
-        html = self.fetch(schedule_location)
+        html = self.fetch(schedule_location, 'schedule')
         if not html:
             return
         try:
-            return self.scraper.convert_schedule_html(html, team)
+            return self._convert('schedule', team.id, ScheduleGame,
+                                 self.scraper.convert_schedule_html, html,
+                                 team)
         except Exception as e:
             self.log.error(
                 f'Unable to convert schedule html from {schedule_location}: {e}'
@@ -257,58 +776,199 @@ class ScrapeRunner():
         if not team.roster:
             return None
         roster_location = team.roster
-        html = self.fetch(roster_location)
+        html = self.fetch(roster_location, 'roster')
         try:
-            return self.scraper.convert_roster(html, team)
+            return self._convert('roster', team.id, Roster,
+                                 self.scraper.convert_roster, html, team)
         except Exception as e:
             self.log.error(
                 f'Unable to convert roster html from {roster_location}: {e}')
             traceback.print_exception(e)
             self._dump_html(f'roster-{team.id}.html', html)
 
-    def cross_link_schedules(self, schedules: list[TeamDetail]):
-        self.scraper.cross_link_schedules(schedules)
+    def cross_link_schedules(self,
+                             schedules: list[TeamDetail],
+                             teams: list[Team] | None = None):
+        self.scraper.cross_link_schedules(schedules, teams)
 
     def scrape_game_details(self, location: Location, game_id: str, sport: str,
                             source: str, home_team: Team, away_team: Team):
-        html = self.fetch(location)
+        html = self.fetch(location, 'game_details')
         if not html:
             return None
         try:
-            return self.scraper.convert_game_details_html(
-                html, location, game_id, sport, source, home_team, away_team)
+            return self._convert('game_details', game_id, Game,
+                                 self.scraper.convert_game_details_html,
+                                 html, location, game_id, sport, source,
+                                 home_team, away_team)
         except Exception as e:
             self.log.error(
                 f'Unable to convert game details html from {location}:')
             traceback.print_exception(e)
             self._dump_html(f'game-details-{game_id}.html', html)
 
-    def fetch(self, location):
+    def _convert(self, page_type: str, page_id: str, cls: type, convert: Callable,
+                 html: str, *args):
+        """
+        Convert a page with the scraper, reusing the result of an earlier
+        conversion of identical html with the same arguments.
+        """
+        if convert.__name__ in self.scraper.DATED_CONVERTERS:
+            args = (*args, datetime.date.today())
+        if not self.parse_cache:
+            with self.metrics.time_parse(page_type):
+                return convert(html, *args)
+        sha = html_hash(html)
+        page = f'{page_type}:{page_id}'
+        key = self.parse_cache.key(convert.__name__,
+                                   self.scraper.PARSER_VERSION,
+                                   parsing.BACKEND, sha, args_digest(*args))
+        found, result = self.parse_cache.get(key, cls, args)
+        if found:
+            self.metrics.record_parse_cache_hit(page_type)
+        else:
+            with self.metrics.time_parse(page_type):
+                result = convert(html, *args)
+            self.parse_cache.put(key, result, args, page)
+        unchanged = self.parse_cache.mark(page, sha)
+        with self._page_changes_lock:
+            self.page_changes[(page_type, page_id)] = unchanged
+        return result
+
+    def fetch(self, location: Location, page_type: str | None = None):
+        start = time.perf_counter()
+        result = self.fetch_result(location, page_type)
+        self.metrics.record_fetch(page_type, time.perf_counter() - start,
+                                  result)
+        return result.html
+
+    def fetch_result(self,
+                     location: Location,
+                     page_type: str | None = None) -> FetchResult:
+        if self.replayer:
+            return self.replayer.fetch(location.url)
+        result = self._fetch_live(location, page_type)
+        if self.recorder:
+            self.recorder.record(location.url, page_type, result)
+        return result
+
+    def _fetch_live(self, location: Location,
+                    page_type: str | None) -> FetchResult:
+        if self.source != 'ncaa':
+            return self._fetch_http(location, {'user-agent': USER_AGENT})
+
+        html = self.page_cache.get(location.url)
+        if html is not None:
+            return FetchResult(html=html, from_cache=True)
+        if self.ncaa_fetcher != 'http':
+            return self._fetch_browser(location, page_type)
+
+        # The impersonating client sends its browser's own headers. Pages it
+        # still cannot get past the block are fetched with the browser.
+        try:
+            result = self._fetch_http(location, {})
+        except requests.RequestException as e:
+            self.log.warning(f'http fetch failed for {location.url}: {e}')
+            result = FetchResult(html=None)
+        if (result.html is not None and not is_blocked_html(result.html)
+                and INTERSTITIAL_MARKER not in result.html):
+            return result
+        self.log.info(
+            f'{location.url} blocked over http, falling back to the browser')
+        self.cache.invalidate(location.url)
+        browser_result = self._fetch_browser(location, page_type)
+        browser_result.attempts += result.attempts
+        browser_result.blocked_attempts += 1
+        return browser_result
+
+    def _fetch_browser(self, location: Location,
+                       page_type: str | None) -> FetchResult:
         # Use Playwright with Firefox for NCAA source (bypasses Akamai blocking)
-        if self.source == 'ncaa':
-            try:
-                # Reuse existing browser if available, create new one if not
+        try:
+            # Reuse existing browser if available, create new one if not.
+            # One pooled page per worker lets navigations run concurrently.
+            with self._playwright_lock:
                 if not self.playwright_fetcher:
-                    self.playwright_fetcher = PlaywrightFetcher()
-                    self.playwright_fetcher.__enter__()
-                
-                return self.playwright_fetcher.fetch(location.url)
-            except Exception as e:
-                self.log.error(f'Playwright fetch failed for {location.url}: {e}')
-                return None
-        
-        # Use regular HTTP session for other sources (MCLA, etc.)
-        response = self.cache.get(location.url,
-                                  headers={'user-agent': USER_AGENT})
+                    fetcher = PlaywrightFetcher(pool_size=self.concurrency,
+                                                limiter=self.browser_limiter)
+                    fetcher.__enter__()
+                    self.playwright_fetcher = fetcher
+
+            result = self.playwright_fetcher.fetch_result(
+                location.url,
+                ready_selector=self.scraper.get_ready_selector(page_type)
+                if page_type else None)
+            self.page_cache.put(location.url, result.html)
+            return result
+        except Exception as e:
+            self.log.error(f'Playwright fetch failed for {location.url}: {e}')
+            return FetchResult(
+                html=None, attempts=self.playwright_fetcher.max_attempts
+                if self.playwright_fetcher else 1)
+
+    def _fetch_http(self, location: Location, headers: dict) -> FetchResult:
+        response = self.cache.get(location.url, headers=headers)
+        from_cache = getattr(response, 'from_cache', False)
         if response.status_code != 200:
             self.log.warning(
                 f'Issue fetching {location.url}, status code: {response.status_code}'
             )
-            return None
-        return response.text
-    
+            return FetchResult(html=None,
+                               status=response.status_code,
+                               from_cache=from_cache,
+                               blocked_attempts=int(
+                                   is_backpressure(response.status_code)))
+        return FetchResult(html=response.text,
+                           status=response.status_code,
+                           from_cache=from_cache,
+                           blocked_attempts=int(
+                               is_blocked_html(response.text)))
+
+    def write_metrics(self):
+        """Write the run's scrape metrics and log them as a table"""
+        pathlib.Path(self.report_dir).mkdir(parents=True, exist_ok=True)
+        self.metrics.write(
+            os.path.join(self.report_dir,
+                         f'{self.source}-scrape-metrics.json'))
+        self.log.info(f'scrape metrics for {self.source} ({self.year}):\n' +
+                      self.metrics.format_table())
+
     def cleanup(self):
         """Clean up resources (call after scraping complete)"""
+        self.write_metrics()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
+        if self.replayer and self.replayer.misses:
+            self.log.warning(
+                f'{self.replayer.misses} fetched URLs were not in the replay archive'
+            )
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        if self.parse_cache:
+            stats = self.parse_cache.stats()
+            self.log.info(
+                f'parse cache: {stats["hits"]} hits, {stats["misses"]} misses ({stats["hit_rate"]:.0%} hit rate)'
+            )
+            self.parse_cache.close()
+            self.parse_cache = None
+        if self.limiter:
+            self.log.info(
+                f'adaptive rate limit settled at {self.limiter.per_minute:.1f} requests/minute'
+            )
+            self.limiter.save()
         if self.playwright_fetcher:
             self.playwright_fetcher.__exit__(None, None, None)
             self.playwright_fetcher = None
+        if self.page_cache:
+            stats = self.page_cache.stats()
+            self.log.info(
+                f'page cache: {stats["hits"]} hits, {stats["misses"]} misses ({stats["hit_rate"]:.0%} hit rate)'
+            )
+            if self.cache_max_mb is not None:
+                self.page_cache.prune(int(self.cache_max_mb * 2**20))
+            self.page_cache.close()
+            self.page_cache = None
+        if self.cache_max_mb is not None:
+            self.http_cache.prune(int(self.cache_max_mb * 2**20))
@@ -0,0 +1,50 @@
+"""
+Deterministic partitioning of a season scrape across workers.
+
+`scrape teams` writes the team list all shards share, then
+`scrape schedules --shard i/N` scrapes the teams whose stable hash falls in
+shard i, and the games those teams own, writing partial outputs to
+out/<year>/shards/<source>/<i>-of-<N>/. Once every shard has finished,
+`scrape merge --shards N` combines them, cross links the schedules of the
+whole season and writes the canonical schedules and games datasets.
+"""
+import os
+import zlib
+
+from ..shared.types import ScheduleGame, Team
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """Parse an 'i/N' shard spec into (index, count)"""
+    try:
+        index, count = (int(part) for part in spec.split('/'))
+    except ValueError:
+        raise Exception(f'Invalid shard {spec}, expected i/N')
+    if count < 1 or not 0 <= index < count:
+        raise Exception(f'Invalid shard {spec}, expected 0 <= i < N')
+    return index, count
+
+
+def shard_of(key: str, count: int) -> int:
+    # crc32 rather than hash(), which is salted per process
+    return zlib.crc32(key.encode()) % count
+
+
+def shard_dir(out_dir: str, year: str, source: str, index: int,
+              count: int) -> str:
+    return os.path.join(out_dir, year, 'shards', source,
+                        f'{index}-of-{count}')
+
+
+def game_owner(team: Team, game: ScheduleGame, team_ids: set[str]) -> str:
+    """
+    The team whose shard fetches a game.
+
+    A game between two scraped teams shows up in both of their schedules;
+    the game's hash picks one of them, so the work is split evenly and both
+    shards agree on it. Games against other opponents belong to the team.
+    """
+    if game.opponent.id not in team_ids:
+        return team.id
+    pair = sorted([team.id, game.opponent.id])
+    return pair[zlib.crc32(game.id.encode()) % 2]
@@ -1,32 +1,63 @@
-def parse_table(table, extractor, cls=dict, header_row=None):
-    col_mapping = {}
-    if header_row is None:
-        header_row = table
+"""
+Table parsing driven by compiled column plans.
+
+The header row is compiled once into (cell index, setter) pairs. Body rows
+then only touch mapped cells, and each setter writes its fields straight
+into the row's kwargs dict.
+"""
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# Reads one cell and stores the field(s) it yields into the row dict
+ColumnSetter = Callable[[Any, dict], None]
+
+
+def compile_columns(header_row,
+                    columns: Mapping[str, ColumnSetter]) -> list[tuple[int, ColumnSetter]]:
+    plan = []
     for i, heading in enumerate(header_row.find_all('th')):
-        col_mapping[i] = ''.join(heading.stripped_strings)
+        setter = columns.get(''.join(heading.stripped_strings))
+        if setter:
+            plan.append((i, setter))
+    return plan
+
+
+def parse_table(table,
+                columns: Mapping[str, ColumnSetter],
+                cls=dict,
+                header_row=None):
+    plan = compile_columns(table if header_row is None else header_row,
+                           columns)
     rows = []
-    for raw_row in table.find_all('tr'):
+    for row_index, raw_row in enumerate(table.find_all('tr')):
+        # Cells are direct children of the row; walking children is far
+        # cheaper than a recursive find_all per row
+        cells = [cell for cell in raw_row.children if cell.name == 'td']
+        if not cells:
+            continue
+        row = {}
         try:
-            cols = [
-                col for col in _parse_row(raw_row, col_mapping, extractor)
-                if col is not None
-            ]
-            if cols:
-                parsed_row = cls(**{
-                    k: v
-                    for col in cols
-                    for k, v in col.items()
-                })
+            for i, setter in plan:
+                if i >= len(cells):
+                    break
+                cell = cells[i]
+                if int(cell.get('colspan', 1)) > 1:
+                    continue
+                setter(cell, row)
+            if row:
+                parsed_row = cls(**row)
                 if parsed_row:
                     rows.append(parsed_row)
         except Exception as e:
-            raise Exception(f'Unable to parse table row {raw_row}', e)
+            raise Exception(
+                f'Unable to parse table row {row_index}: {e!r}') from e
     return rows
 
 
-def _parse_row(raw_row, col_mapping, extractor):
-    for i, cell in enumerate(raw_row.find_all('td')):
-        if int(cell.get('colspan', 1)) > 1:
-            continue
-        col_name = col_mapping[i]
-        yield extractor(col_name, cell)
+def int_column(field: str) -> ColumnSetter:
+    """Setter storing the cell's string as an int"""
+
+    def set_int(cell, row):
+        row[field] = int(cell.string)
+
+    return set_int
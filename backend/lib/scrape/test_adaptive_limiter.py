@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests.adapters import BaseAdapter
+
+from .adaptive_limiter import AdaptiveLimiterSession, AdaptiveRateLimiter, FixedRateLimiter, is_backpressure
+
+
+class StubAdapter(BaseAdapter):
+    """Answers every request with the next (status, body) pair"""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def send(self, request, **kwargs):
+        status, body = self.responses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        response._content = body.encode()
+        response.headers['content-type'] = 'text/html'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+
+    def test_additive_increase_multiplicative_decrease(self):
+        limiter = AdaptiveRateLimiter(per_minute=30, cooldown=0)
+        for _ in range(10):
+            limiter.record_success()
+        self.assertEqual(limiter.per_minute, 35)
+        limiter.record_backpressure()
+        self.assertEqual(limiter.per_minute, 17.5)
+
+    def test_rate_stays_within_bounds(self):
+        limiter = AdaptiveRateLimiter(per_minute=30,
+                                      min_per_minute=10,
+                                      max_per_minute=31,
+                                      cooldown=0)
+        for _ in range(10):
+            limiter.record_success()
+        self.assertEqual(limiter.per_minute, 31)
+        for _ in range(10):
+            limiter.record_backpressure()
+        self.assertEqual(limiter.per_minute, 10)
+
+    def test_backpressure_during_cooldown_cuts_once(self):
+        limiter = AdaptiveRateLimiter(per_minute=40, cooldown=60)
+        for _ in range(5):
+            limiter.record_backpressure()
+        self.assertEqual(limiter.per_minute, 20)
+
+    def test_reserve_spaces_requests(self):
+        limiter = AdaptiveRateLimiter(per_minute=60)
+        with patch('time.monotonic', return_value=100.0):
+            self.assertEqual([limiter.reserve() for _ in range(3)],
+                             [0.0, 1.0, 2.0])
+
+    def test_fixed_rate_ignores_backpressure(self):
+        limiter = FixedRateLimiter(per_minute=60)
+        limiter.record(429)
+        limiter.record(200, '<html></html>')
+        self.assertEqual(limiter.per_minute, 60)
+        with patch('time.monotonic', return_value=100.0):
+            self.assertEqual([limiter.reserve() for _ in range(3)],
+                             [0.0, 1.0, 2.0])
+
+    def test_rate_is_persisted_between_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            state_path = os.path.join(tmp, 'cache', 'ncaa-rate.json')
+            limiter = AdaptiveRateLimiter(per_minute=30, state_path=state_path)
+            limiter.record_success()
+            limiter.save()
+
+            self.assertEqual(
+                AdaptiveRateLimiter(per_minute=30,
+                                    state_path=state_path).per_minute, 30.5)
+
+    def test_backpressure_signals(self):
+        self.assertTrue(is_backpressure(429))
+        self.assertTrue(is_backpressure(403))
+        self.assertTrue(is_backpressure(503))
+        self.assertTrue(
+            is_backpressure(200, '<h2>under heavy load (queue full)</h2>'))
+        self.assertFalse(is_backpressure(200, '<table></table>'))
+        self.assertFalse(is_backpressure(404))
+
+
+class TestAdaptiveLimiterSession(unittest.TestCase):
+
+    def test_session_reports_responses_to_limiter(self):
+        limiter = AdaptiveRateLimiter(per_minute=30, cooldown=0)
+        session = AdaptiveLimiterSession(limiter)
+        session.mount(
+            'https://', StubAdapter([(200, '<table></table>'),
+                                     (429, 'slow down'),
+                                     (200, 'Access Denied')]))
+
+        with patch.object(limiter, 'acquire') as acquire:
+            session.get('https://example.com/a')
+            self.assertEqual(limiter.per_minute, 30.5)
+            session.get('https://example.com/b')
+            self.assertEqual(limiter.per_minute, 15.25)
+            session.get('https://example.com/c')
+            self.assertEqual(limiter.per_minute, 7.625)
+        self.assertEqual(acquire.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
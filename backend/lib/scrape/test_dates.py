@@ -0,0 +1,50 @@
+import datetime
+import itertools
+import unittest
+
+import dateutil.parser
+
+from . import dates
+
+
+class TestDates(unittest.TestCase):
+
+    def assert_matches_dateutil(self, text):
+        self.assertEqual(
+            dates.parse_datetime(text),
+            dateutil.parser.parse(text, tzinfos=dates.TIMEZONES).isoformat(),
+            text)
+
+    def test_schedule_dates_match_dateutil(self):
+        days = ['Fri Feb 9', 'Sun Mar 17', 'Tue May 7', 'Sat Apr 6', 'Feb 29']
+        times = ['', '7:00pm', '12:00pm', '12:30am', '11:00 AM', '6:30pm PDT']
+        for day, time in itertools.product(days, times):
+            self.assert_matches_dateutil(f'{day} {time} 2024')
+
+    def test_game_details_dates_match_dateutil(self):
+        for text in ['Jan 31 2024 12:00 EST', 'May 4 2025 12:00 EST',
+                     'September 8 2023 12:00 CDT']:
+            self.assert_matches_dateutil(text)
+
+    def test_unknown_formats_fall_back_to_dateutil(self):
+        for text in ['2024-02-09T19:00:00', '9 Feb 2024', 'Feb 9, 2024 at 7pm']:
+            self.assert_matches_dateutil(text)
+
+    def test_is_time(self):
+        for text in ['7:00pm', '12:30 am', '19:00', '7:00pm EST']:
+            self.assertTrue(dates.is_time(text), text)
+        for text in ['TBA', 'Final', 'Postponed', '']:
+            self.assertFalse(dates.is_time(text), text)
+
+    def test_mdy_to_iso_date(self):
+        self.assertEqual(dates.mdy_to_iso_date('02/10/2024'), '2024-02-10')
+
+    def test_iso_date(self):
+        self.assertEqual(dates.iso_date('2024-02-09T19:00:00-07:00'),
+                         datetime.date(2024, 2, 9))
+        self.assertEqual(dates.iso_date('2024-02-09'),
+                         datetime.date(2024, 2, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+from requests_cache import CachedResponse, CachedSession, SQLiteCache
+from urllib3 import HTTPResponse
+
+from .http_cache import (DEFAULT_EXPIRE_AFTER, URLS_EXPIRE_AFTER,
+                         LruSQLiteCache, compressed_serializer,
+                         import_legacy_cache)
+
+
+def make_response(url: str, text: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = text.encode()
+    response.encoding = 'utf-8'
+    response.request = requests.Request('GET', url).prepare()
+    response.raw = HTTPResponse(body=io.BytesIO(response._content),
+                                status=200,
+                                request_url=url,
+                                preload_content=False)
+    return response
+
+def can_serialize_responses() -> bool:
+    # requests_cache 1.2 cannot unstructure responses from requests >= 2.33
+    try:
+        compressed_serializer.dumps(
+            CachedResponse.from_response(make_response('https://mcla.us', '')))
+    except NameError:
+        return False
+    return True
+
+
+class TestLruSQLiteCacheConnection(unittest.TestCase):
+
+    def test_shared_between_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = LruSQLiteCache(os.path.join(tmp, 'mcla'))
+            with cache.responses.connection() as con:
+                self.assertEqual(
+                    con.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+                self.assertEqual(
+                    con.execute('PRAGMA busy_timeout').fetchone()[0], 30000)
+            cache.close()
+
+
+@unittest.skipUnless(can_serialize_responses(),
+                     'installed requests is incompatible with requests_cache')
+class TestLruSQLiteCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_dir = tmp.name
+        self.cache = LruSQLiteCache(os.path.join(tmp.name, 'mcla'))
+        self.addCleanup(self.cache.close)
+        self.session = CachedSession(backend=self.cache,
+                                     expire_after=DEFAULT_EXPIRE_AFTER,
+                                     urls_expire_after=URLS_EXPIRE_AFTER)
+
+    def save(self, url: str, text: str):
+        response = make_response(url, text)
+        self.cache.save_response(response)
+        return self.cache.create_key(response.request)
+
+    def test_responses_are_stored_compressed(self):
+        html = '<html>' + '<tr><td>row</td></tr>' * 1000 + '</html>'
+        key = self.save('https://mcla.us/teams/2024', html)
+        self.assertEqual(self.cache.get_response(key).text, html)
+        stats = self.cache.stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['hits'], 1)
+        self.assertLess(stats['stored_bytes'], len(html) / 10)
+
+    def test_urls_expire_after(self):
+        expire_after = self.session.settings.urls_expire_after
+        self.assertIn('stats.ncaa.org/contests/*/individual_stats',
+                      expire_after)
+        # Linked before the game is played, so they must be refetched
+        self.assertNotIn('mcla.us/games/*', expire_after)
+
+    def test_prune_evicts_least_recently_used(self):
+        urls = [f'https://mcla.us/teams/{i}' for i in range(3)]
+        keys = []
+        for i, url in enumerate(urls):
+            with patch('lib.scrape.http_cache.time.time',
+                       return_value=time.time() - 10 + i):
+                keys.append(self.save(url, f'<html>{url}</html>'))
+        # Reading the oldest response makes the second one least recently used
+        self.cache.get_response(keys[0])
+        size = self.cache.stats()['stored_bytes']
+
+        self.assertEqual(self.cache.prune(size - 1), 1)
+        self.assertEqual(sorted(url for url, _, _ in self.cache.pages()),
+                         [urls[0], urls[2]])
+
+    def test_prune_deletes_expired(self):
+        key = self.save('https://mcla.us/teams/1', '<html>team</html>')
+        with self.cache.responses.connection(commit=True) as con:
+            con.execute('UPDATE responses SET expires = ? WHERE key = ?',
+                        (time.time() - 1, key))
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+    def test_imports_the_sources_responses_from_the_legacy_cache(self):
+        legacy_path = os.path.join(self.tmp_dir, 'cache.sqlite')
+        legacy = SQLiteCache(legacy_path)
+        for url in ['https://mcla.us/teams/1', 'https://stats.ncaa.org/teams/1']:
+            legacy.save_response(make_response(url, f'<html>{url}</html>'))
+        legacy.close()
+
+        self.assertEqual(import_legacy_cache(legacy_path, self.cache, 'mcla.us'),
+                         1)
+        self.assertEqual(list(self.cache.pages()),
+                         [('https://mcla.us/teams/1', 200,
+                           '<html>https://mcla.us/teams/1</html>')])
+
+
+if __name__ == '__main__':
+    unittest.main()
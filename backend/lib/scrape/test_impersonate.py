@@ -0,0 +1,72 @@
+import gzip
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from requests_cache import CachedSession
+
+from .impersonate import CurlCffiAdapter
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        body = gzip.compress(
+            f'{self.path}|{self.headers.get("Cookie")}|{self.headers.get("User-Agent")}'
+            .encode())
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Set-Cookie', 'ak_bmsc=abc; Path=/')
+        self.send_header('Set-Cookie', 'bm_sv=def; Path=/')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCurlCffiAdapter(unittest.TestCase):
+
+    def setUp(self):
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base_url = f'http://127.0.0.1:{server.server_port}'
+
+        self.session = CachedSession('impersonate-test', backend='memory')
+        self.adapter = CurlCffiAdapter()
+        self.session.mount('http://', self.adapter)
+        self.addCleanup(self.session.close)
+
+    def test_sends_browser_headers_and_decodes_body(self):
+        response = self.session.get(self.base_url + '/a')
+        path, cookie, user_agent = response.text.split('|')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(path, '/a')
+        self.assertIn('Firefox', user_agent)
+        self.assertNotIn('python-requests', user_agent)
+
+    def test_response_cookies_go_to_the_session_jar(self):
+        self.session.get(self.base_url + '/a')
+        self.assertEqual(self.session.cookies.get_dict(), {
+            'ak_bmsc': 'abc',
+            'bm_sv': 'def'
+        })
+        response = self.session.get(self.base_url + '/b')
+        cookie = response.text.split('|')[1]
+        self.assertEqual(sorted(cookie.split('; ')),
+                         ['ak_bmsc=abc', 'bm_sv=def'])
+
+    def test_responses_are_cached(self):
+        first = self.session.get(self.base_url + '/a')
+        second = self.session.get(self.base_url + '/a')
+        self.assertFalse(first.from_cache)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(first.text, second.text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,31 @@
 """
 Tests for Akamai interstitial bypass wrapper.
 """
+import json
+import os
+import tempfile
+import time
 import unittest
 from unittest.mock import Mock, MagicMock
+
+from requests.cookies import RequestsCookieJar
+
 from .interstitial_bypass import InterstitialBypassSession
 
+INTERSTITIAL_HTML = '''
+    <script>
+    var config = {"bm-verify": "abc123"};
+    var i = 10; var j = i + Number("20" + "30");
+    </script>
+'''
+
+
+def make_response(text: str, status_code: int = 200) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    return response
+
 
 class TestInterstitialBypass(unittest.TestCase):
     
@@ -116,5 +137,82 @@ class TestInterstitialBypass(unittest.TestCase):
         self.assertEqual(result, mock_200)
 
 
+
+class TestPersistedCookies(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cookie_file = os.path.join(tmp.name, 'cache', 'ncaa-cookies.json')
+
+    def make_session(self) -> Mock:
+        mock_session = Mock()
+        mock_session.cookies = RequestsCookieJar()
+        mock_session.post.return_value = make_response('{"success": true}')
+        return mock_session
+
+    def test_solved_cookies_are_reused_by_the_next_session(self):
+        first = self.make_session()
+
+        def solve(*args, **kwargs):
+            first.cookies.set('ak_bmsc', 'cleared', domain='stats.ncaa.org')
+            return make_response('{"success": true}')
+
+        first.post.side_effect = solve
+        first.get.side_effect = [
+            make_response(INTERSTITIAL_HTML),
+            make_response('<html>Real content</html>')
+        ]
+        InterstitialBypassSession(first, cookie_file=self.cookie_file).get(
+            'https://stats.ncaa.org/teams/1')
+
+        second = self.make_session()
+        second.get.return_value = make_response('<html>Real content</html>')
+        session = InterstitialBypassSession(second,
+                                            cookie_file=self.cookie_file)
+        session.get('https://stats.ncaa.org/teams/2')
+
+        self.assertEqual(second.cookies.get('ak_bmsc'), 'cleared')
+        second.post.assert_not_called()
+
+    def test_expired_cookies_are_not_loaded(self):
+        os.makedirs(os.path.dirname(self.cookie_file))
+        with open(self.cookie_file, 'w') as f:
+            json.dump([{
+                'name': 'ak_bmsc',
+                'value': 'stale',
+                'domain': 'stats.ncaa.org',
+                'path': '/',
+                'secure': True,
+                'expires': int(time.time()) - 60,
+            }], f)
+
+        mock_session = self.make_session()
+        InterstitialBypassSession(mock_session, cookie_file=self.cookie_file)
+
+        self.assertEqual(len(mock_session.cookies), 0)
+
+    def test_cookies_saved_by_another_process_are_tried_before_solving(self):
+        mock_session = self.make_session()
+        mock_session.get.side_effect = [
+            make_response(INTERSTITIAL_HTML),
+            make_response('<html>Real content</html>')
+        ]
+        session = InterstitialBypassSession(mock_session,
+                                            cookie_file=self.cookie_file)
+
+        # Another worker solves the challenge and saves its cookies
+        other = self.make_session()
+        other.cookies.set('ak_bmsc', 'cleared', domain='stats.ncaa.org')
+        InterstitialBypassSession(other,
+                                  cookie_file=self.cookie_file)._save_cookies()
+
+        result = session.get('https://stats.ncaa.org/teams/1')
+
+        self.assertEqual(result.text, '<html>Real content</html>')
+        self.assertEqual(mock_session.cookies.get('ak_bmsc'), 'cleared')
+        mock_session.post.assert_not_called()
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from .journal import ScrapeJournal
+from ..shared.types import Location, Team
+
+
+def make_team(id):
+    return Team(id=id,
+                name=f'team {id}',
+                schedule=Location(url=f'https://schedule/{id}'),
+                year='2024',
+                div='d1',
+                sport='ml',
+                source='mcla')
+
+
+class TestScrapeJournal(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'journal.jsonl')
+
+    def test_resume_replays_recorded_entries(self):
+        journal = ScrapeJournal(self.path)
+        journal.record('team_list', 'mcla')
+        journal.record('team', 'a', make_team('a'))
+        journal.close()
+
+        journal = ScrapeJournal(self.path, resume=True)
+        self.addCleanup(journal.close)
+        self.assertTrue(journal.has('team_list', 'mcla'))
+        self.assertEqual(journal.load(Team, 'team', 'a'), make_team('a'))
+        self.assertIsNone(journal.load(Team, 'team', 'b'))
+
+    def test_without_resume_starts_over(self):
+        journal = ScrapeJournal(self.path)
+        journal.record('team', 'a', make_team('a'))
+        journal.close()
+
+        journal = ScrapeJournal(self.path)
+        self.addCleanup(journal.close)
+        self.assertFalse(journal.has('team', 'a'))
+
+    def test_truncated_entry_is_discarded(self):
+        journal = ScrapeJournal(self.path)
+        journal.record('team', 'a', make_team('a'))
+        journal.close()
+        with open(self.path, 'ab') as f:
+            f.write(b'{"kind": "team", "id": "b", "da')
+
+        journal = ScrapeJournal(self.path, resume=True)
+        self.addCleanup(journal.close)
+        self.assertEqual(journal.count('team'), 1)
+        journal.record('team', 'c', make_team('c'))
+        self.assertEqual(journal.load(Team, 'team', 'c'), make_team('c'))
+        self.assertEqual(journal.load(Team, 'team', 'a'), make_team('a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
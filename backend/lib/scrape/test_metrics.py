@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from .metrics import FetchResult, ScrapeMetrics, percentile
+
+
+class TestScrapeMetrics(unittest.TestCase):
+
+    def test_percentile_is_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([3.0], 90), 3.0)
+
+    def test_summary_aggregates_by_page_type(self):
+        metrics = ScrapeMetrics('ncaa', '2024')
+        metrics.record_fetch('schedule', 1.0,
+                             FetchResult(html='abc', from_cache=True))
+        metrics.record_fetch(
+            'schedule', 3.0,
+            FetchResult(html='de', status=200, attempts=3, blocked_attempts=2))
+        metrics.record_fetch('schedule', 2.0, FetchResult(html=None,
+                                                          status=404))
+        with metrics.time_parse('schedule'):
+            pass
+        with self.assertRaises(ValueError), metrics.time_parse('schedule'):
+            raise ValueError('bad html')
+
+        schedule = metrics.summary()['page_types']['schedule']
+        self.assertEqual(schedule['fetches'], 3)
+        self.assertEqual(schedule['cache_hits'], 1)
+        self.assertEqual(schedule['cache_misses'], 2)
+        self.assertEqual(schedule['failures'], 1)
+        self.assertEqual(schedule['bytes'], 5)
+        self.assertEqual(schedule['retries'], 2)
+        self.assertEqual(schedule['blocks'], 2)
+        self.assertEqual(schedule['fetch_seconds']['p50'], 2.0)
+        self.assertEqual(schedule['fetch_seconds']['max'], 3.0)
+        self.assertEqual(schedule['parses'], 2)
+        self.assertEqual(schedule['parse_failures'], 1)
+
+    def test_write_and_format(self):
+        metrics = ScrapeMetrics('mcla', '2024')
+        metrics.record_fetch('game_details', 0.5, FetchResult(html='x'))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'mcla-scrape-metrics.json')
+            metrics.write(path)
+            with open(path) as f:
+                written = json.load(f)
+        self.assertEqual(written['source'], 'mcla')
+        self.assertEqual(written['page_types']['game_details']['fetches'], 1)
+        self.assertIn('game_details', metrics.format_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -173,3 +173,36 @@ class TestScrape(unittest.TestCase):
         n.cross_link_schedules(schedules)
         self.assertEqual(schedules[0].games[0].opponent.id, 'ml-ncaa-2')
         self.assertEqual(schedules[1].games[0].opponent.id, 'ml-ncaa-1')
+
+    def test_cross_linking_one_schedule_against_teams(self):
+        n = ncaa.Ncaa()
+        team = Team(id='ml-ncaa-2',
+                    name='team 2',
+                    alt_id='alt2',
+                    schedule=Location(url='https://schedule/2'),
+                    year='2024',
+                    div='ml1',
+                    sport='ml',
+                    source='ncaa')
+        schedule = TeamDetail(team=team,
+                              games=[
+                                  ScheduleGame(date='2024-01-31',
+                                               sport='ml',
+                                               source='ncaa',
+                                               home=True,
+                                               opponent=TeamSummary(
+                                                   name='team 1',
+                                                   alt_id='alt1'))
+                              ])
+        n.cross_link_schedules([schedule], [
+            team,
+            Team(id='ml-ncaa-1',
+                 name='team 1',
+                 alt_id='alt1',
+                 schedule=Location(url='https://schedule/1'),
+                 year='2024',
+                 div='ml1',
+                 sport='ml',
+                 source='ncaa')
+        ])
+        self.assertEqual(schedule.games[0].opponent.id, 'ml-ncaa-1')
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from .page_cache import PageCache
+
+
+class TestPageCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = PageCache(os.path.join(tmp.name, 'cache', 'pages.sqlite'))
+        self.addCleanup(self.cache.close)
+
+    def test_hit_and_miss_accounting(self):
+        url = 'https://stats.ncaa.org/teams/594020'
+        self.assertIsNone(self.cache.get(url))
+        self.cache.put(url, '<html>schedule</html>')
+        self.assertEqual(self.cache.get(url), '<html>schedule</html>')
+        self.assertEqual(self.cache.stats(), {
+            'hits': 1,
+            'misses': 1,
+            'hit_rate': 0.5
+        })
+
+    def test_ttl_policies(self):
+        self.assertIsNone(
+            self.cache.ttl_for(
+                'https://stats.ncaa.org/contests/6520729/individual_stats'))
+        self.assertEqual(
+            self.cache.ttl_for('https://stats.ncaa.org/teams/594020'),
+            timedelta(days=1))
+
+    def test_schedules_expire_but_box_scores_do_not(self):
+        box_score = 'https://stats.ncaa.org/contests/6520729/individual_stats'
+        schedule = 'https://stats.ncaa.org/teams/594020'
+        self.cache.put(box_score, '<html>box score</html>')
+        self.cache.put(schedule, '<html>schedule</html>')
+
+        two_days_later = time.time() + 2 * 24 * 3600
+        with patch('lib.scrape.page_cache.time.time',
+                   return_value=two_days_later):
+            self.assertEqual(self.cache.get(box_score),
+                             '<html>box score</html>')
+            self.assertIsNone(self.cache.get(schedule))
+
+    def test_pages_are_stored_compressed(self):
+        html = '<html>' + '<tr><td>row</td></tr>' * 1000 + '</html>'
+        self.cache.put('https://stats.ncaa.org/teams/594020', html)
+        stats = self.cache.storage_stats()
+        self.assertEqual(stats['entries'], 1)
+        self.assertLess(stats['stored_bytes'], len(html) / 10)
+        self.assertEqual(list(self.cache.pages()),
+                         [('https://stats.ncaa.org/teams/594020', html)])
+
+    def test_reads_uncompressed_pages_from_older_caches(self):
+        url = 'https://stats.ncaa.org/teams/594020'
+        self.cache._conn.execute(
+            'INSERT INTO pages (url, html, fetched_at, expires_at) VALUES (?, ?, ?, NULL)',
+            (url, '<html>old</html>', time.time()))
+        self.assertEqual(self.cache.get(url), '<html>old</html>')
+
+    def test_prune_evicts_least_recently_used_pages(self):
+        urls = [f'https://stats.ncaa.org/teams/{i}' for i in range(3)]
+        now = time.time()
+        for i, url in enumerate(urls):
+            with patch('lib.scrape.page_cache.time.time',
+                       return_value=now - 10 + i):
+                self.cache.put(url, f'<html>{url}</html>')
+        # Reading the oldest page makes the second one least recently used
+        self.cache.get(urls[0])
+        size = self.cache.storage_stats()['stored_bytes']
+
+        self.assertEqual(self.cache.prune(size - 1), 1)
+        self.assertEqual(sorted(url for url, _ in self.cache.pages()),
+                         [urls[0], urls[2]])
+
+    def test_prune_deletes_expired_pages(self):
+        schedule = 'https://stats.ncaa.org/teams/594020'
+        self.cache.put(schedule, '<html>schedule</html>')
+        with patch('lib.scrape.page_cache.time.time',
+                   return_value=time.time() + 2 * 24 * 3600):
+            self.assertEqual(self.cache.prune(), 1)
+        self.assertEqual(self.cache.storage_stats()['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from .parse_cache import ParseCache, args_digest, html_hash
+from ..shared.types import Location, ScheduleGame, Team, TeamSummary
+
+
+def make_team(id):
+    return Team(id=id,
+                name=f'team {id}',
+                schedule=Location(url=f'https://schedule/{id}'),
+                year='2024',
+                div='d1',
+                sport='ml',
+                source='mcla')
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = ParseCache(os.path.join(tmp.name, 'parse', 'mcla.sqlite'))
+        self.addCleanup(self.cache.close)
+
+    def test_round_trips_results(self):
+        games = [
+            ScheduleGame(id='g1',
+                         date='2024-03-01',
+                         opponent=TeamSummary(id='b', name='team b'),
+                         sport='ml',
+                         source='mcla',
+                         home=True)
+        ]
+        key = self.cache.key('convert_schedule_html', 1, 'lxml',
+                             html_hash('<html/>'), args_digest(make_team('a')))
+        self.assertEqual(self.cache.get(key, ScheduleGame), (False, None))
+
+        self.cache.put(key, games)
+        self.assertEqual(self.cache.get(key, ScheduleGame), (True, games))
+
+        self.cache.put(key, None)
+        self.assertEqual(self.cache.get(key, ScheduleGame), (True, None))
+        self.assertEqual(self.cache.stats()['hits'], 2)
+
+    def test_restores_converted_arguments(self):
+        key = self.cache.key('convert_schedule_html', 1, 'lxml',
+                             html_hash('<html/>'), args_digest(make_team('a')))
+        team = make_team('a')
+        team.alt_id = '594020'
+        self.cache.put(key, [], [team])
+
+        cached_team = make_team('a')
+        self.assertEqual(self.cache.get(key, ScheduleGame, [cached_team]),
+                         (True, []))
+        self.assertEqual(cached_team.alt_id, '594020')
+
+    def test_args_digest_depends_on_arguments(self):
+        self.assertEqual(args_digest(make_team('a')),
+                         args_digest(make_team('a')))
+        self.assertNotEqual(args_digest(make_team('a')),
+                            args_digest(make_team('b')))
+
+    def test_keeps_only_the_latest_conversion_of_a_page(self):
+        first = self.cache.key('convert_schedule_html', 1, 'lxml',
+                               html_hash('v1'), args_digest(make_team('a')))
+        second = self.cache.key('convert_schedule_html', 1, 'lxml',
+                                html_hash('v2'), args_digest(make_team('a')))
+        self.cache.put(first, [], page='schedule:a')
+        self.cache.put(second, [], page='schedule:a')
+        self.cache.put(first, [], page='schedule:b')
+
+        self.assertEqual(self.cache.count(), 2)
+        self.assertEqual(self.cache.get(second, ScheduleGame), (True, []))
+
+    def test_mark_reports_unchanged_pages(self):
+        self.assertFalse(self.cache.mark('schedule:a', html_hash('v1')))
+        self.assertTrue(self.cache.mark('schedule:a', html_hash('v1')))
+        self.assertFalse(self.cache.mark('schedule:a', html_hash('v2')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import patch
+
+from . import fixtures, mcla, ncaa, parsing
+from ..shared.types import Location, Team
+
+
+def _team(id, source, schedule_url, roster_url=None):
+    return Team(name=id,
+                id=id,
+                year='2024',
+                div=source + '1',
+                sport='ml',
+                source=source,
+                schedule=Location(url=schedule_url),
+                roster=Location(url=roster_url) if roster_url else None)
+
+
+def conversions():
+    """
+    (fixture file, converter) pairs covering every fixture.
+
+    Each converter takes the fixture html and returns the converted
+    dataclasses, so parser backends can be compared and benchmarked.
+    """
+    m = mcla.Mcla()
+    n = ncaa.Ncaa()
+    mcla_team = _team('ml-mcla-arizona-state', 'mcla',
+                      'https://mcla.us/teams/arizona-state/2024/schedule',
+                      'https://mcla.us/teams/arizona-state/2024/roster')
+    ncaa_team = _team('ml-ncaa-air-force', 'ncaa',
+                      'https://stats.ncaa.org/teams/594020')
+    return [
+        ('mcla_team_list.html', lambda html: list(
+            m.convert_team_list_html(html, '2026',
+                                     next(m.get_team_list_urls('2026'))))),
+        ('mcla_schedule.html',
+         lambda html: m.convert_schedule_html(html, mcla_team)),
+        ('mcla_roster.html', lambda html: m.convert_roster(html, mcla_team)),
+        ('mcla_game_details.html', lambda html: m.convert_game_details_html(
+            html,
+            Location(url=
+                     'https://mcla.us/games/arizona-christian-vs-oregon-state-2026-5d5605'
+                     ), 'ml-mcla-arizona-christian-vs-oregon-state-2026-5d5605',
+            'ml', 'mcla', mcla_team, mcla_team)),
+        ('ncaa_team_list.html', lambda html: list(
+            n.convert_team_list_html(html, '2023',
+                                     next(n.get_team_list_urls('2023'))))),
+        ('ncaa_game_by_game.html',
+         lambda html: n.convert_schedule_html(html, ncaa_team)),
+        ('malone_game_by_game.html',
+         lambda html: n.convert_schedule_html(html, ncaa_team)),
+        ('ncaa_game_details.html', lambda html: n.convert_game_details_html(
+            html,
+            Location(url=
+                     'https://stats.ncaa.org/contests/6310104/individual_stats'
+                     ), 'ml-ncaa-6310104', 'ml', 'ncaa', ncaa_team, ncaa_team)),
+    ]
+
+
+@unittest.skipIf(parsing.FAST_BACKEND not in parsing.available_backends(),
+                 'lxml is not installed')
+class TestParserBackendParity(unittest.TestCase):
+    maxDiff = None
+
+    def convert(self, backend, name, converter):
+        with patch.object(parsing, 'BACKEND', backend):
+            return converter(fixtures.load_fixture(name))
+
+    def test_backends_produce_identical_output(self):
+        for name, converter in conversions():
+            with self.subTest(fixture=name):
+                self.assertEqual(
+                    self.convert(parsing.FALLBACK_BACKEND, name, converter),
+                    self.convert(parsing.FAST_BACKEND, name, converter))
+
+
+class TestPartialParsing(unittest.TestCase):
+    maxDiff = None
+
+    def test_game_details_subtrees_give_identical_output(self):
+        game_details = [(name, converter)
+                        for name, converter in conversions()
+                        if name.endswith('game_details.html')]
+        self.assertEqual(len(game_details), 2)
+        for backend in parsing.available_backends():
+            for name, converter in game_details:
+                with self.subTest(backend=backend, fixture=name), \
+                        patch.object(parsing, 'BACKEND', backend):
+                    html = fixtures.load_fixture(name)
+                    strained = converter(html)
+                    with patch.object(mcla.Mcla, 'GAME_DETAILS_SUBTREES', None), \
+                            patch.object(ncaa.Ncaa, 'GAME_DETAILS_SUBTREES', None):
+                        full = converter(html)
+                    self.assertEqual(strained, full)
+
+
+class TestParserBackendSelection(unittest.TestCase):
+
+    def test_override_from_environment(self):
+        with patch.dict('os.environ', {'SCRAPE_HTML_PARSER': 'html.parser'}):
+            self.assertEqual(parsing.default_backend(), 'html.parser')
+
+    def test_rejects_unknown_backend(self):
+        with patch.dict('os.environ', {'SCRAPE_HTML_PARSER': 'nope'}):
+            with self.assertRaises(ValueError):
+                parsing.default_backend()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,12 +2,38 @@
 Unit tests for Playwright fetcher.
 """
 
+import asyncio
 import unittest
 import os
+from types import SimpleNamespace
 from unittest.mock import patch
+from .adaptive_limiter import AdaptiveRateLimiter
 from .playwright_fetcher import PlaywrightFetcher
 
 
+class FakePage:
+    """Stands in for a Playwright page, tracking concurrent navigations."""
+
+    def __init__(self, tracker):
+        self.tracker = tracker
+        self.url = None
+
+    async def goto(self, url, wait_until, timeout):
+        self.tracker['in_flight'] += 1
+        self.tracker['max_in_flight'] = max(self.tracker['max_in_flight'],
+                                            self.tracker['in_flight'])
+        await asyncio.sleep(0.01)
+        self.tracker['in_flight'] -= 1
+        self.url = url
+        return SimpleNamespace(status=200)
+
+    async def content(self):
+        return f'<html><body>{self.url}</body></html>'
+
+    async def close(self):
+        pass
+
+
 class TestPlaywrightFetcher(unittest.TestCase):
     
     @unittest.skipIf(os.environ.get('CI') == 'true', "Skip browser tests in CI (no Playwright browsers installed)")
@@ -46,6 +72,56 @@ class TestPlaywrightFetcher(unittest.TestCase):
             "<html><body><table class='dataTable'></table></body></html>"
         ))
 
+    def test_fetch_multiple_uses_page_pool(self):
+        tracker = {'in_flight': 0, 'max_in_flight': 0}
+        fetcher = PlaywrightFetcher(pool_size=3)
+
+        async def new_page():
+            page = FakePage(tracker)
+            fetcher._open_pages.append(page)
+            return page
+
+        with patch.object(fetcher, '_new_page', side_effect=new_page):
+            fetcher._start_loop()
+            try:
+                fetcher._run(fetcher._fill_pool())
+                urls = [f'https://example.com/{i}' for i in range(10)]
+                results = fetcher.fetch_multiple(urls, delay=0)
+            finally:
+                fetcher.__exit__(None, None, None)
+
+        self.assertEqual(results,
+                         [f'<html><body>{url}</body></html>' for url in urls])
+        self.assertEqual(tracker['max_in_flight'], 3)
+
+    def test_limiter_backs_off_on_block_html(self):
+        tracker = {'in_flight': 0, 'max_in_flight': 0}
+        limiter = AdaptiveRateLimiter(per_minute=200, cooldown=0)
+        fetcher = PlaywrightFetcher(limiter=limiter)
+        pages = []
+
+        async def new_page():
+            page = FakePage(tracker)
+            if not pages:
+                async def busy():
+                    return '<html><body>queue full</body></html>'
+                page.content = busy
+            pages.append(page)
+            fetcher._open_pages.append(page)
+            return page
+
+        with patch.object(fetcher, '_new_page', side_effect=new_page):
+            fetcher._start_loop()
+            try:
+                fetcher._run(fetcher._fill_pool())
+                html = fetcher.fetch('https://example.com/1')
+            finally:
+                fetcher.__exit__(None, None, None)
+
+        self.assertEqual(html, '<html><body>https://example.com/1</body></html>')
+        self.assertEqual(len(pages), 2)
+        self.assertEqual(limiter.per_minute, 100.5)
+
     @unittest.skipIf(os.environ.get('CI') == 'true', "Skip browser tests in CI (no Playwright browsers installed)")
     def test_context_manager(self):
         """Test context manager properly initializes and cleans up"""
@@ -0,0 +1,430 @@
+import datetime
+import itertools
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from . import fixtures, scrape
+from .adaptive_limiter import FixedRateLimiter
+from .metrics import FetchResult
+from .scrape import ScrapeRunner, merge_shard_outputs, scrape_schedules
+from .shard import shard_of
+from ..shared import shared
+from ..shared.types import Game, Location, ScrapeArgs, TeamDetail
+
+
+def fake_fetch(location, *args, **kwargs):
+    if 'current_season_year' in location.url:
+        return fixtures.mcla_team_list()
+    if location.url.endswith('/schedule'):
+        return fixtures.mcla_schedule()
+    if location.url.endswith('/roster'):
+        return fixtures.mcla_roster()
+    if '/games/' in location.url:
+        return fixtures.mcla_game_details()
+    return None
+
+
+class TestScrapeRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def run_scrape(self, out_dir, **kwargs):
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3,
+                              **kwargs)
+        with patch.object(runner, 'fetch', side_effect=fake_fetch) as fetch:
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        return fetch
+
+    def load_outputs(self, out_dir):
+        schedules = list(
+            shared.load_parquet(
+                TeamDetail,
+                shared.parquet_path(out_dir, '2024', 'schedules',
+                                    'mcla.parquet')))
+        games = list(
+            shared.load_parquet(
+                Game,
+                shared.parquet_path(out_dir, '2024', 'games',
+                                    'mcla.parquet')))
+        return schedules, games
+
+    def test_scrape_writes_schedules_and_games(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir)
+        schedules, games = self.load_outputs(out_dir)
+
+        self.assertEqual(len(schedules), 3)
+        self.assertEqual(len(games), 17)
+        self.assertTrue(
+            os.path.exists(
+                os.path.join(out_dir, '2024', 'schedules',
+                             schedules[0].team.id + '.json')))
+
+    def test_concurrent_scrape_matches_sequential(self):
+        sequential_dir = os.path.join(self.tmp.name, 'sequential')
+        concurrent_dir = os.path.join(self.tmp.name, 'concurrent')
+        self.run_scrape(sequential_dir)
+        self.run_scrape(concurrent_dir, concurrency=4)
+
+        self.assertEqual(self.load_outputs(sequential_dir),
+                         self.load_outputs(concurrent_dir))
+
+    def test_failed_games_are_retried_from_the_opponents_schedule(self):
+        expected_dir = os.path.join(self.tmp.name, 'expected')
+        self.run_scrape(expected_dir)
+
+        failed_urls = set()
+
+        def flaky_fetch(location, *args, **kwargs):
+            if '/games/' in location.url and location.url not in failed_urls:
+                failed_urls.add(location.url)
+                return None
+            return fake_fetch(location)
+
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                failed_urls.clear()
+                out_dir = os.path.join(self.tmp.name, f'stream-{stream}')
+                runner = ScrapeRunner(source='mcla',
+                                      year='2024',
+                                      out_dir=out_dir,
+                                      limit=3,
+                                      stream=stream)
+                with patch.object(runner, 'fetch', side_effect=flaky_fetch):
+                    runner.scrape_and_write_team_lists()
+                    runner.scrape_and_write_schedules(None)
+                runner.cleanup()
+
+                self.assertEqual(len(failed_urls), 17)
+                self.assertEqual(
+                    sorted(game.id for game in self.load_outputs(out_dir)[1]),
+                    sorted(game.id
+                           for game in self.load_outputs(expected_dir)[1]))
+
+    def test_incremental_scrape_skips_final_games(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir)
+        outputs = self.load_outputs(out_dir)
+
+        fetch = self.run_scrape(out_dir, incremental=True)
+
+        fetched_urls = [call.args[0].url for call in fetch.call_args_list]
+        self.assertFalse(any('/games/' in url for url in fetched_urls))
+        self.assertEqual(self.load_outputs(out_dir), outputs)
+
+    def test_scrape_writes_metrics(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3)
+
+        def get(url, **kwargs):
+            html = fake_fetch(SimpleNamespace(url=url))
+            return SimpleNamespace(status_code=200 if html else 404,
+                                   text=html,
+                                   from_cache=False)
+
+        with patch.object(runner, 'cache', SimpleNamespace(get=get)):
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        with open(os.path.join(out_dir, '2024',
+                               'mcla-scrape-metrics.json')) as f:
+            page_types = json.load(f)['page_types']
+        self.assertEqual(page_types['schedule']['fetches'], 3)
+        self.assertEqual(page_types['schedule']['parses'], 3)
+        self.assertEqual(page_types['game_details']['fetches'], 17)
+        self.assertEqual(page_types['game_details']['parse_failures'], 0)
+        self.assertGreater(page_types['game_details']['bytes'], 0)
+        self.assertIn('p90', page_types['game_details']['fetch_seconds'])
+
+    def test_sharded_scrape_merges_into_unsharded_outputs(self):
+        unsharded_dir = os.path.join(self.tmp.name, 'unsharded')
+        sharded_dir = os.path.join(self.tmp.name, 'sharded')
+        self.run_scrape(unsharded_dir)
+        for index in range(3):
+            self.run_scrape(sharded_dir, shard=(index, 3))
+        merge_shard_outputs('mcla', '2024', sharded_dir, 3)
+
+        unsharded_schedules, unsharded_games = self.load_outputs(
+            unsharded_dir)
+        schedules, games = self.load_outputs(sharded_dir)
+        self.assertEqual(schedules, unsharded_schedules)
+        self.assertEqual(sorted(game.id for game in games),
+                         sorted(game.id for game in unsharded_games))
+
+    def test_merge_fetches_games_no_shard_fetched(self):
+        unsharded_dir = os.path.join(self.tmp.name, 'unsharded')
+        sharded_dir = os.path.join(self.tmp.name, 'sharded')
+        self.run_scrape(unsharded_dir)
+
+        def owner_in_next_shard(team, game, team_ids):
+            # As if the opponent's shard owned the game but did not fetch it
+            shard = (shard_of(team.id, 3) + 1) % 3
+            return next(f'other-{i}' for i in itertools.count()
+                        if shard_of(f'other-{i}', 3) == shard)
+
+        with patch('lib.scrape.scrape.game_owner',
+                   side_effect=owner_in_next_shard):
+            for index in range(3):
+                self.run_scrape(sharded_dir, shard=(index, 3))
+        with patch.object(ScrapeRunner, 'fetch', side_effect=fake_fetch):
+            merge_shard_outputs('mcla', '2024', sharded_dir, 3)
+
+        _, unsharded_games = self.load_outputs(unsharded_dir)
+        _, games = self.load_outputs(sharded_dir)
+        self.assertEqual(sorted(game.id for game in games),
+                         sorted(game.id for game in unsharded_games))
+
+    def test_shards_require_the_team_list(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        with patch.object(ScrapeRunner, 'fetch',
+                          side_effect=fake_fetch) as fetch:
+            with self.assertRaisesRegex(Exception, 'scrape teams'):
+                scrape_schedules(
+                    ScrapeArgs(source='mcla',
+                               year='2024',
+                               out_dir=out_dir,
+                               shard='0/2'))
+        fetch.assert_not_called()
+
+    def test_merge_requires_every_shard(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir, shard=(0, 2))
+        with self.assertRaisesRegex(Exception, 'Shard 1/2'):
+            merge_shard_outputs('mcla', '2024', out_dir, 2)
+
+    def test_unchanged_pages_are_not_parsed_again(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir)
+        outputs = self.load_outputs(out_dir)
+        with open(os.path.join(out_dir, '2024', 'mcla-unchanged.json')) as f:
+            self.assertEqual(json.load(f), {'teams': [], 'games': []})
+
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3)
+        with patch.object(runner, 'fetch', side_effect=fake_fetch):
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        self.assertEqual(self.load_outputs(out_dir), outputs)
+        with open(os.path.join(out_dir, '2024',
+                               'mcla-scrape-metrics.json')) as f:
+            page_types = json.load(f)['page_types']
+        self.assertEqual(page_types['schedule']['parses'], 0)
+        self.assertEqual(page_types['schedule']['parse_cache_hits'], 3)
+        self.assertEqual(page_types['game_details']['parses'], 0)
+        with open(os.path.join(out_dir, '2024', 'mcla-unchanged.json')) as f:
+            unchanged = json.load(f)
+        self.assertEqual(len(unchanged['teams']), 3)
+        self.assertEqual(len(unchanged['games']), 17)
+
+    def test_disabled_parse_cache_parses_every_page(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir, parse_cache=False)
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3,
+                              parse_cache=False)
+        with patch.object(runner, 'fetch', side_effect=fake_fetch):
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        with open(os.path.join(out_dir, '2024',
+                               'mcla-scrape-metrics.json')) as f:
+            page_types = json.load(f)['page_types']
+        self.assertEqual(page_types['schedule']['parses'], 3)
+        self.assertFalse(os.path.exists(os.path.join(out_dir, 'cache',
+                                                     'parse')))
+
+    def test_dated_conversions_are_parsed_again_the_next_day(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir)
+
+        class Tomorrow(datetime.date):
+
+            @classmethod
+            def today(cls):
+                return datetime.date.today() + datetime.timedelta(days=1)
+
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3)
+        with patch.object(runner, 'fetch', side_effect=fake_fetch), \
+                patch.object(scrape, 'datetime',
+                             SimpleNamespace(date=Tomorrow)):
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        with open(os.path.join(out_dir, '2024',
+                               'mcla-scrape-metrics.json')) as f:
+            page_types = json.load(f)['page_types']
+        self.assertEqual(page_types['schedule']['parses'], 3)
+        self.assertEqual(page_types['game_details']['parses'], 0)
+
+    def test_replayed_archive_reproduces_recorded_scrape(self):
+        archive_dir = os.path.join(self.tmp.name, 'archive')
+        recorded_dir = os.path.join(self.tmp.name, 'recorded')
+        replayed_dir = os.path.join(self.tmp.name, 'replayed')
+
+        def live_fetch(location, page_type):
+            return FetchResult(html=fake_fetch(location), status=200)
+
+        for out_dir, archive_args in ((recorded_dir, {
+                'record_archive': archive_dir
+        }), (replayed_dir, {
+                'replay_archive': archive_dir
+        })):
+            runner = ScrapeRunner(source='mcla',
+                                  year='2024',
+                                  out_dir=out_dir,
+                                  limit=3,
+                                  **archive_args)
+            with patch.object(runner, '_fetch_live',
+                              side_effect=live_fetch) as fetch_live:
+                runner.scrape_and_write_team_lists()
+                runner.scrape_and_write_schedules(None)
+            runner.cleanup()
+            if 'replay_archive' in archive_args:
+                fetch_live.assert_not_called()
+                self.assertEqual(runner.replayer.misses, 0)
+
+        self.assertEqual(self.load_outputs(recorded_dir),
+                         self.load_outputs(replayed_dir))
+
+    def test_ncaa_http_fetcher_falls_back_to_browser_when_blocked(self):
+        runner = ScrapeRunner(source='ncaa',
+                              year='2024',
+                              out_dir=os.path.join(self.tmp.name, 'out'),
+                              ncaa_fetcher='http')
+        self.addCleanup(runner.cleanup)
+        pages = {
+            'https://stats.ncaa.org/teams/1': '<html>schedule</html>',
+            'https://stats.ncaa.org/teams/2': '<h2>under heavy load (queue full)</h2>',
+        }
+
+        def fetch_http(location, headers):
+            return FetchResult(html=pages[location.url], status=200)
+
+        with patch.object(runner, '_fetch_http', side_effect=fetch_http), \
+                patch.object(runner, '_fetch_browser',
+                             return_value=FetchResult(html='<html>rendered</html>',
+                                                      status=200)) as browser, \
+                patch.object(runner.cache, 'invalidate') as invalidate:
+            self.assertEqual(
+                runner.fetch(Location(url='https://stats.ncaa.org/teams/1'),
+                             'schedule'), '<html>schedule</html>')
+            browser.assert_not_called()
+            self.assertEqual(
+                runner.fetch(Location(url='https://stats.ncaa.org/teams/2'),
+                             'schedule'), '<html>rendered</html>')
+            browser.assert_called_once()
+            invalidate.assert_called_once_with('https://stats.ncaa.org/teams/2')
+
+    def test_browser_navigations_are_always_paced(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        runner = ScrapeRunner(source='ncaa', year='2024', out_dir=out_dir)
+        self.addCleanup(runner.cleanup)
+        self.assertIsInstance(runner.browser_limiter, FixedRateLimiter)
+        self.assertEqual(runner.browser_limiter.per_minute, 30)
+
+        adaptive = ScrapeRunner(source='ncaa',
+                                year='2024',
+                                out_dir=out_dir,
+                                adaptive_rate=True)
+        self.addCleanup(adaptive.cleanup)
+        self.assertIs(adaptive.browser_limiter, adaptive.limiter)
+
+    def test_resume_continues_interrupted_scrape(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        game_fetches = 0
+
+        def interrupted_fetch(location, *args, **kwargs):
+            nonlocal game_fetches
+            if '/games/' in location.url:
+                game_fetches += 1
+                if game_fetches > 5:
+                    raise RuntimeError('task stopped')
+            return fake_fetch(location)
+
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3)
+        runner.open_journal()
+        with patch.object(runner, 'fetch', side_effect=interrupted_fetch):
+            runner.scrape_and_write_team_lists()
+            with self.assertRaises(RuntimeError):
+                runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        runner = ScrapeRunner(source='mcla',
+                              year='2024',
+                              out_dir=out_dir,
+                              limit=3)
+        runner.open_journal(resume=True)
+        with patch.object(runner, 'fetch', side_effect=fake_fetch) as fetch:
+            runner.scrape_and_write_team_lists()
+            runner.scrape_and_write_schedules(None)
+        runner.cleanup()
+
+        fetched_urls = [call.args[0].url for call in fetch.call_args_list]
+        self.assertEqual(len([url for url in fetched_urls if '/games/' in url]),
+                         12)
+        self.assertFalse(any('/schedule' in url for url in fetched_urls))
+
+        clean_dir = os.path.join(self.tmp.name, 'clean')
+        self.run_scrape(clean_dir)
+        self.assertEqual(self.load_outputs(out_dir),
+                         self.load_outputs(clean_dir))
+
+    def load_sorted_outputs(self, out_dir):
+        schedules, games = self.load_outputs(out_dir)
+        return schedules, sorted(games, key=lambda g: g.id)
+
+    def test_streaming_scrape_matches_in_memory(self):
+        in_memory_dir = os.path.join(self.tmp.name, 'in-memory')
+        stream_dir = os.path.join(self.tmp.name, 'stream')
+        self.run_scrape(in_memory_dir)
+        self.run_scrape(stream_dir, stream=True, concurrency=2)
+
+        self.assertEqual(self.load_sorted_outputs(in_memory_dir),
+                         self.load_sorted_outputs(stream_dir))
+        self.assertFalse(
+            any(
+                f.endswith('.tmp') for _, _, files in os.walk(stream_dir)
+                for f in files))
+
+    def test_streaming_incremental_scrape_keeps_final_games(self):
+        out_dir = os.path.join(self.tmp.name, 'out')
+        self.run_scrape(out_dir)
+        outputs = self.load_sorted_outputs(out_dir)
+
+        fetch = self.run_scrape(out_dir, stream=True, incremental=True)
+
+        fetched_urls = [call.args[0].url for call in fetch.call_args_list]
+        self.assertFalse(any('/games/' in url for url in fetched_urls))
+        self.assertEqual(self.load_sorted_outputs(out_dir), outputs)
+
+
+if __name__ == '__main__':
+    unittest.main()
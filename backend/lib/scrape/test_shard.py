@@ -0,0 +1,57 @@
+import unittest
+
+from .shard import game_owner, parse_shard, shard_of
+from ..shared.types import Location, ScheduleGame, Team, TeamSummary
+
+
+def make_team(id):
+    return Team(id=id,
+                name=f'team {id}',
+                schedule=Location(url=f'https://schedule/{id}'),
+                year='2024',
+                div='d1',
+                sport='ml',
+                source='mcla')
+
+
+def make_game(id, opponent_id):
+    return ScheduleGame(id=id,
+                        date='2024-03-01',
+                        opponent=TeamSummary(id=opponent_id,
+                                             name=f'team {opponent_id}'),
+                        sport='ml',
+                        source='mcla',
+                        home=True)
+
+
+class TestShard(unittest.TestCase):
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        for spec in ['4/4', '-1/4', '1', 'a/b', '0/0']:
+            with self.assertRaises(Exception):
+                parse_shard(spec)
+
+    def test_shard_of_is_stable(self):
+        self.assertEqual(shard_of('ml-mcla-texas', 8),
+                         shard_of('ml-mcla-texas', 8))
+        self.assertEqual(
+            {shard_of(f'team-{i}', 4)
+             for i in range(100)}, {0, 1, 2, 3})
+
+    def test_both_teams_agree_on_game_owner(self):
+        team_ids = {'a', 'b'}
+        for i in range(20):
+            game_id = f'game-{i}'
+            self.assertEqual(
+                game_owner(make_team('a'), make_game(game_id, 'b'), team_ids),
+                game_owner(make_team('b'), make_game(game_id, 'a'), team_ids))
+
+    def test_games_against_unknown_opponents_belong_to_team(self):
+        self.assertEqual(
+            game_owner(make_team('a'), make_game('game-1', 'z'), {'a', 'b'}),
+            'a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from .parsing import make_soup
+from .tables import compile_columns, int_column, parse_table
+
+TABLE_HTML = '''
+<table>
+  <thead><tr><th>#</th><th>Name</th><th>Notes</th><th>G</th></tr></thead>
+  <tbody>
+    <tr><td>1</td><td>Alice</td><td>ignored</td><td>3</td></tr>
+    <tr><td>2</td><td>Bob</td><td>ignored</td><td>0</td></tr>
+    <tr><td colspan="4">Totals</td></tr>
+  </tbody>
+</table>
+'''
+
+
+def set_name(cell, row):
+    row['name'] = cell.string
+
+
+class TestTables(unittest.TestCase):
+
+    def setUp(self):
+        self.table = make_soup(TABLE_HTML).table
+        self.columns = {
+            '#': int_column('number'),
+            'Name': set_name,
+            'G': int_column('g'),
+        }
+
+    def test_compile_skips_unmapped_columns(self):
+        plan = compile_columns(self.table, self.columns)
+        self.assertEqual([i for i, _ in plan], [0, 1, 3])
+
+    def test_parse_table(self):
+        self.assertEqual(parse_table(self.table, self.columns), [
+            {
+                'number': 1,
+                'name': 'Alice',
+                'g': 3
+            },
+            {
+                'number': 2,
+                'name': 'Bob',
+                'g': 0
+            },
+        ])
+
+    def test_errors_name_the_row(self):
+        columns = dict(self.columns, Name=int_column('name'))
+        with self.assertRaisesRegex(Exception, 'table row 1'):
+            parse_table(self.table, columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -74,6 +74,68 @@ def dump_parquet(data: Iterable[R],
                        schema, sort_order))
 
 
+class ParquetBatchWriter:
+    """
+    Writes dataclass rows to a parquet file in record batches.
+
+    Rows are buffered until batch_size is reached and then written out, so
+    only one batch is held in memory. The file is written alongside the
+    target and moved into place on close; if no rows were written it holds
+    just the schema, so no stale file from an earlier run survives.
+    """
+
+    def __init__(self, cls: type, filename: str, batch_size: int = 256):
+        self.filename = filename
+        self.schema = get_schema(cls)
+        self.batch_size = batch_size
+        self.rows: list[dict] = []
+        self.tmp_filename = filename + '.tmp'
+        self.writer: Optional[pq.ParquetWriter] = None
+
+    def write(self, obj):
+        self.rows.append(dataclasses.asdict(obj))
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def write_batch(self, batch: pa.RecordBatch):
+        """Write rows that are already in arrow form, e.g. from another file"""
+        self.flush()
+        if batch.num_rows:
+            self._writer().write_table(
+                pa.Table.from_batches([batch]).cast(self.schema))
+
+    def flush(self):
+        if not self.rows:
+            return
+        self._writer().write_table(
+            pa.Table.from_pylist(self.rows, schema=self.schema))
+        self.rows = []
+
+    def _writer(self) -> pq.ParquetWriter:
+        if self.writer is None:
+            pathlib.Path(os.path.dirname(self.filename)).mkdir(parents=True,
+                                                               exist_ok=True)
+            self.writer = pq.ParquetWriter(self.tmp_filename, self.schema)
+        return self.writer
+
+    def close(self):
+        self.flush()
+        self._writer().close()
+        self.writer = None
+        os.replace(self.tmp_filename, self.filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        elif self.writer is not None:
+            self.writer.close()
+            self.writer = None
+            os.remove(self.tmp_filename)
+
+
 def parquet_path(out_dir: str, year: str, dataset_name: str, *rest: list[str]):
     return os.path.join(out_dir, year, 'v2', dataset_name, *rest)
 
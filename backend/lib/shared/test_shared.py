@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+
+import pyarrow.parquet as pq
+
+from . import shared
+from .types import TeamSummary
+
+
+class TestParquetBatchWriter(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.filename = os.path.join(tmp.name, 'teams', 'data.parquet')
+
+    def test_writes_rows_in_batches(self):
+        teams = [TeamSummary(id=f't{i}', name=f'team {i}') for i in range(5)]
+        with shared.ParquetBatchWriter(TeamSummary, self.filename,
+                                       batch_size=2) as writer:
+            for team in teams:
+                writer.write(team)
+        self.assertEqual(list(shared.load_parquet(TeamSummary, self.filename)),
+                         teams)
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+
+    def test_empty_write_replaces_earlier_file(self):
+        with shared.ParquetBatchWriter(TeamSummary, self.filename) as writer:
+            writer.write(TeamSummary(id='t1', name='team 1'))
+        with shared.ParquetBatchWriter(TeamSummary, self.filename):
+            pass
+        table = pq.read_table(self.filename)
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.schema, shared.get_schema(TeamSummary))
+
+
+if __name__ == '__main__':
+    unittest.main()
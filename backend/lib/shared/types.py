@@ -204,6 +204,18 @@ class ScrapeArgs:
     div: str | None = None
     limit: str | None = None
     team_list_file: str | None = None
+    concurrency: int = 1
+    incremental: bool = False
+    stream: bool = False
+    resume: bool = False
+    adaptive_rate: bool = False
+    record_archive: str | None = None
+    replay_archive: str | None = None
+    replay_latency: float = 0
+    ncaa_fetcher: str = 'browser'
+    cache_max_mb: float | None = None
+    shard: str | None = None
+    parse_cache: bool = True
 
 
 @dataclass
@@ -211,6 +223,9 @@ class PredictArgs:
     input_dir: str
     year: str
     out_dir: str
+    split_components: bool = False
+    jobs: int = 1
+    warm_start: bool = False
 
 
 @dataclass
@@ -222,6 +237,11 @@ class SyncArgs:
 
 
 class Scraper(Protocol):
+    # Version of the converters' output, part of the parse cache key
+    PARSER_VERSION: int
+    # Names of converters taking a trailing today argument, the date games
+    # are judged against
+    DATED_CONVERTERS: frozenset[str]
 
     def get_team_list_urls(self, year: str) -> Iterator[Location]:
         """Get the team list URLs for this source"""
@@ -237,8 +257,15 @@ class Scraper(Protocol):
         """Convert schedule html into a schedule of games"""
         ...
 
-    def cross_link_schedules(self, schedules: list[TeamDetail]):
-        """Cross link schedules adding additional IDs if necessary"""
+    def cross_link_schedules(self,
+                             schedules: list[TeamDetail],
+                             teams: list[Team] | None = None):
+        """
+        Cross link schedules adding additional IDs if necessary.
+
+        teams are the teams to link against, defaulting to the teams of the
+        given schedules.
+        """
 
     def convert_game_details_html(self, html: str, location: Location,
                                   game_id: str, sport: str, source: str,
@@ -253,3 +280,7 @@ class Scraper(Protocol):
     def get_limiter_session_args(self) -> dict[str, int]:
         """Get additional arguments for LimiterSession if rate limiting is needed"""
         ...
+
+    def get_ready_selector(self, page_type: str) -> str | None:
+        """Get the CSS selector a browser fetch of this page type must wait for"""
+        ...
@@ -9,6 +9,7 @@ import lib.sync.cli
 import lib.games.cli
 import lib.all.cli
 import lib.export.cli
+import lib.cache.cli
 
 
 def main():
@@ -28,6 +29,7 @@ def main():
     lib.sync.cli.add_parsers(subparsers)
     lib.export.cli.add_parsers(subparsers)
     lib.all.cli.add_parsers(subparsers)
+    lib.cache.cli.add_parsers(subparsers)
     args = parser.parse_args()
     args.func(args)
 
@@ -9,8 +9,8 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 
-from lib.predict.predict import (PlayerRatingObservation, calculate_ratings,
-                                 solve_player_ratings)
+from lib.predict.predict import (build_player_design, calculate_ratings,
+                                 solve_player_stat_ratings)
 from lib.shared.types import (
     Game,
     Location,
@@ -284,21 +284,13 @@ def fit_player_model(obs: List[PlayerObs], damp: float = 1.0) -> PlayerModel | N
     p_idx = {p: i for i, p in enumerate(players)}
     t_idx = {t: i for i, t in enumerate(teams)}
 
-    goal_obs = [
-        PlayerRatingObservation(player=o.player_id,
-                                team=o.team_id,
-                                opponent=o.opp_id,
-                                value=float(o.goals)) for o in obs
-    ]
-    assist_obs = [
-        PlayerRatingObservation(player=o.player_id,
-                                team=o.team_id,
-                                opponent=o.opp_id,
-                                value=float(o.assists)) for o in obs
-    ]
-
-    g_r = solve_player_ratings(goal_obs, p_idx, t_idx, damp=damp, normalize=False)
-    a_r = solve_player_ratings(assist_obs, p_idx, t_idx, damp=damp, normalize=False)
+    coefficients = build_player_design(
+        [(o.player_id, o.team_id, o.opp_id) for o in obs], p_idx, t_idx)
+    constants = np.array([[o.goals, o.assists] for o in obs], dtype=float)
+    ratings = solve_player_stat_ratings(coefficients, constants, p_idx,
+                                        t_idx, damp=damp, normalize=False)
+    g_r = ratings[:, 0]
+    a_r = ratings[:, 1]
 
     return PlayerModel(player_to_idx=p_idx, team_to_idx=t_idx, goal_ratings=g_r, assist_ratings=a_r)
 
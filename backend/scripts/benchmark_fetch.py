@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare per-page Playwright fetch latency for stats.ncaa.org.
+
+"baseline" loads every resource and waits for networkidle; "fast" aborts
+non-document resources and returns once the page's ready selector matches.
+
+Usage: uv run python -m scripts.benchmark_fetch [--repeat N] [URL ...]
+"""
+import argparse
+import statistics
+import time
+
+from lib.scrape.ncaa import Ncaa
+from lib.scrape.playwright_fetcher import PlaywrightFetcher
+
+DEFAULT_PAGES = [
+    ('team_list',
+     'https://stats.ncaa.org/team/inst_team_list?academic_year=2026&division=1&sport_code=MLA'
+     ),
+    ('schedule', 'https://stats.ncaa.org/teams/594020'),
+    ('game_details',
+     'https://stats.ncaa.org/contests/6520729/individual_stats'),
+]
+
+
+def measure(fetcher: PlaywrightFetcher, pages, repeat: int, fast: bool):
+    scraper = Ncaa()
+    latencies = {page_type: [] for page_type, _ in pages}
+    for _ in range(repeat):
+        for page_type, url in pages:
+            ready_selector = scraper.get_ready_selector(
+                page_type) if fast else None
+            start = time.perf_counter()
+            fetcher.fetch(url, ready_selector=ready_selector)
+            latencies[page_type].append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('urls', nargs='*', help='Extra URLs to time (page type "other")')
+    args = p.parse_args()
+
+    pages = DEFAULT_PAGES + [('other', url) for url in args.urls]
+    modes = [
+        ('baseline', dict(blocked_resource_types=()), False),
+        ('fast', dict(), True),
+    ]
+
+    print(f'{"mode":<10}{"page type":<14}{"median s":>10}{"max s":>10}')
+    for name, fetcher_args, fast in modes:
+        with PlaywrightFetcher(**fetcher_args) as fetcher:
+            latencies = measure(fetcher, pages, args.repeat, fast)
+        for page_type, values in latencies.items():
+            print(f'{name:<10}{page_type:<14}'
+                  f'{statistics.median(values):>10.2f}{max(values):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
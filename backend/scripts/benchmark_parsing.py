@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML conversion over the scraper fixtures.
+
+Runs every fixture converter with each available parser backend and
+reports the mean time per conversion, then compares full and partial
+(subtree-only) parsing of the game details pages, then times the stats
+table parsing of the box scores on pre-built trees, then compares dateutil
+with the scrapers' date parsing on the schedule fixtures' dates.
+
+Usage: uv run python -m scripts.benchmark_parsing [--repeat N]
+"""
+import argparse
+import contextlib
+import time
+import tracemalloc
+from unittest.mock import patch
+
+import dateutil.parser
+
+from lib.scrape import dates, fixtures, mcla, ncaa, parsing, tables
+from lib.scrape.test_parsing import conversions
+
+
+def time_conversion(converter, html: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        converter(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def backend_report(repeat: int):
+    backends = parsing.available_backends()
+    print(f'{"fixture":<28}' + ''.join(f'{b + " ms":>16}' for b in backends))
+    totals = dict.fromkeys(backends, 0.0)
+    for name, converter in conversions():
+        html = fixtures.load_fixture(name)
+        row = f'{name:<28}'
+        for backend in backends:
+            with patch.object(parsing, 'BACKEND', backend):
+                elapsed = time_conversion(converter, html, repeat)
+            totals[backend] += elapsed
+            row += f'{elapsed * 1000:>16.1f}'
+        print(row)
+    print(f'{"total":<28}' +
+          ''.join(f'{totals[b] * 1000:>16.1f}' for b in backends))
+
+
+def peak_memory(converter, html: str) -> int:
+    tracemalloc.start()
+    try:
+        converter(html)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def partial_parsing_report(repeat: int):
+    print(f'\n{"game details fixture":<28}{"mode":<10}'
+          f'{"ms":>10}{"peak MiB":>12}')
+    for name, converter in conversions():
+        if not name.endswith('game_details.html'):
+            continue
+        html = fixtures.load_fixture(name)
+        for mode in ('full', 'partial'):
+            with contextlib.ExitStack() as stack:
+                if mode == 'full':
+                    for cls in (mcla.Mcla, ncaa.Ncaa):
+                        stack.enter_context(
+                            patch.object(cls, 'GAME_DETAILS_SUBTREES', None))
+                elapsed = time_conversion(converter, html, repeat)
+                peak = peak_memory(converter, html)
+            print(f'{name:<28}{mode:<10}{elapsed * 1000:>10.1f}'
+                  f'{peak / 2**20:>12.2f}')
+
+
+def box_score_table_parsers():
+    m = mcla.Mcla()
+    n = ncaa.Ncaa()
+    mcla_tables = parsing.make_soup(fixtures.mcla_game_details()).select(
+        'div.roster-groups table.stats-table')
+    ncaa_tables = parsing.make_soup(fixtures.ncaa_game_details()).find_all(
+        'table', class_='dataTable')[:2]
+
+    def parse_ncaa_tables():
+        columns = n._stats_columns('ml', 'ncaa')
+        return [
+            row for table in ncaa_tables
+            for row in tables.parse_table(table, columns)
+        ]
+
+    return [
+        ('mcla_game_details.html',
+         lambda: m._parse_stats_tables(mcla_tables, 'ml', 'mcla')),
+        ('ncaa_game_details.html', parse_ncaa_tables),
+    ]
+
+
+def table_parsing_report(repeat: int):
+    print(f'\n{"box score tables":<28}{"rows":>6}{"ms":>10}{"rows/s":>12}')
+    for name, parse in box_score_table_parsers():
+        rows = len(parse())
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse()
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f'{name:<28}{rows:>6}{elapsed * 1000:>10.2f}'
+              f'{rows / elapsed:>12.0f}')
+
+
+def schedule_date_strings() -> list[tuple[str, str]]:
+    """(date, time) strings of the mcla schedule fixture's games"""
+    soup = parsing.make_soup(fixtures.mcla_schedule())
+    return [(' '.join(
+        row.find('div', class_='game-opponent-tile__date').stripped_strings),
+             next(
+                 row.find('p',
+                          class_='game-opponent-tile__time').stripped_strings))
+            for row in soup.find_all('div', class_='game-opponent-tile')]
+
+
+def parse_with_dateutil(rows: list[tuple[str, str]]):
+    for date, time_string in rows:
+        try:
+            dateutil.parser.parse(time_string, tzinfos=dates.TIMEZONES)
+            time_part = time_string
+        except ValueError:
+            time_part = ''
+        parsed = dateutil.parser.parse(f'{date} {time_part} 2024',
+                                       tzinfos=dates.TIMEZONES).isoformat()
+        dateutil.parser.isoparse(parsed).date()
+
+
+def parse_with_dates(rows: list[tuple[str, str]]):
+    for date, time_string in rows:
+        time_part = time_string if dates.is_time(time_string) else ''
+        dates.iso_date(dates.parse_datetime(f'{date} {time_part} 2024'))
+
+
+def parse_with_dates_unmemoized(rows: list[tuple[str, str]]):
+    for date, time_string in rows:
+        time_part = time_string if dates.is_time.__wrapped__(
+            time_string) else ''
+        dates.iso_date.__wrapped__(
+            dates.parse_datetime.__wrapped__(f'{date} {time_part} 2024'))
+
+
+def clear_date_caches():
+    for fn in (dates.is_time, dates.parse_datetime, dates.iso_date):
+        fn.cache_clear()
+
+
+def date_parsing_report(repeat: int):
+    # A season of schedules repeats each game's date in both teams' pages
+    rows = schedule_date_strings() * 50
+    print(f'\n{"schedule dates":<28}{"rows":>6}{"ms":>10}{"us/row":>10}')
+    runs = [('dateutil', parse_with_dateutil, None),
+            ('fast, no memoization', parse_with_dates_unmemoized, None),
+            ('fast, cold cache', parse_with_dates, clear_date_caches),
+            ('fast, warm cache', parse_with_dates, None)]
+    for name, parse, before in runs:
+        elapsed = 0.0
+        for _ in range(repeat):
+            if before:
+                before()
+            start = time.perf_counter()
+            parse(rows)
+            elapsed += time.perf_counter() - start
+        elapsed /= repeat
+        print(f'{name:<28}{len(rows):>6}{elapsed * 1000:>10.2f}'
+              f'{elapsed / len(rows) * 1e6:>10.2f}')
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--repeat', type=int, default=10)
+    args = p.parse_args()
+    backend_report(args.repeat)
+    partial_parsing_report(args.repeat)
+    table_parsing_report(args.repeat)
+    date_parsing_report(args.repeat)
+
+
+if __name__ == '__main__':
+    main()
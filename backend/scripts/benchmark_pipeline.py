@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark the whole pipeline offline by replaying a recorded archive.
+
+Record an archive once with a live scrape, e.g.
+  uv run python main.py --year 2024 scrape --source mcla schedules --record-archive archive
+then replay it through scrape, predict, games and export into a scratch
+output directory, timing each stage. Everything except the network runs,
+so results are repeatable between runs and machines.
+
+Usage: uv run python -m scripts.benchmark_pipeline --archive DIR --year YEAR
+           [--source SOURCE ...] [--latency S] [--concurrency N] [--limit N]
+           [--out-dir DIR]
+"""
+import argparse
+import contextlib
+import logging
+import tempfile
+import time
+
+from lib.export import export_parquet
+from lib.games import games
+from lib.predict import predict
+from lib.scrape import scrape
+from lib.shared.types import PredictArgs, ScrapeArgs
+
+
+@contextlib.contextmanager
+def timed(timings: list, stage: str):
+    start = time.perf_counter()
+    yield
+    timings.append((stage, time.perf_counter() - start))
+
+
+def run_pipeline(args, out_dir: str) -> list[tuple[str, float]]:
+    timings = []
+    for source in args.source:
+        with timed(timings, f'scrape {source}'):
+            scrape.scrape_schedules(
+                ScrapeArgs(source=source,
+                           year=args.year,
+                           out_dir=out_dir,
+                           concurrency=args.concurrency,
+                           limit=args.limit,
+                           replay_archive=args.archive,
+                           replay_latency=args.latency))
+    with timed(timings, 'predict'):
+        predict.predict(
+            PredictArgs(input_dir=out_dir, year=args.year, out_dir=out_dir))
+    with timed(timings, 'games'):
+        games.generate_games_file(
+            argparse.Namespace(year=args.year, input_dir=out_dir))
+    with timed(timings, 'export'):
+        export_parquet.export_parquet_views(
+            argparse.Namespace(year=args.year,
+                               input_dir=out_dir,
+                               out_dir=out_dir))
+    return timings
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--archive', required=True, help='Recorded archive directory')
+    p.add_argument('--year', required=True)
+    p.add_argument('--source', action='append', default=[])
+    p.add_argument('--latency',
+                   type=float,
+                   default=0,
+                   help='Seconds of simulated latency per page')
+    p.add_argument('--concurrency', type=int, default=1)
+    p.add_argument('--limit', help='Team limit the archive was recorded with')
+    p.add_argument('--out-dir', help='Output directory (defaults to a temporary one)')
+    args = p.parse_args()
+    args.source = args.source or ['mcla']
+
+    logging.basicConfig(level=logging.WARNING)
+    with contextlib.ExitStack() as stack:
+        out_dir = args.out_dir or stack.enter_context(
+            tempfile.TemporaryDirectory())
+        timings = run_pipeline(args, out_dir)
+
+    print(f'{"stage":<16}{"seconds":>10}')
+    for stage, seconds in timings:
+        print(f'{stage:<16}{seconds:>10.2f}')
+    print(f'{"total":<16}{sum(s for _, s in timings):>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
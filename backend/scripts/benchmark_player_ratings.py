@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Benchmark solving player ratings for several stats.
+
+Generates a synthetic season of player stat lines and times solving each
+stat with its own lsqr, as predict used to do, against building the design
+once and solving every stat together with the preconditioned conjugate
+gradient on the damped normal equations. predict used to build the
+design again for every stat, which the before total includes. Reports the
+largest difference between the two solutions, within lsqr's default
+tolerance.
+
+Then times a daily re-rating: solving the season without its last
+--changed lines, and then warm starting the whole season from that
+solution, against solving it from zero.
+
+Usage: uv run python -m scripts.benchmark_player_ratings [--players N]
+           [--teams N] [--lines N] [--stats N] [--changed N] [--repeat N]
+           [--seed N]
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.sparse import linalg
+
+from lib.predict import predict
+
+
+def best_of(repeat: int, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--players', type=int, default=30000)
+    p.add_argument('--teams', type=int, default=700)
+    p.add_argument('--lines', type=int, default=300000)
+    p.add_argument('--stats', type=int, default=5)
+    p.add_argument('--changed', type=int, default=500)
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    player_team = rng.integers(0, args.teams, args.players)
+    players = rng.integers(0, args.players, args.lines)
+    teams = player_team[players]
+    opponents = (teams + rng.integers(1, args.teams, args.lines)) % args.teams
+    rows = [(f'p{p}', f't{t}', f't{o}')
+            for p, t, o in zip(players, teams, opponents)]
+    constants = rng.poisson(0.8, (args.lines, args.stats)).astype(float)
+
+    player_id_to_idx, _ = predict.index_ids(p for p, _, _ in rows)
+    team_id_to_idx, _ = predict.index_ids(
+        id for _, t, o in rows for id in [t, o])
+    n_players = len(player_id_to_idx)
+    n_teams = len(team_id_to_idx)
+
+    design_seconds, coefficients = best_of(
+        args.repeat, lambda: predict.build_player_design(
+            rows, player_id_to_idx, team_id_to_idx))
+
+    per_stat_seconds, per_stat_ratings = best_of(
+        args.repeat, lambda: np.column_stack([
+            linalg.lsqr(coefficients, constants[:, k], damp=1.0)[0]
+            for k in range(args.stats)
+        ]))
+
+    def together():
+        # Without a solution it starts from zero, and records the iterations
+        state = predict.WarmStart('players')
+        ratings = predict.solve_player_stat_ratings(coefficients,
+                                                    constants,
+                                                    player_id_to_idx,
+                                                    team_id_to_idx,
+                                                    normalize=False,
+                                                    warm_start=state)
+        return ratings, state.iterations
+
+    together_seconds, (together_ratings, cold_iterations) = best_of(
+        args.repeat, together)
+
+    # predict used to build the design again for every stat
+    before = args.stats * design_seconds + per_stat_seconds
+    after = design_seconds + together_seconds
+
+    print(f'{n_players} players, {n_teams} teams, {args.lines} lines, '
+          f'{args.stats} stats')
+    print(f'{"stage":<24}{"ms":>10}')
+    print(f'{"build design":<24}{design_seconds * 1000:>10.1f}')
+    print(f'{"lsqr per stat":<24}{per_stat_seconds * 1000:>10.1f}')
+    print(f'{"cg, all stats":<24}{together_seconds * 1000:>10.1f}')
+    print(f'{"before (design per stat)":<24}{before * 1000:>10.1f}')
+    print(f'{"after":<24}{after * 1000:>10.1f}')
+    print(f'speedup {before / after:.1f}x, max difference '
+          f'{np.abs(per_stat_ratings - together_ratings).max():.2e}')
+
+    # The previous day's solution, without the changed lines
+    yesterday = rows[:-args.changed]
+    yesterday_players, _ = predict.index_ids(p for p, _, _ in yesterday)
+    yesterday_teams, _ = predict.index_ids(
+        id for _, t, o in yesterday for id in [t, o])
+    warm_start = predict.WarmStart('players')
+    predict.solve_player_stat_ratings(predict.build_player_design(
+        yesterday, yesterday_players, yesterday_teams),
+                                      constants[:-args.changed],
+                                      yesterday_players,
+                                      yesterday_teams,
+                                      normalize=False,
+                                      warm_start=warm_start)
+    previous = warm_start.solution
+
+    def warm():
+        warm_start.solution = previous
+        warm_start.player_ids = predict._ids_by_index(yesterday_players)
+        warm_start.team_ids = predict._ids_by_index(yesterday_teams)
+        return predict.solve_player_stat_ratings(coefficients,
+                                                 constants,
+                                                 player_id_to_idx,
+                                                 team_id_to_idx,
+                                                 normalize=False,
+                                                 warm_start=warm_start)
+
+    warm_seconds, warm_ratings = best_of(args.repeat, warm)
+    print(f'{args.changed} changed lines: cold {together_seconds * 1000:.1f} '
+          f'ms in {cold_iterations.tolist()} iterations, warm '
+          f'{warm_seconds * 1000:.1f} ms in {warm_start.iterations.tolist()}'
+          f' iterations, max difference '
+          f'{np.abs(warm_ratings - together_ratings).max():.2e}')
+
+
+if __name__ == '__main__':
+    main()
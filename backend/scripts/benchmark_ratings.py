@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark building the team ratings least squares system.
+
+Generates a synthetic season (by default about ten times a current NCAA plus
+MCLA season) and times the list-based construction of the coefficient
+matrix and constants that predict used to do against the columnar NumPy
+path, checking both give the same matrix and the same ratings. Grouping
+the teams into connected components and the lsqr solve are timed too, for
+scale. Few games per team (e.g. --games 5000) resembles early-season data
+with many components.
+
+Usage: uv run python -m scripts.benchmark_ratings [--teams N] [--games N]
+           [--repeat N] [--seed N]
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from scipy.sparse import coo_matrix, linalg
+
+from lib.predict import predict
+
+
+def legacy_coefficient_matrix(games, id_to_idx):
+    hfa_factors = [
+        hfa for g in games for hfa in ((1, -1) if g.home else (-1, 1))
+    ]
+    hfa_i = [i for i in range(0, 2 * len(games))]
+    hfa_j = [2 * len(id_to_idx)] * (2 * len(games))
+
+    data = [1, -1, 1, -1] * len(games)
+    i = [i for g in range(0, 2 * len(games)) for i in (g, g)]
+
+    def offensive_offset(id):
+        return id_to_idx[id]
+
+    def defensive_offset(id):
+        return len(id_to_idx) + id_to_idx[id]
+
+    j = [
+        k for game in games
+        for k in (offensive_offset(game.team), defensive_offset(game.opponent),
+                  offensive_offset(game.opponent), defensive_offset(game.team))
+    ]
+
+    return coo_matrix((data + hfa_factors, (i + hfa_i, j + hfa_j)),
+                      shape=(2 * len(games), 2 * len(id_to_idx) + 1))
+
+
+def legacy_constants(games):
+    return np.array(
+        [p for g in games for p in (g.points_for, g.points_against)])
+
+
+def synthetic_games(n_teams: int, n_games: int,
+                    seed: int) -> list[predict.GameMapValue]:
+    rng = random.Random(seed)
+    teams = [f'team-{i}' for i in range(n_teams)]
+    games = []
+    for _ in range(n_games):
+        team, opponent = rng.sample(teams, 2)
+        games.append(
+            predict.GameMapValue(team=team,
+                                 opponent=opponent,
+                                 home=rng.random() < 0.5,
+                                 points_for=rng.randint(0, 25),
+                                 points_against=rng.randint(0, 25)))
+    return games
+
+
+def best_of(repeat: int, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument('--teams', type=int, default=10000)
+    p.add_argument('--games', type=int, default=100000)
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--seed', type=int, default=0)
+    args = p.parse_args()
+
+    games = synthetic_games(args.teams, args.games, args.seed)
+    id_to_idx, _ = predict.index_ids(
+        [id for game in games for id in [game.opponent, game.team]])
+    n_teams = len(id_to_idx)
+
+    legacy_seconds, (legacy_matrix, legacy_b) = best_of(
+        args.repeat, lambda: (legacy_coefficient_matrix(games, id_to_idx),
+                              legacy_constants(games)))
+
+    def columnar():
+        game_arrays = predict.to_game_arrays(games, id_to_idx)
+        return (predict.build_offensive_defensive_coefficient_matrix(
+            game_arrays, n_teams),
+                predict.build_offensive_defensive_constants(game_arrays))
+
+    columnar_seconds, (matrix, b) = best_of(args.repeat, columnar)
+
+    group_seconds, groups = best_of(
+        args.repeat, lambda: predict.group_teams_by_games(games))
+
+    solve_seconds, ratings = best_of(
+        1, lambda: linalg.lsqr(matrix, b, damp=0.2)[0])
+    legacy_ratings = linalg.lsqr(legacy_matrix, legacy_b, damp=0.2)[0]
+
+    print(f'{n_teams} teams, {len(games)} games, '
+          f'{matrix.shape[0]}x{matrix.shape[1]} system, '
+          f'{len(set(groups.values()))} groups')
+    print(f'{"stage":<24}{"ms":>10}')
+    print(f'{"build, lists + coo":<24}{legacy_seconds * 1000:>10.1f}')
+    print(f'{"build, columnar csr":<24}{columnar_seconds * 1000:>10.1f}')
+    print(f'{"group teams":<24}{group_seconds * 1000:>10.1f}')
+    print(f'{"lsqr solve":<24}{solve_seconds * 1000:>10.1f}')
+    print(f'speedup {legacy_seconds / columnar_seconds:.1f}x, '
+          f'same matrix: {(legacy_matrix.tocsr() != matrix).nnz == 0}, '
+          f'same constants: {np.array_equal(legacy_b, b)}, '
+          f'same ratings: {np.array_equal(legacy_ratings, ratings)}')
+
+
+if __name__ == '__main__':
+    main()